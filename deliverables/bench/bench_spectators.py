@@ -0,0 +1,108 @@
+"""
+Spectator Fan-out Benchmark
+Cost per state change with thousands of viewers on one game: publishing
+through SpectatorHub (encode once, queue the same bytes for each viewer,
+viewer tasks draining their buffers) against every viewer building and
+encoding the state itself, as polling GET /game/{session_id} does.
+
+    python deliverables/bench/bench_spectators.py --viewers 1000 5000 10000
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import random
+import sys
+import time
+from typing import List
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "src"))
+
+from game_engine import BlackjackGame, GameState  # noqa: E402
+from spectate import SpectatorHub  # noqa: E402
+
+
+def game_states(count: int, seed: int) -> List[dict]:
+    """States of consecutive seeded games, as actions would publish them."""
+    rng = random.Random(seed)
+    game = BlackjackGame(rng=rng)
+    states = []
+    while len(states) < count:
+        states.append(game.start_new_game())
+        while game.state == GameState.PLAYER_TURN and len(states) < count:
+            states.append(game.hit() if game.player_hand.get_value() < 17 else game.stand())
+    return states
+
+
+def bench_polling(game: BlackjackGame, viewers: int, events: int) -> float:
+    """Seconds per event when each viewer builds and encodes the state."""
+    started = time.perf_counter()
+    for _ in range(events):
+        for _ in range(viewers):
+            json.dumps(game.get_game_state()).encode()
+    return (time.perf_counter() - started) / events
+
+
+async def bench_hub(states: List[dict], viewers: int) -> dict:
+    hub = SpectatorHub()
+    subscriptions = [hub.subscribe("game", states[0]) for _ in range(viewers)]
+    received = [0]
+
+    async def viewer(subscription):
+        while await subscription.get() is not None:
+            received[0] += 1
+
+    tasks = [asyncio.ensure_future(viewer(s)) for s in subscriptions]
+    await asyncio.sleep(0)
+    received[0] = 0
+
+    publish = 0.0
+    started = time.perf_counter()
+    for state in states:
+        tick = time.perf_counter()
+        hub.publish("game", state)
+        publish += time.perf_counter() - tick
+        # Let every viewer take its frame, as the event loop would between requests
+        await asyncio.sleep(0)
+    elapsed = time.perf_counter() - started
+    delivered = received[0]
+    dropped = hub.stats()["frames_dropped"]
+    hub.close("game")
+    await asyncio.gather(*tasks)
+    return {
+        "publish": publish / len(states),
+        "total": elapsed / len(states),
+        "received": delivered,
+        "dropped": dropped,
+    }
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Spectator fan-out cost per event")
+    parser.add_argument("--viewers", type=int, nargs="+", default=[100, 1000, 5000, 10000])
+    parser.add_argument("--events", type=int, default=200)
+    parser.add_argument("--poll-events", type=int, default=5, help="events timed for the polling baseline")
+    parser.add_argument("--seed", type=int, default=1)
+    args = parser.parse_args()
+
+    states = game_states(args.events, args.seed)
+    game = BlackjackGame(rng=random.Random(args.seed))
+    game.start_new_game()
+    frame_bytes = len(json.dumps(states[0]))
+    print(f"{args.events} events, ~{frame_bytes} byte states\n")
+    print(f"{'viewers':>8} {'publish/event':>14} {'with delivery':>14} {'per viewer':>11} {'polling/event':>14}")
+    for viewers in args.viewers:
+        hub = asyncio.run(bench_hub(states, viewers))
+        polling = bench_polling(game, viewers, args.poll_events)
+        print(
+            f"{viewers:>8} {hub['publish'] * 1e6:>11.1f} us {hub['total'] * 1e6:>11.1f} us "
+            f"{hub['total'] / viewers * 1e9:>8.0f} ns {polling * 1e6:>11.1f} us"
+        )
+        if hub["dropped"] or hub["received"] != viewers * len(states):
+            print(f"{'':>8} {hub['dropped']} frames dropped")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,88 @@
+"""
+Startup Benchmark
+Import time of the API and engine modules and latency of the first
+requests a fresh worker serves, each measured in a new interpreter.
+
+    python deliverables/bench/bench_startup.py --runs 10
+"""
+
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+from typing import Dict, List
+
+SRC = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "src")
+
+IMPORT_SCRIPT = """
+import time
+started = time.perf_counter()
+import {module}
+print((time.perf_counter() - started) * 1000)
+"""
+
+# Prints {"step": milliseconds} for worker boot and the first and second
+# run of each request
+FIRST_REQUEST_SCRIPT = """
+import json, time
+timings = {}
+started = time.perf_counter()
+import api
+from fastapi.testclient import TestClient
+timings["import"] = (time.perf_counter() - started) * 1000
+
+def timed(name, call):
+    started = time.perf_counter()
+    response = call()
+    timings[name] = (time.perf_counter() - started) * 1000
+    return response
+
+client = TestClient(api.app)
+timed("startup", client.__enter__)
+for run in ("first", "second"):
+    session_id = timed(run + " new_game", lambda: client.post("/game/new")).json()["session_id"]
+    timed(run + " get_state", lambda: client.get(f"/game/{session_id}"))
+    timed(run + " stand", lambda: client.post(f"/game/{session_id}/stand"))
+client.__exit__(None, None, None)
+print(json.dumps(timings))
+"""
+
+
+def run_child(script: str, env: Dict[str, str]) -> str:
+    result = subprocess.run(
+        [sys.executable, "-c", script], cwd=SRC, env=env, capture_output=True, text=True, check=True
+    )
+    return result.stdout.strip().splitlines()[-1]
+
+
+def summarize(samples: List[float]) -> str:
+    return f"median {statistics.median(samples):8.2f} ms   min {min(samples):8.2f} ms"
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Worker import time and first-request latency")
+    parser.add_argument("--runs", type=int, default=5, help="fresh interpreters per measurement")
+    parser.add_argument("--split-table", action="store_true", help="also precompute the split EV table")
+    args = parser.parse_args()
+
+    env = dict(os.environ, PYTHONPATH=SRC)
+    if args.split_table:
+        env["BLACKJACK_WARMUP_SPLIT_EV"] = "1"
+
+    for module in ("game_engine", "api"):
+        samples = [float(run_child(IMPORT_SCRIPT.format(module=module), env)) for _ in range(args.runs)]
+        print(f"import {module:<24} {summarize(samples)}")
+
+    steps: Dict[str, List[float]] = {}
+    for _ in range(args.runs):
+        for step, ms in json.loads(run_child(FIRST_REQUEST_SCRIPT, env)).items():
+            steps.setdefault(step, []).append(ms)
+    for step, samples in steps.items():
+        print(f"{step:<31} {summarize(samples)}")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,249 @@
+"""
+Admission Control
+Per-client rate limits on session creation and a global in-flight limit
+that sheds load with fast 503s, keeping capacity for hands in progress.
+"""
+
+import asyncio
+import json
+import math
+import re
+import time
+from collections import OrderedDict, deque
+from typing import Callable, Deque, Dict
+
+
+# Request classes, in priority order
+EXEMPT = "exempt"    # health, readiness, admin, streams and releasing work
+ACTION = "action"    # sessions, tables and jobs already in progress
+NEW = "new"          # everything that creates work: sessions, tables, jobs, seats, EV solves
+
+DEFAULT_MAX_IN_FLIGHT = 256
+DEFAULT_MAX_QUEUE = 512
+DEFAULT_QUEUE_TIMEOUT = 1.0
+# Share of the in-flight limit new work may take; the rest is kept for actions
+DEFAULT_NEW_SHARE = 0.75
+DEFAULT_NEW_GAME_RATE = 2.0
+DEFAULT_NEW_GAME_BURST = 10
+MAX_TRACKED_CLIENTS = 10000
+
+_SESSION_PATH = re.compile(r"^/game/[^/]+(/[a-z-]+)?$")
+_TABLE_PATH = re.compile(r"^/table/[^/]+(/deal)?$")
+_JOB_PATH = re.compile(r"^/jobs/[^/]+$")
+_CANCEL_PATH = re.compile(r"^/jobs/[^/]+/cancel$")
+
+
+def classify(method: str, path: str) -> str:
+    """Admission class of a request."""
+    if method == "OPTIONS" or path in ("/", "/ready") or path.startswith("/admin") or path.endswith("/events"):
+        return EXEMPT
+    # Ending a session or table and cancelling a job only free capacity
+    if method == "DELETE" or (method == "POST" and _CANCEL_PATH.match(path)):
+        return EXEMPT
+    # A split EV solve can take seconds of CPU, so it is shed like new work
+    if path in ("/game/new", "/table/new") or path.endswith("/split-ev"):
+        return NEW
+    if _SESSION_PATH.match(path) or _TABLE_PATH.match(path):
+        return ACTION
+    if method == "GET" and _JOB_PATH.match(path):
+        return ACTION
+    return NEW
+
+
+class TokenBucket:
+    """``rate`` tokens per second, holding at most ``burst``."""
+
+    def __init__(self, rate: float, burst: float, clock: Callable[[], float] = time.monotonic):
+        self.rate = rate
+        self.burst = burst
+        self.clock = clock
+        self.tokens = float(burst)
+        self.updated = clock()
+
+    def take(self) -> float:
+        """Spend a token; return 0, or the seconds until one is available."""
+        now = self.clock()
+        self.tokens = min(self.burst, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+        if self.tokens >= 1:
+            self.tokens -= 1
+            return 0.0
+        return (1 - self.tokens) / self.rate
+
+
+class ClientRateLimiter:
+    """One TokenBucket per client, least recently seen clients forgotten first."""
+
+    def __init__(
+        self,
+        rate: float = DEFAULT_NEW_GAME_RATE,
+        burst: float = DEFAULT_NEW_GAME_BURST,
+        max_clients: int = MAX_TRACKED_CLIENTS,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self.rate = rate
+        self.burst = burst
+        self.max_clients = max_clients
+        self.clock = clock
+        self.buckets: "OrderedDict[str, TokenBucket]" = OrderedDict()
+        self.limited = 0
+
+    def take(self, client: str) -> float:
+        bucket = self.buckets.get(client)
+        if bucket is None:
+            bucket = self.buckets[client] = TokenBucket(self.rate, self.burst, self.clock)
+            if len(self.buckets) > self.max_clients:
+                self.buckets.popitem(last=False)
+        else:
+            self.buckets.move_to_end(client)
+        wait = bucket.take()
+        if wait:
+            self.limited += 1
+        return wait
+
+
+class AdmissionController:
+    """Global in-flight limit with a short priority queue.
+
+    Actions on existing hands may use the whole limit and wait up to
+    ``queue_timeout`` in a bounded queue for a slot. New work may only use
+    ``new_share`` of the limit and is refused at once when it is reached,
+    so creating sessions can never starve hands in progress. A freed slot
+    goes to the oldest waiting action.
+    """
+
+    def __init__(
+        self,
+        max_in_flight: int = DEFAULT_MAX_IN_FLIGHT,
+        max_queue: int = DEFAULT_MAX_QUEUE,
+        queue_timeout: float = DEFAULT_QUEUE_TIMEOUT,
+        new_share: float = DEFAULT_NEW_SHARE,
+    ):
+        self.max_in_flight = max_in_flight
+        self.max_queue = max_queue
+        self.queue_timeout = queue_timeout
+        self.new_share = new_share
+        self.in_flight = 0
+        self.waiters: Deque[asyncio.Future] = deque()
+        self.admitted: Dict[str, int] = {ACTION: 0, NEW: 0}
+        self.rejected: Dict[str, int] = {ACTION: 0, NEW: 0}
+        self.max_queue_depth = 0
+
+    @property
+    def queue_depth(self) -> int:
+        return len(self.waiters)
+
+    def retry_after(self) -> int:
+        """Seconds a refused client should wait, from the current backlog."""
+        backlog = self.queue_depth / max(1, self.max_in_flight)
+        return max(1, math.ceil(backlog * self.queue_timeout))
+
+    async def acquire(self, kind: str) -> bool:
+        """Take an in-flight slot; False means the request must be refused."""
+        if kind == NEW:
+            if self.waiters or self.in_flight >= self.max_in_flight * self.new_share:
+                self.rejected[NEW] += 1
+                return False
+            self.in_flight += 1
+            self.admitted[NEW] += 1
+            return True
+
+        if not self.waiters and self.in_flight < self.max_in_flight:
+            self.in_flight += 1
+            self.admitted[ACTION] += 1
+            return True
+        if len(self.waiters) >= self.max_queue:
+            self.rejected[ACTION] += 1
+            return False
+
+        waiter = asyncio.get_running_loop().create_future()
+        self.waiters.append(waiter)
+        self.max_queue_depth = max(self.max_queue_depth, len(self.waiters))
+        try:
+            # release() hands its slot straight to this waiter
+            await asyncio.wait_for(asyncio.shield(waiter), self.queue_timeout)
+        except asyncio.TimeoutError:
+            if waiter.done():
+                # Granted just as the wait timed out: keep the slot
+                self.admitted[ACTION] += 1
+                return True
+            self.waiters.remove(waiter)
+            waiter.cancel()
+            self.rejected[ACTION] += 1
+            return False
+        except asyncio.CancelledError:
+            # Client went away while queued: give back or drop its place
+            if waiter.done():
+                self.release()
+            else:
+                self.waiters.remove(waiter)
+                waiter.cancel()
+            raise
+        self.admitted[ACTION] += 1
+        return True
+
+    def release(self) -> None:
+        while self.waiters:
+            waiter = self.waiters.popleft()
+            if not waiter.done():
+                waiter.set_result(None)
+                return
+        self.in_flight -= 1
+
+    def stats(self) -> dict:
+        return {
+            "in_flight": self.in_flight,
+            "max_in_flight": self.max_in_flight,
+            "queue_depth": self.queue_depth,
+            "max_queue_depth": self.max_queue_depth,
+            "admitted": dict(self.admitted),
+            "rejected": dict(self.rejected),
+        }
+
+
+class AdmissionMiddleware:
+    """ASGI middleware applying ClientRateLimiter and AdmissionController."""
+
+    def __init__(self, app, controller: AdmissionController, rate_limiter: ClientRateLimiter):
+        self.app = app
+        self.controller = controller
+        self.rate_limiter = rate_limiter
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        kind = classify(scope["method"], scope["path"])
+        if kind == EXEMPT:
+            await self.app(scope, receive, send)
+            return
+
+        if scope["method"] == "POST" and scope["path"] == "/game/new":
+            # Behind a proxy every client shares its address; limit there too
+            client = scope["client"][0] if scope.get("client") else "unknown"
+            wait = self.rate_limiter.take(client)
+            if wait:
+                await _refuse(send, 429, "Too many new games", math.ceil(wait))
+                return
+
+        if not await self.controller.acquire(kind):
+            await _refuse(send, 503, "Server overloaded", self.controller.retry_after())
+            return
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            self.controller.release()
+
+
+async def _refuse(send, status: int, detail: str, retry_after: int) -> None:
+    body = json.dumps({"detail": detail}).encode()
+    await send({
+        "type": "http.response.start",
+        "status": status,
+        "headers": [
+            (b"content-type", b"application/json"),
+            (b"content-length", str(len(body)).encode()),
+            (b"retry-after", str(retry_after).encode()),
+        ],
+    })
+    await send({"type": "http.response.body", "body": body})
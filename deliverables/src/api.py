@@ -3,14 +3,76 @@ FastAPI backend for Blackjack Game
 RESTful API endpoints for game operations.
 """
 
-from fastapi import FastAPI, HTTPException
+from fastapi import Depends, FastAPI, Header, HTTPException, Response
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import JSONResponse, PlainTextResponse, StreamingResponse
 from pydantic import BaseModel
-from typing import Dict, Any
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import asynccontextmanager
+from typing import Dict, Any, List, MutableMapping, Optional, Tuple
+import asyncio
+import json
+import logging
+import os
 import uuid
-from game_engine import BlackjackGame
+from game_engine import BlackjackGame, RuleSet
+from table import Table, SeatGame, DEFAULT_ROUND_TIMEOUT
+from session_locks import SessionLocks, IdempotencyCache
+from session_store import MemorySessionStore, session_store_from_env
+from profiling import DEFAULT_INTERVAL, HotPathTimer, Profiler, RequestProfilerMiddleware
+from wire import WIRE_MEDIA_TYPE, encode_state
+from admission import AdmissionController, AdmissionMiddleware, ClientRateLimiter
+from spectate import SpectatorHub
+from warmup import warm_up
 
-app = FastAPI(title="Blackjack Game API", version="1.0.0")
+# The EV solver, simulation jobs and snapshot loading are imported on first
+# use, so a worker that never needs them does not pay for them at boot.
+
+logger = logging.getLogger(__name__)
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Warm up and reattach the last snapshot; write a new one on shutdown.
+
+    Attaching only maps the file, so startup does not wait on the number
+    of saved sessions; each one is restored when it is first requested.
+    A snapshot that cannot be read is moved aside and the worker starts
+    with no sessions.
+    /ready answers 503 until this startup work is done.
+    """
+    global warmup_timings
+    snapshot_path = os.environ.get("BLACKJACK_SNAPSHOT_PATH")
+    # A shared-memory slab already survives worker restarts
+    warm_restart = snapshot_path is not None and isinstance(games, MemorySessionStore)
+    if warm_restart:
+        from snapshot import load_snapshot
+        try:
+            games.attach_snapshot(load_snapshot(snapshot_path))
+        except ValueError as e:
+            # E.g. written by a release with another record layout: keep the
+            # file for inspection and start with no sessions
+            logger.warning("Ignoring session snapshot: %s", e)
+            try:
+                os.replace(snapshot_path, f"{snapshot_path}.rejected")
+            except FileNotFoundError:
+                # Another worker moved it first
+                pass
+    warmup_timings = warm_up(split_table=os.environ.get("BLACKJACK_WARMUP_SPLIT_EV") == "1")
+    yield
+    warmup_timings = None
+    if job_manager is not None:
+        job_manager.shutdown()
+    if warm_restart:
+        games.save_snapshot(snapshot_path)
+
+
+app = FastAPI(title="Blackjack Game API", version="1.0.0", lifespan=lifespan)
+
+# Load shedding sits inside CORS so browsers can read its 503/429 replies
+admission = AdmissionController()
+new_game_limiter = ClientRateLimiter()
+app.add_middleware(AdmissionMiddleware, controller=admission, rate_limiter=new_game_limiter)
 
 # Configure CORS for frontend access
 app.add_middleware(
@@ -21,8 +83,64 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
-# In-memory game session storage
-games: Dict[str, BlackjackGame] = {}
+# On-demand profiling; idle unless started through /admin/profile
+profiler = Profiler()
+hot_path_timer = HotPathTimer()
+app.add_middleware(RequestProfilerMiddleware, profiler=profiler)
+
+# Game session storage: in-process by default, or a shared-memory slab
+# shared by every worker on the host (BLACKJACK_SESSION_BACKEND=shm)
+games: MutableMapping[str, BlackjackGame] = session_store_from_env()
+
+# Multi-seat tables; each seat is also a session in `games`
+tables: Dict[str, Table] = {}
+
+# Actions on one session run one at a time; retried actions replay their result
+session_locks = SessionLocks()
+idempotency = IdempotencyCache()
+
+# Live viewers of sessions; each state change is encoded once for all of them
+spectators = SpectatorHub()
+
+# Split EV solves run one at a time on their own thread: each can take
+# seconds, and they share the solver's memo tables
+split_ev_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="split-ev")
+
+# Strategy evaluation jobs run on their own bounded process pool, created
+# with the first job
+job_manager = None
+
+# Milliseconds per warmup step once startup is done; None until then
+warmup_timings: Optional[Dict[str, float]] = None
+
+# Seconds between progress checks on a job event stream
+JOB_EVENT_INTERVAL = 0.5
+
+
+class RulesRequest(BaseModel):
+    dealer_hits_soft_17: bool = False
+    num_decks: int = 1
+    double_after_split: bool = True
+    surrender: bool = False
+    dealer_peeks: bool = False
+    double_totals: Optional[List[int]] = None
+    blackjack_payout: float = 1.5
+    penetration: Optional[float] = None
+    max_split_hands: int = 4
+
+    def to_rule_set(self) -> RuleSet:
+        double_totals = frozenset(self.double_totals) if self.double_totals is not None else None
+        return RuleSet(
+            dealer_hits_soft_17=self.dealer_hits_soft_17,
+            num_decks=self.num_decks,
+            double_after_split=self.double_after_split,
+            surrender=self.surrender,
+            dealer_peeks=self.dealer_peeks,
+            double_totals=double_totals,
+            blackjack_payout=self.blackjack_payout,
+            penetration=self.penetration,
+            max_split_hands=self.max_split_hands,
+        )
 
 
 class GameResponse(BaseModel):
@@ -30,80 +148,544 @@ class GameResponse(BaseModel):
     game_state: Dict[str, Any]
 
 
+class TableRequest(BaseModel):
+    rules: Optional[RulesRequest] = None
+    round_timeout: float = DEFAULT_ROUND_TIMEOUT
+
+
+class ProfileRequest(BaseModel):
+    mode: str = "sampling"
+    seconds: float = 10.0
+    # cprofile mode: share of requests profiled
+    fraction: float = 1.0
+    # sampling mode: milliseconds between stack samples
+    interval_ms: float = DEFAULT_INTERVAL * 1000
+
+
+class JobRequest(BaseModel):
+    # {"hard": {"16": "SSSSSHHHHH", ...}, "soft": {...}}; rows list the
+    # action (H, S, D, R) against dealer upcards 2-9, 10, A
+    strategy: Dict[str, Dict[str, str]]
+    hands: int = 1_000_000
+    rules: Optional[RulesRequest] = None
+    seed: Optional[int] = None
+
+
+async def _game_action(session_id: str, action: str, idempotency_key: Optional[str]) -> Dict[str, Any]:
+    """Run one player action under the session lock.
+
+    With an Idempotency-Key header the outcome (state or 400 error) is kept,
+    and a retry with the same key replays it instead of acting again.
+    """
+    async with session_locks.hold(session_id):
+        if session_id not in games:
+            raise HTTPException(status_code=404, detail="Game session not found")
+        
+        if idempotency_key is not None:
+            cached = idempotency.get(session_id, idempotency_key)
+            if cached is not None:
+                cached_action, status_code, body = cached
+                if cached_action != action:
+                    raise HTTPException(
+                        status_code=409,
+                        detail=f"Idempotency-Key already used for {cached_action}",
+                    )
+                if status_code != 200:
+                    raise HTTPException(status_code=status_code, detail=body)
+                return body
+        
+        seat = games.get(session_id)
+        if isinstance(seat, SeatGame):
+            # Publish a timed-out round even if the action is then rejected
+            _poll_table(seat.table)
+        with games.locked(session_id):
+            game = games[session_id]
+            try:
+                result = getattr(game, action)()
+            except ValueError as e:
+                if idempotency_key is not None:
+                    idempotency.store(session_id, idempotency_key, action, 400, str(e))
+                raise HTTPException(status_code=400, detail=str(e))
+            # Write back: shared stores hand out decoded copies
+            games[session_id] = game
+        if idempotency_key is not None:
+            idempotency.store(session_id, idempotency_key, action, 200, result)
+        if isinstance(game, SeatGame):
+            # One seat finishing can settle the whole table
+            _publish_table(game.table)
+        elif spectators.watched(session_id):
+            spectators.publish(session_id, result)
+        return result
+
+
+def _publish_table(table: Table) -> None:
+    """Send the current state of every watched seat of ``table``."""
+    for session_id in spectators.watched_sessions():
+        game = games.get(session_id)
+        if getattr(game, "table", None) is table:
+            spectators.publish(session_id, game.get_game_state())
+
+
+def _poll_table(table: Table) -> None:
+    """Let ``table`` time out a stale round, publishing it if that settled it.
+
+    Table.poll also runs inside seat reads and actions; calling it here first
+    is what lets spectators see a round that only the deadline ended.
+    """
+    if table.poll():
+        _publish_table(table)
+
+
+# Game states are negotiated, so caches must key them on Accept
+VARY_ACCEPT = {"Vary": "Accept"}
+
+
+def _accept_quality(accept: str, media_type: str) -> Tuple[float, int]:
+    """q-value the Accept header gives a media type, and how specific the
+    range that set it is (2 exact, 1 type/*, 0 */*, -1 not accepted)."""
+    main_type = media_type.split("/")[0]
+    best_specificity, quality = -1, 0.0
+    for media_range in accept.split(","):
+        name, *params = (part.strip() for part in media_range.split(";"))
+        if name == media_type:
+            specificity = 2
+        elif name == f"{main_type}/*":
+            specificity = 1
+        elif name == "*/*":
+            specificity = 0
+        else:
+            continue
+        q = 1.0
+        for param in params:
+            key, _, value = param.partition("=")
+            if key.strip() == "q":
+                try:
+                    q = float(value)
+                except ValueError:
+                    q = 0.0
+        if specificity > best_specificity:
+            best_specificity, quality = specificity, q
+    return quality, best_specificity
+
+
+def _wants_wire_format(accept: Optional[str]) -> bool:
+    """Binary if the client prefers it to JSON, or names it and rates them equal."""
+    if accept is None:
+        return False
+    wire, specificity = _accept_quality(accept, WIRE_MEDIA_TYPE)
+    json_quality, _ = _accept_quality(accept, "application/json")
+    return wire > 0 and (wire > json_quality or (wire == json_quality and specificity == 2))
+
+
+def _render_state(state: Dict[str, Any], accept: Optional[str]) -> Response:
+    """A game state as JSON, or in the binary wire format if the client asks."""
+    if _wants_wire_format(accept):
+        return Response(encode_state(state), media_type=WIRE_MEDIA_TYPE, headers=VARY_ACCEPT)
+    return JSONResponse(state, headers=VARY_ACCEPT)
+
+
 @app.get("/")
 async def root():
     """Health check endpoint."""
     return {"message": "Blackjack Game API is running"}
 
 
+@app.get("/ready")
+async def ready():
+    """Readiness check: 503 until startup warmup has finished."""
+    if warmup_timings is None:
+        raise HTTPException(status_code=503, detail="Warming up")
+    return {"ready": True, "warmup_ms": warmup_timings}
+
+
 @app.post("/game/new", response_model=GameResponse)
-async def new_game():
-    """Start a new blackjack game."""
+async def new_game(rules: Optional[RulesRequest] = None, accept: Optional[str] = Header(None)):
+    """Start a new blackjack game, optionally with custom table rules.
+
+    In the binary wire format the body is the 16-byte session uuid followed
+    by the game state.
+    """
     session_id = str(uuid.uuid4())
-    game = BlackjackGame()
+    try:
+        rule_set = rules.to_rule_set() if rules is not None else None
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    game = BlackjackGame(rules=rule_set)
     game_state = game.start_new_game()
     games[session_id] = game
     
-    return GameResponse(session_id=session_id, game_state=game_state)
+    if _wants_wire_format(accept):
+        return Response(
+            uuid.UUID(session_id).bytes + encode_state(game_state),
+            media_type=WIRE_MEDIA_TYPE,
+            headers=VARY_ACCEPT,
+        )
+    return JSONResponse({"session_id": session_id, "game_state": game_state}, headers=VARY_ACCEPT)
 
 
 @app.get("/game/{session_id}", response_model=Dict[str, Any])
-async def get_game_state(session_id: str):
+async def get_game_state(session_id: str, accept: Optional[str] = Header(None)):
     """Get current game state."""
     if session_id not in games:
         raise HTTPException(status_code=404, detail="Game session not found")
     
     game = games[session_id]
-    return game.get_game_state()
+    if isinstance(game, SeatGame):
+        _poll_table(game.table)
+    return _render_state(game.get_game_state(), accept)
 
 
-@app.post("/game/{session_id}/hit", response_model=Dict[str, Any])
-async def hit(session_id: str):
-    """Player hits (takes another card)."""
+@app.get("/game/{session_id}/shoe", response_model=Dict[str, Any])
+async def get_shoe_state(session_id: str):
+    """Get the shoe composition and Hi-Lo running/true count."""
     if session_id not in games:
         raise HTTPException(status_code=404, detail="Game session not found")
     
     game = games[session_id]
-    try:
-        return game.hit()
-    except ValueError as e:
-        raise HTTPException(status_code=400, detail=str(e))
+    if isinstance(game, SeatGame):
+        _poll_table(game.table)
+    return game.get_shoe_state()
+
+
+@app.post("/game/{session_id}/hit", response_model=Dict[str, Any])
+async def hit(
+    session_id: str,
+    idempotency_key: Optional[str] = Header(None),
+    accept: Optional[str] = Header(None),
+):
+    """Player hits (takes another card)."""
+    return _render_state(await _game_action(session_id, "hit", idempotency_key), accept)
 
 
 @app.post("/game/{session_id}/stand", response_model=Dict[str, Any])
-async def stand(session_id: str):
+async def stand(
+    session_id: str,
+    idempotency_key: Optional[str] = Header(None),
+    accept: Optional[str] = Header(None),
+):
     """Player stands (ends their turn)."""
+    return _render_state(await _game_action(session_id, "stand", idempotency_key), accept)
+
+
+@app.post("/game/{session_id}/double-down", response_model=Dict[str, Any])
+async def double_down(
+    session_id: str,
+    idempotency_key: Optional[str] = Header(None),
+    accept: Optional[str] = Header(None),
+):
+    """Player doubles down (hit once then stand)."""
+    return _render_state(await _game_action(session_id, "double_down", idempotency_key), accept)
+
+
+@app.post("/game/{session_id}/surrender", response_model=Dict[str, Any])
+async def surrender(
+    session_id: str,
+    idempotency_key: Optional[str] = Header(None),
+    accept: Optional[str] = Header(None),
+):
+    """Player surrenders (forfeits half the stake)."""
+    return _render_state(await _game_action(session_id, "surrender", idempotency_key), accept)
+
+
+@app.post("/game/{session_id}/split", response_model=Dict[str, Any])
+async def split(
+    session_id: str,
+    idempotency_key: Optional[str] = Header(None),
+    accept: Optional[str] = Header(None),
+):
+    """Player splits a pair into two hands."""
+    return _render_state(await _game_action(session_id, "split", idempotency_key), accept)
+
+
+@app.get("/game/{session_id}/split-ev", response_model=Dict[str, Any])
+async def get_split_ev(session_id: str):
+    """Expected value of splitting the current pair versus not splitting."""
     if session_id not in games:
         raise HTTPException(status_code=404, detail="Game session not found")
     
+    from ev import solve_split, split_position
+
     game = games[session_id]
     try:
-        return game.stand()
+        position = split_position(game)
     except ValueError as e:
         raise HTTPException(status_code=400, detail=str(e))
+    # The solve can take seconds; it runs in a thread on a copy of the position
+    return await asyncio.get_running_loop().run_in_executor(split_ev_executor, solve_split, *position)
 
 
-@app.post("/game/{session_id}/double-down", response_model=Dict[str, Any])
-async def double_down(session_id: str):
-    """Player doubles down (hit once then stand)."""
+@app.get("/game/{session_id}/events")
+async def watch_game(session_id: str):
+    """Server-Sent Events stream of a game's states, for spectators.
+
+    The current state is sent first, then every change until the session
+    ends. A viewer that falls behind skips to newer states.
+    """
     if session_id not in games:
         raise HTTPException(status_code=404, detail="Game session not found")
+
+    async def events():
+        # Subscribed once streaming starts, so the finally below always runs
+        game = games.get(session_id)
+        if game is None:
+            return
+        if isinstance(game, SeatGame):
+            _poll_table(game.table)
+        subscription = spectators.subscribe(session_id, game.get_game_state())
+        try:
+            while True:
+                frame = await subscription.get()
+                if frame is None:
+                    return
+                yield frame
+        finally:
+            spectators.unsubscribe(subscription)
+
+    return StreamingResponse(events(), media_type="text/event-stream")
+
+
+@app.delete("/game/{session_id}")
+async def end_game(session_id: str):
+    """End game and clean up session."""
+    async with session_locks.hold(session_id):
+        if session_id not in games:
+            raise HTTPException(status_code=404, detail="Game session not found")
+        
+        game = games.pop(session_id)
+        idempotency.forget(session_id)
+        spectators.close(session_id)
+        if isinstance(game, SeatGame) and game.table.leave(game):
+            _publish_table(game.table)
+    return {"message": "Game session ended"}
+
+
+@app.post("/table/new")
+async def new_table(request: Optional[TableRequest] = None):
+    """Open a multi-seat table with a shared shoe."""
+    request = request or TableRequest()
+    try:
+        rule_set = request.rules.to_rule_set() if request.rules is not None else None
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    if request.round_timeout <= 0:
+        raise HTTPException(status_code=400, detail="round_timeout must be positive")
     
-    game = games[session_id]
+    table_id = str(uuid.uuid4())
+    table = Table(table_id, rules=rule_set, round_timeout=request.round_timeout)
+    tables[table_id] = table
+    return table.get_table_state()
+
+
+@app.get("/table/{table_id}", response_model=Dict[str, Any])
+async def get_table_state(table_id: str):
+    """Get the table overview: round, dealer upcard and every seat."""
+    if table_id not in tables:
+        raise HTTPException(status_code=404, detail="Table not found")
+    
+    table = tables[table_id]
+    _poll_table(table)
+    return table.get_table_state()
+
+
+@app.post("/table/{table_id}/join", response_model=GameResponse)
+async def join_table(table_id: str):
+    """Take a seat; the returned session id works with the /game endpoints."""
+    if table_id not in tables:
+        raise HTTPException(status_code=404, detail="Table not found")
+    
+    _poll_table(tables[table_id])
     try:
-        return game.double_down()
+        seat = tables[table_id].join()
     except ValueError as e:
         raise HTTPException(status_code=400, detail=str(e))
+    session_id = seat.session_id = str(uuid.uuid4())
+    games[session_id] = seat
+    return GameResponse(session_id=session_id, game_state=seat.get_game_state())
 
 
-@app.delete("/game/{session_id}")
-async def end_game(session_id: str):
-    """End game and clean up session."""
-    if session_id not in games:
-        raise HTTPException(status_code=404, detail="Game session not found")
+@app.post("/table/{table_id}/deal", response_model=Dict[str, Any])
+async def deal_table_round(table_id: str):
+    """Deal the next round to every seat."""
+    if table_id not in tables:
+        raise HTTPException(status_code=404, detail="Table not found")
     
-    del games[session_id]
-    return {"message": "Game session ended"}
+    table = tables[table_id]
+    try:
+        table_state = table.deal_round()
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    _publish_table(table)
+    return table_state
+
+
+@app.delete("/table/{table_id}")
+async def close_table(table_id: str):
+    """Close a table and end all of its seat sessions."""
+    if table_id not in tables:
+        raise HTTPException(status_code=404, detail="Table not found")
+    
+    table = tables.pop(table_id)
+    # Seats know their sessions, so no store scan (which would decode every
+    # shared session) is needed
+    for session_id in [seat.session_id for seat in table.occupied() if seat.session_id]:
+        games.pop(session_id, None)
+        idempotency.forget(session_id)
+        spectators.close(session_id)
+    return {"message": "Table closed"}
+
+
+@app.get("/admin/admission", response_model=Dict[str, Any])
+async def get_admission_stats():
+    """In-flight requests, admission queue depth and refusals."""
+    stats = admission.stats()
+    stats["rate_limited_new_games"] = new_game_limiter.limited
+    return stats
+
+
+@app.get("/admin/spectators", response_model=Dict[str, Any])
+async def get_spectator_stats():
+    """Watched sessions, viewers and frames delivered or dropped."""
+    return spectators.stats()
+
+
+@app.get("/admin/locks", response_model=Dict[str, Any])
+async def get_lock_stats():
+    """Session lock contention, lock-wait time and idempotent replays."""
+    stats = session_locks.stats()
+    stats["idempotent_replays"] = idempotency.replays
+    return stats
+
+
+def _require_profiling() -> None:
+    """Profiling and timing endpoints exist only with BLACKJACK_ENABLE_PROFILING=1.
+
+    They slow every request while active and expose code paths, so a
+    deployment has to opt in.
+    """
+    if os.environ.get("BLACKJACK_ENABLE_PROFILING") != "1":
+        raise HTTPException(status_code=404, detail="Not Found")
+
+
+# The profiling endpoints all need the opt-in
+PROFILING = [Depends(_require_profiling)]
+
+
+@app.post("/admin/profile", response_model=Dict[str, Any], dependencies=PROFILING)
+async def start_profile(request: Optional[ProfileRequest] = None):
+    """Profile for a number of seconds by stack sampling or per-request cProfile."""
+    request = request or ProfileRequest()
+    try:
+        return profiler.start(
+            request.mode, request.seconds, request.fraction, request.interval_ms / 1000
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+
+@app.get("/admin/profile", response_model=Dict[str, Any], dependencies=PROFILING)
+async def get_profile_status():
+    """Current profiling mode, time left and samples collected."""
+    return profiler.status()
+
+
+@app.post("/admin/profile/stop", response_model=Dict[str, Any], dependencies=PROFILING)
+async def stop_profile():
+    """End profiling early; results are kept."""
+    return profiler.stop()
+
+
+@app.get("/admin/profile/collapsed", response_class=PlainTextResponse, dependencies=PROFILING)
+async def get_profile_collapsed():
+    """Profile results as collapsed stacks, ready for flamegraph.pl or speedscope."""
+    return PlainTextResponse(profiler.collapsed())
+
+
+@app.get("/admin/timing", response_model=Dict[str, Any], dependencies=PROFILING)
+async def get_hot_path_timing():
+    """Call counts and times of the engine hot paths while timing is on."""
+    return hot_path_timer.stats()
+
+
+@app.post("/admin/timing/enable", response_model=Dict[str, Any], dependencies=PROFILING)
+async def enable_hot_path_timing():
+    """Install timing hooks on the engine hot paths (resets the figures)."""
+    hot_path_timer.enable()
+    return hot_path_timer.stats()
+
+
+@app.post("/admin/timing/disable", response_model=Dict[str, Any], dependencies=PROFILING)
+async def disable_hot_path_timing():
+    """Remove the timing hooks; figures so far are kept."""
+    hot_path_timer.disable()
+    return hot_path_timer.stats()
+
+
+def _job_manager():
+    global job_manager
+    if job_manager is None:
+        from jobs import JobManager
+        job_manager = JobManager()
+    return job_manager
+
+
+@app.post("/jobs", response_model=Dict[str, Any])
+async def submit_job(request: JobRequest):
+    """Queue a background simulation of a strategy table."""
+    from jobs import JobQueueFull
+
+    try:
+        rule_set = request.rules.to_rule_set() if request.rules is not None else None
+        return _job_manager().submit(request.strategy, request.hands, rule_set, request.seed)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except JobQueueFull as e:
+        raise HTTPException(status_code=503, detail=str(e))
+
+
+@app.get("/jobs/{job_id}", response_model=Dict[str, Any])
+async def get_job(job_id: str):
+    """Job progress: hands played and running EV with its 95% interval."""
+    try:
+        return _job_manager().status(job_id)
+    except KeyError:
+        raise HTTPException(status_code=404, detail="Job not found")
+
+
+@app.post("/jobs/{job_id}/cancel", response_model=Dict[str, Any])
+async def cancel_job(job_id: str):
+    """Stop a job; results so far are kept."""
+    try:
+        return _job_manager().cancel(job_id)
+    except KeyError:
+        raise HTTPException(status_code=404, detail="Job not found")
+
+
+@app.get("/jobs/{job_id}/events")
+async def job_events(job_id: str):
+    """Server-Sent Events stream of job progress until the job finishes."""
+    from jobs import FINISHED_STATES
+
+    manager = _job_manager()
+    try:
+        manager.status(job_id)
+    except KeyError:
+        raise HTTPException(status_code=404, detail="Job not found")
+
+    async def events():
+        version = None
+        while True:
+            try:
+                status = manager.status(job_id)
+            except KeyError:
+                return
+            if status["version"] != version:
+                version = status["version"]
+                yield f"data: {json.dumps(status)}\n\n"
+            if status["status"] in FINISHED_STATES:
+                return
+            await asyncio.sleep(JOB_EVENT_INTERVAL)
+
+    return StreamingResponse(events(), media_type="text/event-stream")
 
 
 if __name__ == "__main__":
@@ -0,0 +1,308 @@
+"""
+Differential Equivalence Harness
+Replays seeded shoes and action scripts through the scalar BlackjackGame and
+alternative engines, compares every step and shrinks mismatches.
+"""
+
+import argparse
+import random
+from dataclasses import dataclass, field
+from functools import partial
+from multiprocessing import Pool
+from typing import Callable, Dict, List, Optional, Tuple
+
+from game_engine import BlackjackGame, GameState, RuleSet
+from vec_env import VecBlackjackEnv, STAND, HIT, DOUBLE_DOWN, SURRENDER
+
+
+ACTIONS = ("hit", "stand", "double_down", "surrender")
+
+# (state, player value, player soft, dealer value, result, shoe running count),
+# or ("rejected", action)
+Snapshot = Tuple
+
+
+class ScalarEngine:
+    """Reference engine: drives game_engine.BlackjackGame directly."""
+
+    def __init__(self, seed: int, rules: Optional[RuleSet] = None):
+        self.game = BlackjackGame(random.Random(seed), rules)
+
+    def start(self) -> None:
+        self.game.start_new_game()
+
+    def act(self, action: str) -> None:
+        getattr(self.game, action)()
+
+    def snapshot(self) -> Snapshot:
+        game = self.game
+        return (
+            game.state.value,
+            game.player_hand.get_value(),
+            game.player_hand.is_soft(),
+            game.dealer_hand.get_value(),
+            game.result.value if game.result else None,
+            game.deck.running_count,
+        )
+
+
+class VecEngine:
+    """Single-slot VecBlackjackEnv behind the harness interface."""
+
+    _ACTION_IDS = {"hit": HIT, "stand": STAND, "double_down": DOUBLE_DOWN, "surrender": SURRENDER}
+
+    def __init__(self, seed: int, rules: Optional[RuleSet] = None):
+        self.env = VecBlackjackEnv(1, seed=seed, rules=rules)
+        self.started = False
+        self.terminal: Optional[Snapshot] = None
+
+    def start(self) -> None:
+        if not self.started:
+            self.env.reset()
+            self.started = True
+        elif self.terminal is None:
+            # Unfinished or natural hand: flush it so the env deals the next one
+            self.env.step([STAND])
+        self.terminal = None
+
+    def act(self, action: str) -> None:
+        env = self.env
+        _, _, dones, infos = env.step([self._ACTION_IDS[action]])
+        if dones[0]:
+            info = infos[0]
+            player_total, soft, _, _ = info["terminal_observation"]
+            self.terminal = (
+                GameState.GAME_OVER.value,
+                player_total,
+                bool(soft),
+                info["dealer_total"],
+                info["result"].value,
+                info["running_count"],
+            )
+
+    def snapshot(self) -> Snapshot:
+        if self.terminal is not None:
+            return self.terminal
+        env = self.env
+        pending = env.pending[0]
+        state = GameState.GAME_OVER if pending is not None else GameState.PLAYER_TURN
+        return (
+            state.value,
+            env.player_total[0],
+            bool(env.player_soft[0]),
+            env.dealer_total[0],
+            pending.value if pending else None,
+            env.running_count[0],
+        )
+
+
+ENGINES: Dict[str, Callable] = {
+    "scalar": ScalarEngine,
+    "vec": VecEngine,
+}
+
+
+@dataclass
+class Case:
+    """One seeded shoe plus an action script per hand."""
+    seed: int
+    hands: List[List[str]] = field(default_factory=list)
+
+
+@dataclass
+class Mismatch:
+    """First point where two engines disagree on a case."""
+    case: Case
+    step: int
+    expected: Snapshot
+    actual: Snapshot
+
+
+def generate_case(case_seed: int, hands_per_case: int = 4, max_actions: int = 4) -> Case:
+    """Build a reproducible random case from a single seed."""
+    rng = random.Random(case_seed)
+    hands = [
+        [rng.choice(ACTIONS) for _ in range(rng.randint(0, max_actions))]
+        for _ in range(hands_per_case)
+    ]
+    return Case(seed=case_seed, hands=hands)
+
+
+def trace(factory: Callable, case: Case) -> List[Snapshot]:
+    """Replay a case and record a snapshot after the deal and every action.
+
+    Actions left over once a hand is finished are skipped; a hand still in
+    play when its script runs out is stood so the dealer is compared too.
+    """
+    engine = factory(case.seed)
+    snapshots: List[Snapshot] = []
+    for script in case.hands:
+        engine.start()
+        snapshots.append(engine.snapshot())
+        for action in script + ["stand"]:
+            if engine.snapshot()[0] != GameState.PLAYER_TURN.value:
+                break
+            try:
+                engine.act(action)
+            except ValueError:
+                snapshots.append(("rejected", action))
+                continue
+            snapshots.append(engine.snapshot())
+    return snapshots
+
+
+def compare(reference: Callable, candidate: Callable, case: Case) -> Optional[Mismatch]:
+    """Return the first divergence between two engines on a case, if any."""
+    expected = trace(reference, case)
+    actual = trace(candidate, case)
+    for step, (want, got) in enumerate(zip(expected, actual)):
+        if want != got:
+            return Mismatch(case, step, want, got)
+    if len(expected) != len(actual):
+        step = min(len(expected), len(actual))
+        want = expected[step] if step < len(expected) else ("missing",)
+        got = actual[step] if step < len(actual) else ("missing",)
+        return Mismatch(case, step, want, got)
+    return None
+
+
+def shrink(reference: Callable, candidate: Callable, case: Case) -> Case:
+    """Greedily reduce a failing case to a minimal one that still fails.
+
+    Tries dropping whole hands, dropping single actions and replacing actions
+    with a plain stand, until no simplification keeps the mismatch.
+    """
+    def fails(hands: List[List[str]]) -> bool:
+        return compare(reference, candidate, Case(case.seed, hands)) is not None
+
+    hands = [list(script) for script in case.hands]
+    changed = True
+    while changed:
+        changed = False
+        for h in range(len(hands)):
+            candidate_hands = hands[:h] + hands[h + 1:]
+            if candidate_hands and fails(candidate_hands):
+                hands = candidate_hands
+                changed = True
+                break
+        if changed:
+            continue
+        for h, script in enumerate(hands):
+            for a in range(len(script)):
+                options = [script[:a] + script[a + 1:]]
+                if script[a] != "stand":
+                    options.append(script[:a] + ["stand"] + script[a + 1:])
+                for option in options:
+                    candidate_hands = hands[:h] + [option] + hands[h + 1:]
+                    if fails(candidate_hands):
+                        hands = candidate_hands
+                        changed = True
+                        break
+                if changed:
+                    break
+            if changed:
+                break
+    return Case(case.seed, hands)
+
+
+def _engine(name: str, rules: Optional[RuleSet]) -> Callable:
+    return partial(ENGINES[name], rules=rules)
+
+
+def _check_shard(args: Tuple) -> Tuple[int, Optional[Mismatch]]:
+    """Worker: check a contiguous range of case seeds, stop at the first mismatch."""
+    reference_name, candidate_name, rules, start, count, hands_per_case = args
+    reference, candidate = _engine(reference_name, rules), _engine(candidate_name, rules)
+    for case_seed in range(start, start + count):
+        mismatch = compare(reference, candidate, generate_case(case_seed, hands_per_case))
+        if mismatch is not None:
+            return case_seed - start + 1, mismatch
+    return count, None
+
+
+def run_differential(
+    reference: str = "scalar",
+    candidate: str = "vec",
+    num_cases: int = 1000,
+    base_seed: int = 0,
+    hands_per_case: int = 4,
+    processes: int = 1,
+    shard_size: int = 500,
+    rules: Optional[RuleSet] = None,
+) -> Tuple[int, Optional[Mismatch]]:
+    """Compare two registered engines over ``num_cases`` seeded cases.
+
+    Work is split into shards of consecutive seeds and spread over
+    ``processes`` workers. Returns the number of cases checked and the first
+    mismatch found (already shrunk), or None when the engines agree.
+    """
+    shards = [
+        (reference, candidate, rules, start, min(shard_size, base_seed + num_cases - start), hands_per_case)
+        for start in range(base_seed, base_seed + num_cases, shard_size)
+    ]
+
+    checked = 0
+    mismatch: Optional[Mismatch] = None
+    if processes <= 1:
+        results = map(_check_shard, shards)
+        for count, found in results:
+            checked += count
+            if found is not None:
+                mismatch = found
+                break
+    else:
+        with Pool(processes) as pool:
+            for count, found in pool.imap(_check_shard, shards):
+                checked += count
+                if found is not None:
+                    mismatch = found
+                    pool.terminate()
+                    break
+
+    if mismatch is None:
+        return checked, None
+
+    reference_engine, candidate_engine = _engine(reference, rules), _engine(candidate, rules)
+    minimal = shrink(reference_engine, candidate_engine, mismatch.case)
+    return checked, compare(reference_engine, candidate_engine, minimal)
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Differential check of blackjack engines")
+    parser.add_argument("--reference", default="scalar", choices=sorted(ENGINES))
+    parser.add_argument("--candidate", default="vec", choices=sorted(ENGINES))
+    parser.add_argument("--cases", type=int, default=10000)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--hands", type=int, default=4, help="hands per case")
+    parser.add_argument("--processes", type=int, default=1)
+    parser.add_argument("--decks", type=int, default=1)
+    parser.add_argument("--h17", action="store_true", help="dealer hits soft 17")
+    parser.add_argument("--surrender", action="store_true")
+    parser.add_argument("--peek", action="store_true")
+    parser.add_argument("--penetration", type=float, default=None)
+    args = parser.parse_args()
+
+    rules = RuleSet(
+        dealer_hits_soft_17=args.h17,
+        num_decks=args.decks,
+        surrender=args.surrender,
+        dealer_peeks=args.peek,
+        penetration=args.penetration,
+    )
+    checked, mismatch = run_differential(
+        args.reference, args.candidate, args.cases, args.seed, args.hands, args.processes,
+        rules=rules,
+    )
+    if mismatch is None:
+        print(f"OK: {checked} cases ({checked * args.hands} hands) match")
+        return 0
+    print(f"MISMATCH after {checked} cases")
+    print(f"  case:     {mismatch.case}")
+    print(f"  step:     {mismatch.step}")
+    print(f"  expected: {mismatch.expected}")
+    print(f"  actual:   {mismatch.actual}")
+    return 1
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
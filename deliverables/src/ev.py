@@ -0,0 +1,223 @@
+"""
+Expected Value Solver
+Exact expected values for standing, hitting and doubling against a known
+shoe composition, and an approximate value for splitting (see
+SPLIT_APPROXIMATION). Subgames are memoized, so repeated split advice
+solves each (pair, upcard, shoe) position only once.
+"""
+
+from functools import lru_cache
+from typing import Dict, Sequence, Tuple
+
+from game_engine import DECK_SIZE, RANKS, BlackjackGame, GameState, RuleSet, compile_rules
+
+
+# Card values in composition order; a composition counts remaining cards per value
+VALUES: Tuple[int, ...] = (2, 3, 4, 5, 6, 7, 8, 9, 10, 11)
+Composition = Tuple[int, ...]
+
+# Dealer final totals tracked by dealer_outcomes(); the last slot is a bust
+DEALER_TOTALS: Tuple[int, ...] = (17, 18, 19, 20, 21)
+BUST = len(DEALER_TOTALS)
+
+# Split advice is only solved for shoes with at most this many unseen cards;
+# the worst single-deck position (aces against a 2) takes about two seconds
+MAX_SOLVER_CARDS = DECK_SIZE
+# split_ev() is not exact; advice says so alongside the numbers
+SPLIT_APPROXIMATION = "split hands valued independently from the post-split shoe; no resplits"
+# Memo tables are bounded: the dealer table holds the worst position's
+# subgames, the others every position of a warm split table
+DEALER_MEMO_SIZE = 1 << 18
+MEMO_SIZE = 1 << 17
+
+
+def composition_from_rank_counts(rank_counts: Sequence[int]) -> Composition:
+    """Fold per-rank counts (indexed like RANKS) into per-value counts."""
+    counts = [0] * len(VALUES)
+    for rank, count in zip(RANKS, rank_counts):
+        counts[rank.card_value - 2] += count
+    return tuple(counts)
+
+
+def _add_card(total: int, soft_aces: int, value: int) -> Tuple[int, int]:
+    total += value
+    soft_aces += value == 11
+    while total > 21 and soft_aces:
+        total -= 10
+        soft_aces -= 1
+    return total, soft_aces
+
+
+def _draws(composition: Composition):
+    """Yield (probability, value, composition without that card)."""
+    remaining = sum(composition)
+    for index, count in enumerate(composition):
+        if count:
+            rest = composition[:index] + (count - 1,) + composition[index + 1:]
+            yield count / remaining, VALUES[index], rest
+
+
+@lru_cache(maxsize=DEALER_MEMO_SIZE)
+def dealer_outcomes(
+    total: int, soft_aces: int, composition: Composition, rules: RuleSet
+) -> Tuple[float, ...]:
+    """Probabilities of the dealer finishing on 17..21 or busting."""
+    if total > 21:
+        outcome = [0.0] * (BUST + 1)
+        outcome[BUST] = 1.0
+        return tuple(outcome)
+    if not compile_rules(rules).dealer_hits[soft_aces > 0][total]:
+        outcome = [0.0] * (BUST + 1)
+        outcome[DEALER_TOTALS.index(total)] = 1.0
+        return tuple(outcome)
+
+    outcome = [0.0] * (BUST + 1)
+    for probability, value, rest in _draws(composition):
+        next_total, next_soft = _add_card(total, soft_aces, value)
+        for index, p in enumerate(dealer_outcomes(next_total, next_soft, rest, rules)):
+            outcome[index] += probability * p
+    return tuple(outcome)
+
+
+@lru_cache(maxsize=MEMO_SIZE)
+def _upcard_outcomes(upcard: int, composition: Composition, rules: RuleSet) -> Tuple[float, ...]:
+    """Dealer outcomes from the upcard, drawing the hole card from the shoe.
+
+    When the dealer peeks, a dealer blackjack would already have ended the
+    hand, so those hole cards are excluded.
+    """
+    peeks = upcard in compile_rules(rules).peek_upcards
+    outcome = [0.0] * (BUST + 1)
+    kept = 0.0
+    start_total, start_soft = _add_card(0, 0, upcard)
+    for probability, value, rest in _draws(composition):
+        total, soft_aces = _add_card(start_total, start_soft, value)
+        if peeks and total == 21:
+            continue
+        kept += probability
+        for index, p in enumerate(dealer_outcomes(total, soft_aces, rest, rules)):
+            outcome[index] += probability * p
+    return tuple(p / kept for p in outcome) if kept else tuple(outcome)
+
+
+def stand_ev(total: int, upcard: int, composition: Composition, rules: RuleSet) -> float:
+    """EV of standing on ``total`` per unit stake."""
+    if total > 21:
+        return -1.0
+    # Every total below 17 only wins when the dealer busts
+    return _stand_ev(max(total, 16), upcard, composition, rules)
+
+
+@lru_cache(maxsize=MEMO_SIZE)
+def _stand_ev(total: int, upcard: int, composition: Composition, rules: RuleSet) -> float:
+    outcome = _upcard_outcomes(upcard, composition, rules)
+    ev = outcome[BUST]
+    for dealer_total, p in zip(DEALER_TOTALS, outcome):
+        if total > dealer_total:
+            ev += p
+        elif total < dealer_total:
+            ev -= p
+    return ev
+
+
+@lru_cache(maxsize=MEMO_SIZE)
+def hand_ev(
+    total: int,
+    soft_aces: int,
+    upcard: int,
+    composition: Composition,
+    rules: RuleSet,
+    can_double: bool,
+) -> float:
+    """EV of a hand played optimally by standing, hitting or doubling."""
+    stand = stand_ev(total, upcard, composition, rules)
+    if total >= 21:
+        return stand
+
+    hit = 0.0
+    double = 0.0
+    for probability, value, rest in _draws(composition):
+        next_total, next_soft = _add_card(total, soft_aces, value)
+        if next_total > 21:
+            hit -= probability
+        else:
+            hit += probability * hand_ev(next_total, next_soft, upcard, rest, rules, False)
+        if can_double:
+            double += probability * 2 * stand_ev(next_total, upcard, rest, rules)
+
+    best = max(stand, hit)
+    return max(best, double) if can_double else best
+
+
+@lru_cache(maxsize=MEMO_SIZE)
+def split_ev(pair_value: int, upcard: int, composition: Composition, rules: RuleSet) -> float:
+    """EV of splitting a pair, per unit of the original stake (both hands).
+
+    ``composition`` is the unseen shoe with both pair cards and the upcard
+    already removed. Each hand takes its second card from that shoe and is
+    played optimally (doubling if DAS allows; split aces stand on one card).
+    Resplits are not considered, and the two hands are valued independently
+    from the post-split composition.
+    """
+    double_allowed = compile_rules(rules).double_allowed
+    ev = 0.0
+    for probability, value, rest in _draws(composition):
+        total, soft_aces = _add_card(pair_value, 1 if pair_value == 11 else 0, value)
+        if pair_value == 11:
+            ev += probability * stand_ev(total, upcard, rest, rules)
+        else:
+            can_double = rules.double_after_split and double_allowed[total]
+            ev += probability * hand_ev(total, soft_aces, upcard, rest, rules, can_double)
+    return 2 * ev
+
+
+def split_position(game: BlackjackGame) -> Tuple:
+    """The game's pair, upcard, unseen shoe and options, as split advice needs them."""
+    if game.state != GameState.PLAYER_TURN or not game.can_split:
+        raise ValueError("No pair to split")
+
+    shoe = game.get_shoe_state()
+    if shoe["cards_remaining"] > MAX_SOLVER_CARDS:
+        raise ValueError(
+            f"Shoe too large to solve: {shoe['cards_remaining']} unseen cards, limit {MAX_SOLVER_CARDS}"
+        )
+    composition = composition_from_rank_counts(list(shoe["rank_counts"].values()))
+    hand = game.player_hand
+    return (
+        hand.cards[0].value,
+        hand.get_value(),
+        1 if hand.is_soft() else 0,
+        game.dealer_hand.cards[0].value,
+        composition,
+        game.rules,
+        game.can_double_down,
+        game.can_surrender,
+    )
+
+
+def solve_split(
+    pair_value: int,
+    total: int,
+    soft_aces: int,
+    upcard: int,
+    composition: Composition,
+    rules: RuleSet,
+    can_double: bool,
+    can_surrender: bool,
+) -> Dict[str, float]:
+    """Compare splitting a pair against the best other play."""
+    split = split_ev(pair_value, upcard, composition, rules)
+    no_split = hand_ev(total, soft_aces, upcard, composition, rules, can_double)
+    if can_surrender:
+        no_split = max(no_split, -0.5)
+    return {
+        "split_ev": split,
+        "no_split_ev": no_split,
+        "recommendation": "split" if split > no_split else "no_split",
+        "approximation": SPLIT_APPROXIMATION,
+    }
+
+
+def split_advice(game: BlackjackGame) -> Dict[str, float]:
+    """Compare splitting the current pair against the best other play."""
+    return solve_split(*split_position(game))
@@ -15,8 +15,18 @@ export interface Hand {
   hidden_card?: boolean;
 }
 
+export interface PlayerHand {
+  cards: Card[];
+  value: number;
+  is_bust: boolean;
+  doubled: boolean;
+  result: string | null;
+}
+
 export interface GameState {
   player_hand: Hand;
+  hands?: PlayerHand[];
+  active_hand?: number;
   dealer_hand: Hand;
   state: string;
   result: string | null;
@@ -25,6 +35,7 @@ export interface GameState {
     can_stand: boolean;
     can_double_down: boolean;
     can_split: boolean;
+    can_surrender?: boolean;
   };
 }
 
@@ -65,6 +76,11 @@ export class ApiClient {
     return response.data;
   }
 
+  async split(sessionId: string): Promise<GameState> {
+    const response = await axios.post(`${this.baseURL}/game/${sessionId}/split`);
+    return response.data;
+  }
+
   async endGame(sessionId: string): Promise<void> {
     await axios.delete(`${this.baseURL}/game/${sessionId}`);
   }
@@ -0,0 +1,231 @@
+"""
+Binary Game Codec
+Fixed-size binary records for BlackjackGame, written into and read from any
+writable buffer in place (shared memory, mmap, bytearray).
+"""
+
+import random
+import struct
+import uuid
+from functools import lru_cache
+from typing import Optional
+
+from game_engine import (
+    DECK_CARDS,
+    MAX_DECKS,
+    MAX_HAND_CARDS,
+    MAX_SPLIT_HANDS,
+    RANKS,
+    BlackjackGame,
+    Deck,
+    GameResult,
+    GameState,
+    Hand,
+    RuleSet,
+)
+
+
+CODEC_VERSION = 1
+
+# Largest games a record can hold: every game RuleSet allows
+MAX_RECORD_DECKS = MAX_DECKS
+MAX_RECORD_HANDS = MAX_SPLIT_HANDS
+
+_STATES = tuple(GameState)
+_STATE_INDEX = {state: i for i, state in enumerate(_STATES)}
+_RESULTS = tuple(GameResult)
+_RESULT_INDEX = {result: i for i, result in enumerate(_RESULTS)}
+NO_RESULT = 0xFF
+
+# Game flags
+_CAN_DOUBLE, _CAN_SPLIT, _CAN_SURRENDER, _SPLIT_ACES = 1, 2, 4, 8
+# Rule flags
+_H17, _DAS, _SURRENDER, _PEEK, _ANY_DOUBLE = 1, 2, 4, 8, 16
+
+# version, state, result, flags, rule flags, decks, max hands, hand count,
+# active hand, dealer cards, running count, shoe cards, double-total mask,
+# blackjack payout, penetration (0 when unset: a valid one is never 0)
+_HEADER = struct.Struct("<10BhHIdd")
+
+_RANK_COUNTS = _HEADER.size
+_HAND_LENGTHS = _RANK_COUNTS + len(RANKS)
+_HAND_TOTALS = _HAND_LENGTHS + MAX_RECORD_HANDS
+_HAND_SOFT = _HAND_TOTALS + MAX_RECORD_HANDS
+_HAND_DOUBLED = _HAND_SOFT + MAX_RECORD_HANDS
+_HAND_RESULTS = _HAND_DOUBLED + MAX_RECORD_HANDS
+_HAND_CARDS = _HAND_RESULTS + MAX_RECORD_HANDS
+_DEALER_CARDS = _HAND_CARDS + MAX_RECORD_HANDS * MAX_HAND_CARDS
+_SHOE_CARDS = _DEALER_CARDS + MAX_HAND_CARDS
+RECORD_SIZE = _SHOE_CARDS + MAX_RECORD_DECKS * len(DECK_CARDS)
+
+
+def check_encodable(rules: RuleSet) -> None:
+    """Raise ValueError if games under these rules do not fit a record."""
+    if rules.num_decks > MAX_RECORD_DECKS:
+        raise ValueError(f"num_decks above {MAX_RECORD_DECKS} cannot be stored")
+    if rules.max_split_hands > MAX_RECORD_HANDS:
+        raise ValueError(f"max_split_hands above {MAX_RECORD_HANDS} cannot be stored")
+
+
+def encode_into(game: BlackjackGame, buffer, offset: int = 0) -> None:
+    """Write ``game`` as a RECORD_SIZE record at ``buffer[offset:]``."""
+    rules = game.rules
+    check_encodable(rules)
+    hands = game.hands
+    deck = game.deck
+    dealer_cards = game.dealer_hand.cards
+    if len(dealer_cards) > MAX_HAND_CARDS:
+        raise ValueError("Dealer hand is too long to store")
+
+    flags = (
+        (_CAN_DOUBLE if game.can_double_down else 0)
+        | (_CAN_SPLIT if game.can_split else 0)
+        | (_CAN_SURRENDER if game.can_surrender else 0)
+        | (_SPLIT_ACES if hands.split_aces else 0)
+    )
+    rule_flags = (
+        (_H17 if rules.dealer_hits_soft_17 else 0)
+        | (_DAS if rules.double_after_split else 0)
+        | (_SURRENDER if rules.surrender else 0)
+        | (_PEEK if rules.dealer_peeks else 0)
+        | (_ANY_DOUBLE if rules.double_totals is None else 0)
+    )
+    double_mask = 0
+    for total in rules.double_totals or ():
+        double_mask |= 1 << total
+    _HEADER.pack_into(
+        buffer, offset,
+        CODEC_VERSION,
+        _STATE_INDEX[game.state],
+        NO_RESULT if game.result is None else _RESULT_INDEX[game.result],
+        flags,
+        rule_flags,
+        rules.num_decks,
+        rules.max_split_hands,
+        hands.count,
+        hands.active,
+        len(dealer_cards),
+        deck.running_count,
+        len(deck.cards),
+        double_mask,
+        rules.blackjack_payout,
+        rules.penetration or 0.0,
+    )
+
+    buffer[offset + _RANK_COUNTS:offset + _HAND_LENGTHS] = bytes(deck.rank_counts)
+    max_hands = hands.max_hands
+    for start, values in (
+        (_HAND_LENGTHS, hands.lengths),
+        (_HAND_TOTALS, hands.totals),
+        (_HAND_SOFT, hands.soft_aces),
+        (_HAND_DOUBLED, hands.doubled),
+    ):
+        buffer[offset + start:offset + start + max_hands] = values
+    buffer[offset + _HAND_RESULTS:offset + _HAND_RESULTS + max_hands] = bytes(
+        NO_RESULT if result is None else _RESULT_INDEX[result] for result in hands.results
+    )
+    start = offset + _HAND_CARDS
+    buffer[start:start + len(hands.cards)] = hands.cards
+    start = offset + _DEALER_CARDS
+    buffer[start:start + len(dealer_cards)] = bytes(card.id for card in dealer_cards)
+    start = offset + _SHOE_CARDS
+    buffer[start:start + len(deck.cards)] = bytes(card.id for card in deck.cards)
+
+
+def session_key(session_id: str) -> Optional[bytes]:
+    """The 16 uuid bytes a session is filed under, or None for other ids."""
+    try:
+        return uuid.UUID(session_id).bytes
+    except (ValueError, AttributeError, TypeError):
+        return None
+
+
+def encode(game: BlackjackGame) -> bytes:
+    record = bytearray(RECORD_SIZE)
+    encode_into(game, record)
+    return bytes(record)
+
+
+@lru_cache(maxsize=256)
+def _decode_rules(
+    rule_flags: int, num_decks: int, max_split_hands: int,
+    double_mask: int, blackjack_payout: float, penetration: float,
+) -> RuleSet:
+    # Records share a handful of rule sets; decode each one once. Bounded
+    # like compile_rules, since clients choose the rules
+    double_totals = None
+    if not rule_flags & _ANY_DOUBLE:
+        double_totals = frozenset(total for total in range(32) if double_mask >> total & 1)
+    return RuleSet(
+        dealer_hits_soft_17=bool(rule_flags & _H17),
+        num_decks=num_decks,
+        double_after_split=bool(rule_flags & _DAS),
+        surrender=bool(rule_flags & _SURRENDER),
+        dealer_peeks=bool(rule_flags & _PEEK),
+        double_totals=double_totals,
+        blackjack_payout=blackjack_payout,
+        penetration=penetration or None,
+        max_split_hands=max_split_hands,
+    )
+
+
+def decode_from(buffer, offset: int = 0) -> BlackjackGame:
+    """Rebuild a BlackjackGame from the record at ``buffer[offset:]``.
+
+    The game's RNG is not stored: decoded games reshuffle with the module
+    RNG, like every API session.
+    """
+    (
+        version, state, result, flags, rule_flags, num_decks, max_split_hands,
+        hand_count, active, dealer_length, running_count, shoe_length,
+        double_mask, blackjack_payout, penetration,
+    ) = _HEADER.unpack_from(buffer, offset)
+    if version != CODEC_VERSION:
+        raise ValueError(f"Unsupported game record version {version}")
+    rules = _decode_rules(
+        rule_flags, num_decks, max_split_hands, double_mask, blackjack_payout, penetration
+    )
+
+    # Build the shoe directly: Deck() would shuffle a new one first
+    deck = Deck.__new__(Deck)
+    deck.rng = random
+    deck.num_decks = num_decks
+    start = offset + _SHOE_CARDS
+    deck.cards = [DECK_CARDS[card_id] for card_id in buffer[start:start + shoe_length]]
+    start = offset + _RANK_COUNTS
+    deck.rank_counts = list(buffer[start:start + len(RANKS)])
+    deck.running_count = running_count
+
+    game = BlackjackGame(rules=rules, deck=deck)
+    game.state = _STATES[state]
+    game.result = None if result == NO_RESULT else _RESULTS[result]
+    game.can_double_down = bool(flags & _CAN_DOUBLE)
+    game.can_split = bool(flags & _CAN_SPLIT)
+    game.can_surrender = bool(flags & _CAN_SURRENDER)
+
+    hands = game.hands
+    for start, values in (
+        (_HAND_LENGTHS, hands.lengths),
+        (_HAND_TOTALS, hands.totals),
+        (_HAND_SOFT, hands.soft_aces),
+        (_HAND_DOUBLED, hands.doubled),
+    ):
+        values[:] = buffer[offset + start:offset + start + max_split_hands]
+    start = offset + _HAND_RESULTS
+    hands.results = [
+        None if index == NO_RESULT else _RESULTS[index]
+        for index in buffer[start:start + max_split_hands]
+    ]
+    start = offset + _HAND_CARDS
+    hands.cards[:] = buffer[start:start + len(hands.cards)]
+    hands.count = hand_count
+    hands.active = active
+    hands.split_aces = bool(flags & _SPLIT_ACES)
+
+    start = offset + _DEALER_CARDS
+    game.dealer_hand = Hand([DECK_CARDS[card_id] for card_id in buffer[start:start + dealer_length]])
+    return game
+
+
+def decode(data: bytes) -> BlackjackGame:
+    return decode_from(data)
@@ -3,10 +3,12 @@ Blackjack Game Engine
 Core game logic for single-player blackjack without betting.
 """
 
+import math
 import random
 from enum import Enum
 from dataclasses import dataclass
-from typing import List, Tuple, Optional
+from functools import lru_cache
+from typing import Dict, FrozenSet, List, Tuple, Optional
 
 
 class Suit(Enum):
@@ -48,6 +50,37 @@ class Card:
     def value(self) -> int:
         return self.rank.card_value
 
+    @property
+    def id(self) -> int:
+        """Compact card id (0-51), in the order a fresh deck is built."""
+        return SUIT_INDEX[self.suit] * len(RANKS) + RANK_INDEX[self.rank]
+
+
+# Card ids follow the construction order of Deck.reset(), so a list of ids
+# shuffled with the same RNG state is dealt in exactly the same order as a Deck.
+SUITS: Tuple[Suit, ...] = tuple(Suit)
+RANKS: Tuple[Rank, ...] = tuple(Rank)
+CARD_VALUES: Tuple[int, ...] = tuple(rank.card_value for _ in SUITS for rank in RANKS)
+DECK_SIZE = len(CARD_VALUES)
+SUIT_INDEX: Dict[Suit, int] = {suit: i for i, suit in enumerate(SUITS)}
+RANK_INDEX: Dict[Rank, int] = {rank: i for i, rank in enumerate(RANKS)}
+
+# Hi-Lo tags: low cards +1, 7-9 neutral, tens and aces -1
+HI_LO: Dict[Rank, int] = {
+    rank: 1 if rank.card_value <= 6 else -1 if rank.card_value >= 10 else 0
+    for rank in RANKS
+}
+
+
+def card_from_id(card_id: int) -> Card:
+    """Build the Card for a compact card id."""
+    suit_index, rank_index = divmod(card_id, len(RANKS))
+    return Card(SUITS[suit_index], RANKS[rank_index])
+
+
+# One shared Card per id, used when decoding compact hands back to cards
+DECK_CARDS: Tuple[Card, ...] = tuple(card_from_id(card_id) for card_id in range(DECK_SIZE))
+
 
 class GameState(Enum):
     DEALING = "dealing"
@@ -61,6 +94,90 @@ class GameResult(Enum):
     DEALER_WIN = "dealer_win"
     PUSH = "push"
     PLAYER_BLACKJACK = "player_blackjack"
+    SURRENDER = "surrender"
+
+
+# Limits on client-chosen rules: bigger shoes and split counts cost memory
+# and time per game without changing how the game plays
+MAX_DECKS = 8
+MAX_SPLIT_HANDS = 8
+# Every two-card total a player can hold (a pair of aces counts 12)
+DOUBLE_TOTALS = range(4, 22)
+
+
+@dataclass(frozen=True)
+class RuleSet:
+    """Table rules. The defaults reproduce the original single-deck S17 game."""
+    dealer_hits_soft_17: bool = False
+    num_decks: int = 1
+    double_after_split: bool = True
+    surrender: bool = False
+    dealer_peeks: bool = False
+    # Two-card totals the player may double on; None allows any total
+    double_totals: Optional[FrozenSet[int]] = None
+    blackjack_payout: float = 1.5
+    # Fraction of the shoe dealt before reshuffling; None deals every game
+    # from a fresh shoe
+    penetration: Optional[float] = None
+    # Most hands a player can hold after splitting and resplitting; split
+    # aces receive one card each and cannot be resplit
+    max_split_hands: int = 4
+
+    def __post_init__(self):
+        if not 1 <= self.num_decks <= MAX_DECKS:
+            raise ValueError(f"num_decks must be between 1 and {MAX_DECKS}")
+        if not 1 <= self.max_split_hands <= MAX_SPLIT_HANDS:
+            raise ValueError(f"max_split_hands must be between 1 and {MAX_SPLIT_HANDS}")
+        if self.double_totals is not None and not self.double_totals <= set(DOUBLE_TOTALS):
+            raise ValueError("double_totals must be two-card totals between 4 and 21")
+        if not (math.isfinite(self.blackjack_payout) and self.blackjack_payout >= 0):
+            raise ValueError("blackjack_payout must be a non-negative number")
+        if self.penetration is not None and not 0 < self.penetration <= 1:
+            raise ValueError("penetration must be in (0, 1]")
+
+
+# Highest total any lookup table is indexed with (hard 20 plus an ace as 11)
+MAX_TOTAL = 31
+
+
+@dataclass(frozen=True)
+class CompiledRules:
+    """A RuleSet resolved into lookup tables for the per-card hot paths."""
+    rules: RuleSet
+    # dealer_hits[soft][total] -> dealer draws another card
+    dealer_hits: Tuple[Tuple[bool, ...], Tuple[bool, ...]]
+    # double_allowed[total] -> player may double on this two-card total
+    double_allowed: Tuple[bool, ...]
+    # Dealer upcard values that trigger a hole-card check for blackjack
+    peek_upcards: FrozenSet[int]
+    payouts: Dict[GameResult, float]
+
+
+# Bounded: rule sets come from clients, and each game keeps its own reference
+@lru_cache(maxsize=256)
+def compile_rules(rules: RuleSet) -> CompiledRules:
+    """Resolve rule options once so games never branch on them per card."""
+    hard_hits = tuple(total < 17 for total in range(MAX_TOTAL + 1))
+    soft_limit = 18 if rules.dealer_hits_soft_17 else 17
+    soft_hits = tuple(total < soft_limit for total in range(MAX_TOTAL + 1))
+    double_allowed = tuple(
+        rules.double_totals is None or total in rules.double_totals
+        for total in range(MAX_TOTAL + 1)
+    )
+    payouts = {
+        GameResult.PLAYER_WIN: 1.0,
+        GameResult.PLAYER_BLACKJACK: rules.blackjack_payout,
+        GameResult.PUSH: 0.0,
+        GameResult.DEALER_WIN: -1.0,
+        GameResult.SURRENDER: -0.5,
+    }
+    return CompiledRules(
+        rules=rules,
+        dealer_hits=(hard_hits, soft_hits),
+        double_allowed=double_allowed,
+        peek_upcards=frozenset({10, 11}) if rules.dealer_peeks else frozenset(),
+        payouts=payouts,
+    )
 
 
 @dataclass
@@ -77,6 +194,14 @@ class Hand:
     
     def get_value(self) -> int:
         """Calculate the best possible value of the hand."""
+        return self._value_and_soft_aces()[0]
+    
+    def is_soft(self) -> bool:
+        """Check if the hand counts an ace as 11."""
+        return self._value_and_soft_aces()[1] > 0
+    
+    def _value_and_soft_aces(self) -> Tuple[int, int]:
+        """Return the best value and how many aces are still counted as 11."""
         total = 0
         aces = 0
         
@@ -92,7 +217,7 @@ class Hand:
             total -= 10
             aces -= 1
         
-        return total
+        return total, aces
     
     def is_bust(self) -> bool:
         """Check if hand is bust (over 21)."""
@@ -110,44 +235,221 @@ class Hand:
         return " ".join(str(card) for card in self.cards)
 
 
+# A hand holds at most 22 cards: 21 aces counted as 1 plus the card that busts it
+MAX_HAND_CARDS = 22
+
+
+class HandSet:
+    """The player's hands in one game, packed into flat byte arrays.
+    
+    Hand h keeps its card ids in cards[h * MAX_HAND_CARDS:] and its total and
+    soft-ace count are updated as cards arrive, so values are O(1) and a
+    split only moves one byte.
+    """
+    
+    def __init__(self, max_hands: int = 1):
+        self.max_hands = max_hands
+        self.cards = bytearray(max_hands * MAX_HAND_CARDS)
+        self.lengths = bytearray(max_hands)
+        self.totals = bytearray(max_hands)
+        self.soft_aces = bytearray(max_hands)
+        self.doubled = bytearray(max_hands)
+        self.results: List[Optional[GameResult]] = [None] * max_hands
+        self.count = 1
+        self.active = 0
+        self.split_aces = False
+    
+    def clear(self) -> None:
+        """Reset to a single empty hand."""
+        self.lengths[:] = bytes(self.max_hands)
+        self.totals[:] = bytes(self.max_hands)
+        self.soft_aces[:] = bytes(self.max_hands)
+        self.doubled[:] = bytes(self.max_hands)
+        self.results = [None] * self.max_hands
+        self.count = 1
+        self.active = 0
+        self.split_aces = False
+    
+    def add_card(self, h: int, card_id: int) -> None:
+        """Add a card id to hand h and update its value."""
+        length = self.lengths[h]
+        if length >= MAX_HAND_CARDS:
+            raise ValueError("Hand is full")
+        self.cards[h * MAX_HAND_CARDS + length] = card_id
+        self.lengths[h] = length + 1
+        
+        value = CARD_VALUES[card_id]
+        total = self.totals[h] + value
+        soft_aces = self.soft_aces[h] + (value == 11)
+        # Same ace adjustment as Hand.get_value(), applied incrementally
+        while total > 21 and soft_aces > 0:
+            total -= 10
+            soft_aces -= 1
+        self.totals[h] = total
+        self.soft_aces[h] = soft_aces
+    
+    def card_ids(self, h: int) -> bytes:
+        start = h * MAX_HAND_CARDS
+        return bytes(self.cards[start:start + self.lengths[h]])
+    
+    def is_pair(self, h: int) -> bool:
+        """Two cards of the same rank."""
+        start = h * MAX_HAND_CARDS
+        return (self.lengths[h] == 2
+                and self.cards[start] % len(RANKS) == self.cards[start + 1] % len(RANKS))
+    
+    def is_blackjack(self, h: int) -> bool:
+        """21 with two cards; hands created by a split never count."""
+        return self.count == 1 and self.lengths[h] == 2 and self.totals[h] == 21
+    
+    def split(self, h: int) -> int:
+        """Move hand h's second card into a new hand and return its index."""
+        if not self.is_pair(h) or self.count >= self.max_hands:
+            raise ValueError("Cannot split this hand")
+        start = h * MAX_HAND_CARDS
+        first, second = self.cards[start], self.cards[start + 1]
+        new = self.count
+        self.count += 1
+        self.split_aces = CARD_VALUES[first] == 11
+        for index, card_id in ((h, first), (new, second)):
+            self.lengths[index] = 0
+            self.totals[index] = 0
+            self.soft_aces[index] = 0
+            self.add_card(index, card_id)
+        return new
+
+
+class HandView:
+    """Hand-compatible view of one hand stored in a HandSet."""
+    
+    __slots__ = ("hand_set", "index")
+    
+    def __init__(self, hand_set: HandSet, index: int):
+        self.hand_set = hand_set
+        self.index = index
+    
+    @property
+    def cards(self) -> List[Card]:
+        return [DECK_CARDS[card_id] for card_id in self.hand_set.card_ids(self.index)]
+    
+    def add_card(self, card: Card) -> None:
+        """Add a card to the hand."""
+        self.hand_set.add_card(self.index, card.id)
+    
+    def get_value(self) -> int:
+        """Best value of the hand, kept up to date by the HandSet."""
+        return self.hand_set.totals[self.index]
+    
+    def is_soft(self) -> bool:
+        """Check if the hand counts an ace as 11."""
+        return self.hand_set.soft_aces[self.index] > 0
+    
+    def is_bust(self) -> bool:
+        """Check if hand is bust (over 21)."""
+        return self.get_value() > 21
+    
+    def is_blackjack(self) -> bool:
+        """Check if hand is blackjack (21 with 2 cards, not after a split)."""
+        return self.hand_set.is_blackjack(self.index)
+    
+    def can_split(self) -> bool:
+        """Check if hand can be split."""
+        return self.hand_set.is_pair(self.index)
+    
+    def __str__(self) -> str:
+        return " ".join(str(card) for card in self.cards)
+
+
 class Deck:
-    def __init__(self):
+    def __init__(self, rng: Optional[random.Random] = None, num_decks: int = 1):
+        # Falls back to the module-level RNG so unseeded games behave as before
+        self.rng = rng if rng is not None else random
+        self.num_decks = num_decks
         self.cards: List[Card] = []
+        # Remaining cards per rank (indexed like RANKS) and Hi-Lo running count,
+        # both maintained incrementally by deal_card()
+        self.rank_counts: List[int] = []
+        self.running_count = 0
         self.reset()
     
     def reset(self) -> None:
-        """Create a fresh deck and shuffle."""
+        """Create a fresh shoe of num_decks decks and shuffle."""
         self.cards = []
-        for suit in Suit:
-            for rank in Rank:
-                self.cards.append(Card(suit, rank))
+        for _ in range(self.num_decks):
+            for suit in Suit:
+                for rank in Rank:
+                    self.cards.append(Card(suit, rank))
+        self.rank_counts = [len(SUITS) * self.num_decks] * len(RANKS)
+        self.running_count = 0
         self.shuffle()
     
     def shuffle(self) -> None:
         """Shuffle the deck."""
-        random.shuffle(self.cards)
+        self.rng.shuffle(self.cards)
     
     def deal_card(self) -> Card:
         """Deal one card from the deck."""
         if not self.cards:
             self.reset()
-        return self.cards.pop()
+        card = self.cards.pop()
+        self.rank_counts[RANK_INDEX[card.rank]] -= 1
+        self.running_count += HI_LO[card.rank]
+        return card
+    
+    @property
+    def decks_remaining(self) -> float:
+        """Undealt cards measured in decks."""
+        return len(self.cards) / DECK_SIZE
+    
+    @property
+    def true_count(self) -> float:
+        """Hi-Lo running count per remaining deck."""
+        decks_remaining = self.decks_remaining
+        return self.running_count / decks_remaining if decks_remaining else 0.0
+    
+    def dealt_fraction(self) -> float:
+        """Fraction of the shoe already dealt."""
+        return 1 - len(self.cards) / (DECK_SIZE * self.num_decks)
 
 
 class BlackjackGame:
-    def __init__(self):
-        self.deck = Deck()
-        self.player_hand = Hand([])
+    def __init__(
+        self,
+        rng: Optional[random.Random] = None,
+        rules: Optional[RuleSet] = None,
+        deck: Optional[Deck] = None
+    ):
+        self.rng = rng
+        self.rules = rules if rules is not None else RuleSet()
+        self._rules = compile_rules(self.rules)
+        self.deck = deck if deck is not None else Deck(rng, self.rules.num_decks)
+        self.hands = HandSet(self.rules.max_split_hands)
         self.dealer_hand = Hand([])
         self.state = GameState.DEALING
         self.result: Optional[GameResult] = None
         self.can_double_down = False
         self.can_split = False
+        self.can_surrender = False
+    
+    @property
+    def player_hand(self) -> HandView:
+        """The hand currently being played (the only hand unless split)."""
+        return HandView(self.hands, self.hands.active)
+    
+    @player_hand.setter
+    def player_hand(self, hand) -> None:
+        """Replace all player hands with a single hand holding these cards."""
+        cards = list(hand.cards)
+        self.hands.clear()
+        for card in cards:
+            self.hands.add_card(0, card.id)
     
     def start_new_game(self) -> dict:
         """Start a new game of blackjack."""
-        self.deck = Deck()
-        self.player_hand = Hand([])
+        penetration = self.rules.penetration
+        if penetration is None or self.deck.dealt_fraction() >= penetration:
+            self.deck = Deck(self.rng, self.rules.num_decks)
+        self.hands.clear()
         self.dealer_hand = Hand([])
         self.state = GameState.DEALING
         self.result = None
@@ -158,9 +460,15 @@ class BlackjackGame:
         self.player_hand.add_card(self.deck.deal_card())
         self.dealer_hand.add_card(self.deck.deal_card())
         
+        self._after_deal()
+        return self.get_game_state()
+    
+    def _after_deal(self) -> None:
+        """Set available actions and settle naturals once both hands are dealt."""
         # Set available actions
-        self.can_double_down = True
-        self.can_split = self.player_hand.can_split()
+        self.can_double_down = self._rules.double_allowed[self.player_hand.get_value()]
+        self.can_split = self.player_hand.can_split() and self.hands.max_hands > 1
+        self.can_surrender = self._rules.rules.surrender
         
         # Check for immediate blackjack
         if self.player_hand.is_blackjack():
@@ -169,10 +477,14 @@ class BlackjackGame:
             else:
                 self.result = GameResult.PLAYER_BLACKJACK
             self.state = GameState.GAME_OVER
+        elif (self.dealer_hand.cards[0].value in self._rules.peek_upcards
+                and self.dealer_hand.is_blackjack()):
+            # Dealer peeked and has blackjack: hand ends before the player acts
+            self.result = GameResult.DEALER_WIN
+            self.state = GameState.GAME_OVER
         else:
             self.state = GameState.PLAYER_TURN
-        
-        return self.get_game_state()
+        self.hands.results[0] = self.result
     
     def hit(self) -> dict:
         """Player hits (takes another card)."""
@@ -182,10 +494,11 @@ class BlackjackGame:
         self.player_hand.add_card(self.deck.deal_card())
         self.can_double_down = False
         self.can_split = False
+        self.can_surrender = False
         
         if self.player_hand.is_bust():
-            self.result = GameResult.DEALER_WIN
-            self.state = GameState.GAME_OVER
+            self.hands.results[self.hands.active] = GameResult.DEALER_WIN
+            return self._finish_hand()
         
         return self.get_game_state()
     
@@ -194,8 +507,7 @@ class BlackjackGame:
         if self.state != GameState.PLAYER_TURN:
             raise ValueError("Cannot stand at this time")
         
-        self.state = GameState.DEALER_TURN
-        return self._dealer_play()
+        return self._finish_hand()
     
     def double_down(self) -> dict:
         """Player doubles down (hit once then stand)."""
@@ -203,44 +515,158 @@ class BlackjackGame:
             raise ValueError("Cannot double down at this time")
         
         self.player_hand.add_card(self.deck.deal_card())
+        self.hands.doubled[self.hands.active] = 1
         self.can_double_down = False
         self.can_split = False
+        self.can_surrender = False
         
         if self.player_hand.is_bust():
-            self.result = GameResult.DEALER_WIN
-            self.state = GameState.GAME_OVER
-        else:
-            self.state = GameState.DEALER_TURN
-            return self._dealer_play()
+            self.hands.results[self.hands.active] = GameResult.DEALER_WIN
+        return self._finish_hand()
+    
+    def split(self) -> dict:
+        """Player splits a pair into two hands, each played in turn."""
+        if self.state != GameState.PLAYER_TURN or not self.can_split:
+            raise ValueError("Cannot split at this time")
+        
+        self.hands.split(self.hands.active)
+        self.player_hand.add_card(self.deck.deal_card())
+        if self._set_hand_actions():
+            return self.get_game_state()
+        return self._finish_hand()
+    
+    def surrender(self) -> dict:
+        """Player surrenders (forfeits half the stake) on the first decision."""
+        if self.state != GameState.PLAYER_TURN or not self.can_surrender:
+            raise ValueError("Cannot surrender at this time")
         
+        self.can_double_down = False
+        self.can_split = False
+        self.can_surrender = False
+        self.result = GameResult.SURRENDER
+        self.hands.results[0] = self.result
+        self.state = GameState.GAME_OVER
         return self.get_game_state()
     
+    def _set_hand_actions(self) -> bool:
+        """Set actions for the active split hand; False if it has no decision."""
+        hands = self.hands
+        if hands.split_aces:
+            # Split aces take one card each and stand
+            return False
+        total = hands.totals[hands.active]
+        self.can_double_down = self._rules.double_allowed[total] and self.rules.double_after_split
+        self.can_split = hands.is_pair(hands.active) and hands.count < hands.max_hands
+        self.can_surrender = False
+        return True
+    
+    def _finish_hand(self) -> dict:
+        """Move to the next split hand, or to the dealer once all hands are done."""
+        hands = self.hands
+        while hands.active + 1 < hands.count:
+            hands.active += 1
+            self.player_hand.add_card(self.deck.deal_card())
+            if self._set_hand_actions():
+                return self.get_game_state()
+        
+        if all(result is not None for result in hands.results[:hands.count]):
+            # Every hand busted: the dealer does not need to play
+            self.result = self._round_result()
+            self.state = GameState.GAME_OVER
+            return self.get_game_state()
+        
+        self.state = GameState.DEALER_TURN
+        return self._dealer_play()
+    
     def _dealer_play(self) -> dict:
         """Execute dealer's turn according to blackjack rules."""
         self.state = GameState.DEALER_TURN
-        
-        # Dealer hits on 16 and below, stands on 17 and above
-        while self.dealer_hand.get_value() < 17:
+        self._dealer_draw()
+        self._settle()
+        return self.get_game_state()
+    
+    def _dealer_draw(self) -> None:
+        """Draw dealer cards while the rule table says so (S17 or H17)."""
+        hits = self._rules.dealer_hits
+        value, soft_aces = self.dealer_hand._value_and_soft_aces()
+        while hits[soft_aces > 0][value]:
             self.dealer_hand.add_card(self.deck.deal_card())
-        
-        # Determine winner
-        player_value = self.player_hand.get_value()
+            value, soft_aces = self.dealer_hand._value_and_soft_aces()
+    
+    def _settle(self) -> None:
+        """Compare every unsettled player hand with the finished dealer hand."""
+        hands = self.hands
         dealer_value = self.dealer_hand.get_value()
         
-        if self.dealer_hand.is_bust():
-            self.result = GameResult.PLAYER_WIN
-        elif player_value > dealer_value:
-            self.result = GameResult.PLAYER_WIN
-        elif dealer_value > player_value:
-            self.result = GameResult.DEALER_WIN
-        else:
-            self.result = GameResult.PUSH
+        # Determine winner of each hand
+        for h in range(hands.count):
+            if hands.results[h] is not None:
+                continue
+            player_value = hands.totals[h]
+            if self.dealer_hand.is_bust():
+                hands.results[h] = GameResult.PLAYER_WIN
+            elif player_value > dealer_value:
+                hands.results[h] = GameResult.PLAYER_WIN
+            elif dealer_value > player_value:
+                hands.results[h] = GameResult.DEALER_WIN
+            else:
+                hands.results[h] = GameResult.PUSH
         
+        self.result = self._round_result()
         self.state = GameState.GAME_OVER
-        return self.get_game_state()
+    
+    def _round_result(self) -> GameResult:
+        """Outcome of the whole round.
+        
+        After a split this is the sign of the net payout over every hand,
+        counting doubled stakes, so two hands that win one and lose one push.
+        """
+        hands = self.hands
+        if hands.count == 1:
+            return hands.results[0]
+        payouts = self._rules.payouts
+        net = sum(payouts[hands.results[h]] * (1 + hands.doubled[h]) for h in range(hands.count))
+        if net > 0:
+            return GameResult.PLAYER_WIN
+        if net < 0:
+            return GameResult.DEALER_WIN
+        return GameResult.PUSH
+    
+    def _hole_card_hidden(self) -> bool:
+        """Whether the dealer's hole card is still face down."""
+        return self.state == GameState.PLAYER_TURN and len(self.dealer_hand.cards) > 1
+    
+    def get_shoe_state(self) -> dict:
+        """Shoe composition and Hi-Lo count as seen by the player.
+        
+        While the dealer's hole card is hidden it is treated as undealt.
+        """
+        deck = self.deck
+        rank_counts = list(deck.rank_counts)
+        running_count = deck.running_count
+        cards_remaining = len(deck.cards)
+        if self._hole_card_hidden():
+            hole_card = self.dealer_hand.cards[1]
+            rank_counts[RANK_INDEX[hole_card.rank]] += 1
+            running_count -= HI_LO[hole_card.rank]
+            cards_remaining += 1
+        
+        decks_remaining = cards_remaining / DECK_SIZE
+        return {
+            "num_decks": deck.num_decks,
+            "cards_remaining": cards_remaining,
+            "decks_remaining": decks_remaining,
+            "rank_counts": {rank.display: count for rank, count in zip(RANKS, rank_counts)},
+            "running_count": running_count,
+            "true_count": running_count / decks_remaining if decks_remaining else 0.0
+        }
     
     def get_game_state(self) -> dict:
-        """Get current game state for API/frontend."""
+        """Get current game state for API/frontend.
+        
+        ``player_hand`` is the hand being played; ``result`` is the outcome
+        of the whole round and ``hands`` holds each hand's own result.
+        """
         return {
             "player_hand": {
                 "cards": [{"suit": card.suit.value, "rank": card.rank.display} for card in self.player_hand.cards],
@@ -253,14 +679,26 @@ class BlackjackGame:
                 "value": self.dealer_hand.get_value() if self.state in [GameState.DEALER_TURN, GameState.GAME_OVER] else "hidden",
                 "is_bust": self.dealer_hand.is_bust(),
                 "is_blackjack": self.dealer_hand.is_blackjack(),
-                "hidden_card": self.state == GameState.PLAYER_TURN
+                "hidden_card": self._hole_card_hidden()
             },
+            "hands": [
+                {
+                    "cards": [{"suit": card.suit.value, "rank": card.rank.display} for card in HandView(self.hands, h).cards],
+                    "value": self.hands.totals[h],
+                    "is_bust": self.hands.totals[h] > 21,
+                    "doubled": bool(self.hands.doubled[h]),
+                    "result": self.hands.results[h].value if self.hands.results[h] else None
+                }
+                for h in range(self.hands.count)
+            ],
+            "active_hand": self.hands.active,
             "state": self.state.value,
             "result": self.result.value if self.result else None,
             "available_actions": {
                 "can_hit": self.state == GameState.PLAYER_TURN,
                 "can_stand": self.state == GameState.PLAYER_TURN,
                 "can_double_down": self.state == GameState.PLAYER_TURN and self.can_double_down,
-                "can_split": self.state == GameState.PLAYER_TURN and self.can_split
+                "can_split": self.state == GameState.PLAYER_TURN and self.can_split,
+                "can_surrender": self.state == GameState.PLAYER_TURN and self.can_surrender
             }
         }
\ No newline at end of file
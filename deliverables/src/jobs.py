@@ -0,0 +1,309 @@
+"""
+Strategy Evaluation Jobs
+Background simulations of a strategy table over many hands. Jobs are split
+into chunks that run on a bounded process pool with VecBlackjackEnv, and
+their running EV is reported with a 95% confidence interval.
+"""
+
+import math
+import os
+import random
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from concurrent.futures import BrokenExecutor, Executor, Future, ProcessPoolExecutor
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional, Tuple
+
+from game_engine import RuleSet
+from vec_env import DOUBLE_DOWN, HIT, STAND, SURRENDER, VecBlackjackEnv
+
+
+# Upcard values in the column order of a strategy row: 2..10, then ace
+UPCARDS: Tuple[int, ...] = (2, 3, 4, 5, 6, 7, 8, 9, 10, 11)
+HARD_TOTALS = range(4, 22)
+SOFT_TOTALS = range(12, 22)
+
+# Row letters: D doubles and R surrenders when allowed, otherwise they hit
+ACTION_CODES = {"H": HIT, "S": STAND, "D": DOUBLE_DOWN, "R": SURRENDER}
+
+DEFAULT_CHUNK_HANDS = 200_000
+MAX_JOB_HANDS = 100_000_000
+CHUNK_ENVS = 256
+Z_95 = 1.959963984540054
+
+# Job states
+QUEUED = "queued"
+RUNNING = "running"
+DONE = "done"
+CANCELLED = "cancelled"
+FAILED = "failed"
+FINISHED_STATES = (DONE, CANCELLED, FAILED)
+
+Strategy = Tuple[Tuple[Tuple[int, ...], ...], Tuple[Tuple[int, ...], ...]]
+
+
+class JobQueueFull(Exception):
+    """Raised when no more jobs can be accepted."""
+
+
+def compile_strategy(table: Dict[str, Dict[str, str]]) -> Strategy:
+    """Turn a strategy table into action codes indexed [soft][total][upcard].
+
+    ``table`` has "hard" and/or "soft" sections mapping a player total to a
+    row of ten letters, one per dealer upcard 2-9, 10, A. Totals without a
+    row stand on 17 or more and hit below.
+    """
+    unknown = set(table) - {"hard", "soft"}
+    if unknown:
+        raise ValueError(f"Unknown strategy sections: {', '.join(sorted(unknown))}")
+
+    compiled = []
+    for section, totals in (("hard", HARD_TOTALS), ("soft", SOFT_TOTALS)):
+        rows = table.get(section, {})
+        by_total = [tuple(STAND if total >= 17 else HIT for _ in range(12)) for total in range(32)]
+        for key, row in rows.items():
+            try:
+                total = int(key)
+            except ValueError:
+                raise ValueError(f"Invalid {section} total {key!r}")
+            if total not in totals:
+                raise ValueError(f"{section} total {total} is out of range")
+            if len(row) != len(UPCARDS) or any(letter not in ACTION_CODES for letter in row.upper()):
+                raise ValueError(f"{section} {total}: row needs 10 of {''.join(ACTION_CODES)}")
+            # Indexed by upcard value; slots 0 and 1 are unused
+            by_total[total] = (HIT, HIT) + tuple(ACTION_CODES[letter] for letter in row.upper())
+        compiled.append(tuple(by_total))
+    return compiled[0], compiled[1]
+
+
+def welford_merge(
+    a: Tuple[int, float, float], b: Tuple[int, float, float]
+) -> Tuple[int, float, float]:
+    """Combine two (count, mean, M2) accumulators (Chan et al.)."""
+    n_a, mean_a, m2_a = a
+    n_b, mean_b, m2_b = b
+    n = n_a + n_b
+    if n == 0:
+        return 0, 0.0, 0.0
+    delta = mean_b - mean_a
+    mean = mean_a + delta * n_b / n
+    m2 = m2_a + m2_b + delta * delta * n_a * n_b / n
+    return n, mean, m2
+
+
+def simulate_chunk(
+    strategy: Strategy, rules: RuleSet, hands: int, seed: int
+) -> Tuple[int, float, float]:
+    """Play at least ``hands`` hands by ``strategy``; return (count, mean, M2)."""
+    env = VecBlackjackEnv(CHUNK_ENVS, seed=seed, rules=rules)
+    obs = env.reset()
+    n, mean, m2 = 0, 0.0, 0.0
+    actions = [STAND] * CHUNK_ENVS
+    while n < hands:
+        totals, soft, upcards = obs["player_total"], obs["soft"], obs["dealer_upcard"]
+        can_double, can_surrender = obs["can_double"], env.can_surrender
+        for i in range(CHUNK_ENVS):
+            action = strategy[soft[i]][totals[i]][upcards[i]]
+            if (action == DOUBLE_DOWN and not can_double[i]) or (
+                action == SURRENDER and not can_surrender[i]
+            ):
+                action = HIT
+            actions[i] = action
+        obs, rewards, dones, _ = env.step(actions)
+        for i in range(CHUNK_ENVS):
+            if dones[i]:
+                # Welford update per finished hand
+                n += 1
+                delta = rewards[i] - mean
+                mean += delta / n
+                m2 += delta * (rewards[i] - mean)
+    return n, mean, m2
+
+
+@dataclass
+class Job:
+    job_id: str
+    strategy: Strategy
+    rules: RuleSet
+    hands: int
+    chunk_hands: int
+    seed: int
+    status: str = QUEUED
+    stats: Tuple[int, float, float] = (0, 0.0, 0.0)
+    chunks_sent: int = 0
+    in_flight: List[Future] = field(default_factory=list)
+    error: Optional[str] = None
+    created: float = field(default_factory=time.monotonic)
+    finished: Optional[float] = None
+    # Bumped on every change so progress streams can tell when to emit
+    version: int = 0
+
+    def chunks_total(self) -> int:
+        return -(-self.hands // self.chunk_hands)
+
+    def snapshot(self) -> dict:
+        n, mean, m2 = self.stats
+        std_error = math.sqrt(m2 / (n - 1) / n) if n > 1 else None
+        end = self.finished if self.finished is not None else time.monotonic()
+        return {
+            "job_id": self.job_id,
+            "status": self.status,
+            "hands_total": self.hands,
+            "hands_done": n,
+            "ev": mean if n else None,
+            "std_error": std_error,
+            "ci95": [mean - Z_95 * std_error, mean + Z_95 * std_error] if std_error is not None else None,
+            "elapsed": end - self.created,
+            "error": self.error,
+            "version": self.version,
+        }
+
+
+class JobManager:
+    """Queue of simulation jobs sharing one bounded process pool.
+
+    At most ``max_workers`` chunks run at once, handed out round-robin over
+    running jobs so a big job cannot starve later ones. Simulations never
+    run on the event loop, so interactive requests are not slowed beyond
+    the CPUs the pool takes. Jobs beyond ``max_jobs`` unfinished ones are
+    refused. Finished jobs are kept for their results, oldest dropped first.
+    """
+
+    def __init__(
+        self,
+        max_workers: Optional[int] = None,
+        max_jobs: int = 16,
+        keep_finished: int = 100,
+        executor_factory=None,
+    ):
+        self.max_workers = max_workers or max(1, (os.cpu_count() or 2) // 2)
+        self.max_jobs = max_jobs
+        self.keep_finished = keep_finished
+        self.executor_factory = executor_factory or (
+            lambda: ProcessPoolExecutor(max_workers=self.max_workers)
+        )
+        self.executor: Optional[Executor] = None
+        self.jobs: "OrderedDict[str, Job]" = OrderedDict()
+        # Re-entrant: cancelling a future runs its done callback immediately
+        self.lock = threading.RLock()
+        self.in_flight = 0
+        self._next_job = 0
+
+    def submit(
+        self,
+        strategy_table: Dict[str, Dict[str, str]],
+        hands: int,
+        rules: Optional[RuleSet] = None,
+        seed: Optional[int] = None,
+        chunk_hands: int = DEFAULT_CHUNK_HANDS,
+    ) -> dict:
+        """Queue a job; raise ValueError for bad input, JobQueueFull when busy."""
+        if not 0 < hands <= MAX_JOB_HANDS:
+            raise ValueError(f"hands must be between 1 and {MAX_JOB_HANDS}")
+        strategy = compile_strategy(strategy_table)
+        job = Job(
+            job_id=str(uuid.uuid4()),
+            strategy=strategy,
+            rules=rules if rules is not None else RuleSet(),
+            hands=hands,
+            chunk_hands=min(chunk_hands, hands),
+            seed=seed if seed is not None else random.getrandbits(48),
+        )
+        with self.lock:
+            if sum(j.status not in FINISHED_STATES for j in self.jobs.values()) >= self.max_jobs:
+                raise JobQueueFull("Too many jobs queued")
+            self.jobs[job.job_id] = job
+            self._dispatch()
+            return job.snapshot()
+
+    def status(self, job_id: str) -> dict:
+        with self.lock:
+            return self.jobs[job_id].snapshot()
+
+    def cancel(self, job_id: str) -> dict:
+        with self.lock:
+            job = self.jobs[job_id]
+            if job.status not in FINISHED_STATES:
+                job.status = CANCELLED
+                for future in list(job.in_flight):
+                    future.cancel()
+                self._finish(job)
+            return job.snapshot()
+
+    def shutdown(self) -> None:
+        with self.lock:
+            for job in self.jobs.values():
+                if job.status not in FINISHED_STATES:
+                    job.status = CANCELLED
+                    self._finish(job)
+            executor, self.executor = self.executor, None
+        if executor is not None:
+            executor.shutdown(wait=False, cancel_futures=True)
+
+    def _dispatch(self) -> None:
+        """Fill free pool slots with chunks, round-robin over active jobs."""
+        while self.in_flight < self.max_workers:
+            job = self._next_runnable()
+            if job is None:
+                return
+            if self.executor is None:
+                self.executor = self.executor_factory()
+            chunk = job.chunks_sent
+            hands = min(job.chunk_hands, job.hands - chunk * job.chunk_hands)
+            # Chunk seeds never overlap: each chunk env seeds CHUNK_ENVS slots
+            future = self.executor.submit(
+                simulate_chunk, job.strategy, job.rules, hands, job.seed + chunk * CHUNK_ENVS
+            )
+            job.chunks_sent += 1
+            job.status = RUNNING
+            job.in_flight.append(future)
+            self.in_flight += 1
+            future.add_done_callback(
+                lambda done, job=job, executor=self.executor: self._chunk_done(job, done, executor)
+            )
+
+    def _next_runnable(self) -> Optional[Job]:
+        pending = [
+            job for job in self.jobs.values()
+            if job.status in (QUEUED, RUNNING) and job.chunks_sent < job.chunks_total()
+        ]
+        if not pending:
+            return None
+        job = pending[self._next_job % len(pending)]
+        self._next_job += 1
+        return job
+
+    def _chunk_done(self, job: Job, future: Future, executor: Executor) -> None:
+        with self.lock:
+            self.in_flight -= 1
+            if future in job.in_flight:
+                job.in_flight.remove(future)
+            error = None if future.cancelled() else future.exception()
+            # A worker died and the pool refuses all work: replace it on the
+            # next dispatch. Later chunks of the same pool find it replaced.
+            broken = isinstance(error, BrokenExecutor) and executor is self.executor
+            if broken:
+                self.executor = None
+                executor.shutdown(wait=False)
+            if job.status == RUNNING and not future.cancelled():
+                if error is not None:
+                    job.status = FAILED
+                    job.error = str(error)
+                    self._finish(job)
+                else:
+                    job.stats = welford_merge(job.stats, future.result())
+                    job.version += 1
+                    if not job.in_flight and job.chunks_sent >= job.chunks_total():
+                        job.status = DONE
+                        self._finish(job)
+            if self.executor is not None or broken:
+                self._dispatch()
+
+    def _finish(self, job: Job) -> None:
+        job.finished = time.monotonic()
+        job.version += 1
+        finished = [j for j in self.jobs.values() if j.status in FINISHED_STATES]
+        for old in finished[:max(0, len(finished) - self.keep_finished)]:
+            del self.jobs[old.job_id]
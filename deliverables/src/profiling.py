@@ -0,0 +1,312 @@
+"""
+Profiling Tools
+On-demand statistical sampling and per-request cProfile, both exported as
+collapsed stacks for flamegraph tools, plus timing hooks for the engine's
+hot paths that are only installed while enabled.
+"""
+
+import os
+import random
+import sys
+import threading
+import time
+from collections import Counter
+from contextlib import contextmanager
+from typing import TYPE_CHECKING, Callable, Dict, List, Optional, Tuple
+
+from game_engine import BlackjackGame, Deck
+
+if TYPE_CHECKING:
+    import cProfile
+    import pstats
+
+
+SAMPLING = "sampling"
+CPROFILE = "cprofile"
+DEFAULT_INTERVAL = 0.005
+MAX_PROFILE_SECONDS = 600
+MAX_STACK_DEPTH = 128
+
+# Engine methods wrapped by HotPathTimer
+HOT_PATHS: Tuple[Tuple[type, str], ...] = (
+    (BlackjackGame, "start_new_game"),
+    (BlackjackGame, "get_game_state"),
+    (BlackjackGame, "_dealer_play"),
+    (BlackjackGame, "_settle"),
+    (Deck, "reset"),
+)
+
+
+def _frame_label(filename: str, lineno: int, name: str) -> str:
+    return f"{name} ({os.path.basename(filename)}:{lineno})"
+
+
+def collapse_frame(frame) -> str:
+    """Collapsed-stack line body for a frame: outermost call first."""
+    labels: List[str] = []
+    while frame is not None and len(labels) < MAX_STACK_DEPTH:
+        code = frame.f_code
+        labels.append(_frame_label(code.co_filename, code.co_firstlineno, code.co_name))
+        frame = frame.f_back
+    return ";".join(reversed(labels))
+
+
+class Profiler:
+    """One profiling session at a time, in one of two modes.
+
+    ``sampling`` snapshots every thread's stack each ``interval`` seconds
+    from a background thread; counts are samples. ``cprofile`` runs cProfile
+    around a random ``fraction`` of requests and merges the results; since
+    cProfile records caller/callee pairs rather than whole stacks, its
+    collapsed output is two frames deep, weighted in microseconds. Only one
+    request is profiled at a time, and while it awaits, other tasks on the
+    event loop are profiled with it. ``stop()`` and the deadline end a
+    request profile that is still running.
+
+    Results are kept after the session ends until the next one starts.
+    """
+
+    def __init__(self, clock: Callable[[], float] = time.monotonic, rng: Callable[[], float] = random.random):
+        self.clock = clock
+        self.rng = rng
+        self.lock = threading.Lock()
+        self.mode: Optional[str] = None
+        self.deadline = 0.0
+        self.fraction = 1.0
+        self.interval = DEFAULT_INTERVAL
+        self.stacks: Counter = Counter()
+        self.samples = 0
+        self.requests_profiled = 0
+        self.stats: Optional["pstats.Stats"] = None
+        self._profiling_request = False
+        self._running: Optional["cProfile.Profile"] = None
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def start(
+        self, mode: str, seconds: float, fraction: float = 1.0, interval: float = DEFAULT_INTERVAL
+    ) -> dict:
+        if mode not in (SAMPLING, CPROFILE):
+            raise ValueError(f"Unknown profiling mode {mode!r}")
+        if not 0 < seconds <= MAX_PROFILE_SECONDS:
+            raise ValueError(f"seconds must be in (0, {MAX_PROFILE_SECONDS}]")
+        if not 0 < fraction <= 1:
+            raise ValueError("fraction must be in (0, 1]")
+        if interval <= 0:
+            raise ValueError("interval must be positive")
+        self.stop()
+
+        with self.lock:
+            self.mode = mode
+            self.deadline = self.clock() + seconds
+            self.fraction = fraction
+            self.interval = interval
+            self.stacks = Counter()
+            self.samples = 0
+            self.requests_profiled = 0
+            self.stats = None
+        if mode == SAMPLING:
+            self._stop.clear()
+            self._thread = threading.Thread(target=self._sample, name="profiler-sampler", daemon=True)
+            self._thread.start()
+        return self.status()
+
+    def stop(self) -> dict:
+        self._stop.set()
+        thread, self._thread = self._thread, None
+        if thread is not None:
+            thread.join()
+        with self.lock:
+            self.deadline = 0.0
+        self._end_request()
+        return self.status()
+
+    @property
+    def active(self) -> bool:
+        return self.mode is not None and self.clock() < self.deadline
+
+    def status(self) -> dict:
+        return {
+            "mode": self.mode,
+            "active": self.active,
+            "seconds_left": max(0.0, self.deadline - self.clock()),
+            "samples": self.samples,
+            "requests_profiled": self.requests_profiled,
+        }
+
+    def _sample(self) -> None:
+        own = threading.get_ident()
+        while not self._stop.is_set() and self.clock() < self.deadline:
+            frames = sys._current_frames()
+            with self.lock:
+                for thread_id, frame in frames.items():
+                    if thread_id != own:
+                        self.stacks[collapse_frame(frame)] += 1
+                self.samples += 1
+            del frames
+            self._stop.wait(self.interval)
+
+    def expire(self) -> None:
+        """End the running request profile if the session has run out."""
+        if self._running is not None and not self.active:
+            self._end_request()
+
+    def should_profile_request(self) -> bool:
+        return (
+            self.mode == CPROFILE
+            and not self._profiling_request
+            and self.active
+            and self.rng() < self.fraction
+        )
+
+    @contextmanager
+    def profile_request(self):
+        """cProfile the enclosed block and merge it into the session."""
+        # Only needed while profiling, so not imported with the app
+        import cProfile
+
+        self._profiling_request = True
+        profile = self._running = cProfile.Profile()
+        profile.enable()
+        try:
+            yield
+        finally:
+            # stop() or the deadline may have ended it already
+            if self._running is profile:
+                self._end_request()
+
+    def _end_request(self) -> None:
+        """Disable the running request profile, if any, and merge its results."""
+        # Only needed while profiling, so not imported with the app
+        import pstats
+
+        profile, self._running = self._running, None
+        if profile is None:
+            return
+        profile.disable()
+        self._profiling_request = False
+        with self.lock:
+            self.requests_profiled += 1
+            if self.stats is None:
+                self.stats = pstats.Stats(profile)
+            else:
+                self.stats.add(profile)
+
+    def collapsed(self) -> str:
+        """Results as collapsed stacks: ``frame;frame;frame count`` per line."""
+        with self.lock:
+            if self.mode == SAMPLING:
+                lines = [f"{stack} {count}" for stack, count in self.stacks.most_common()]
+            elif self.stats is not None:
+                lines = self._cprofile_lines(self.stats)
+            else:
+                lines = []
+        return "\n".join(lines) + ("\n" if lines else "")
+
+    @staticmethod
+    def _cprofile_lines(stats: "pstats.Stats") -> List[str]:
+        weights: Counter = Counter()
+        for function, (_, _, self_time, _, callers) in stats.stats.items():
+            label = _frame_label(*function)
+            if not callers:
+                weights[label] += self_time
+            for caller, caller_stats in callers.items():
+                # Self time of ``function`` when called from ``caller``
+                weights[f"{_frame_label(*caller)};{label}"] += caller_stats[2]
+        return [
+            f"{stack} {round(seconds * 1e6)}"
+            for stack, seconds in weights.most_common() if round(seconds * 1e6) > 0
+        ]
+
+
+class RequestProfilerMiddleware:
+    """ASGI middleware running Profiler.profile_request on sampled requests.
+
+    Event streams are never sampled: they stay open for as long as the
+    client listens, and everything else on the loop would be profiled with
+    them. A sampled request is checked against the deadline on each send.
+    """
+
+    def __init__(self, app, profiler: Profiler):
+        self.app = app
+        self.profiler = profiler
+
+    async def __call__(self, scope, receive, send):
+        if (
+            scope["type"] == "http"
+            and not scope["path"].endswith("/events")
+            and self.profiler.should_profile_request()
+        ):
+            async def send_until_deadline(message):
+                self.profiler.expire()
+                await send(message)
+
+            with self.profiler.profile_request():
+                await self.app(scope, receive, send_until_deadline)
+        else:
+            await self.app(scope, receive, send)
+
+
+class HotPathTimer:
+    """Call counts and wall time of the engine hot paths.
+
+    Enabling swaps timing wrappers onto the classes in HOT_PATHS and
+    disabling puts the original functions back, so nothing is measured,
+    and nothing costs, while disabled.
+    """
+
+    def __init__(self, targets: Tuple[Tuple[type, str], ...] = HOT_PATHS):
+        self.targets = targets
+        self.originals: Dict[Tuple[type, str], Callable] = {}
+        # name -> [calls, total ns, max ns]
+        self.timings: Dict[str, List[int]] = {}
+
+    @property
+    def enabled(self) -> bool:
+        return bool(self.originals)
+
+    def enable(self) -> None:
+        if self.enabled:
+            return
+        self.timings = {}
+        for cls, name in self.targets:
+            original = cls.__dict__[name]
+            self.originals[(cls, name)] = original
+            setattr(cls, name, self._wrap(f"{cls.__name__}.{name}", original))
+
+    def disable(self) -> None:
+        for (cls, name), original in self.originals.items():
+            setattr(cls, name, original)
+        self.originals = {}
+
+    def _wrap(self, label: str, function: Callable) -> Callable:
+        timing = self.timings.setdefault(label, [0, 0, 0])
+        clock = time.perf_counter_ns
+
+        def timed(*args, **kwargs):
+            started = clock()
+            try:
+                return function(*args, **kwargs)
+            finally:
+                elapsed = clock() - started
+                timing[0] += 1
+                timing[1] += elapsed
+                if elapsed > timing[2]:
+                    timing[2] = elapsed
+
+        timed.__wrapped__ = function
+        return timed
+
+    def stats(self) -> dict:
+        return {
+            "enabled": self.enabled,
+            "timings": {
+                label: {
+                    "calls": calls,
+                    "total_ms": total / 1e6,
+                    "mean_us": total / calls / 1e3 if calls else 0.0,
+                    "max_us": longest / 1e3,
+                }
+                for label, (calls, total, longest) in self.timings.items()
+            },
+        }
@@ -0,0 +1,130 @@
+"""
+Per-Session Concurrency Control
+Async locks that serialize actions on one session, and an idempotency cache
+so retried action requests replay their first result.
+"""
+
+import asyncio
+import time
+from collections import OrderedDict
+from contextlib import asynccontextmanager
+from dataclasses import dataclass
+from typing import Any, AsyncIterator, Dict, List, Optional, Tuple
+import zlib
+
+
+DEFAULT_SHARDS = 64
+DEFAULT_KEYS_PER_SESSION = 32
+
+
+@dataclass
+class _SessionLock:
+    lock: asyncio.Lock
+    # Holders plus waiters; the entry is dropped when it reaches zero
+    users: int = 0
+
+
+class SessionLocks:
+    """One asyncio.Lock per session, kept in a sharded registry.
+
+    Locks exist only while a request holds or waits for them, so memory
+    follows the number of in-flight requests rather than sessions. Every
+    session gets its own lock, so unrelated sessions never contend; the
+    shards keep each registry dict and its statistics small.
+    """
+
+    def __init__(self, shards: int = DEFAULT_SHARDS):
+        self.shards: List[Dict[str, _SessionLock]] = [{} for _ in range(shards)]
+        self.acquisitions = 0
+        self.contended = 0
+        self.total_wait = 0.0
+        self.max_wait = 0.0
+        self.shard_contention = [0] * shards
+
+    def _shard(self, session_id: str) -> int:
+        return zlib.crc32(session_id.encode()) % len(self.shards)
+
+    @asynccontextmanager
+    async def hold(self, session_id: str) -> AsyncIterator[None]:
+        """Serialize the enclosed block with other holders of this session."""
+        shard_index = self._shard(session_id)
+        shard = self.shards[shard_index]
+        entry = shard.get(session_id)
+        if entry is None:
+            entry = shard[session_id] = _SessionLock(asyncio.Lock())
+        entry.users += 1
+
+        contended = entry.lock.locked()
+        started = time.perf_counter()
+        try:
+            await entry.lock.acquire()
+        except BaseException:
+            self._release_entry(shard, session_id, entry)
+            raise
+        waited = time.perf_counter() - started
+
+        self.acquisitions += 1
+        self.total_wait += waited
+        self.max_wait = max(self.max_wait, waited)
+        if contended:
+            self.contended += 1
+            self.shard_contention[shard_index] += 1
+        try:
+            yield
+        finally:
+            entry.lock.release()
+            self._release_entry(shard, session_id, entry)
+
+    @staticmethod
+    def _release_entry(shard: Dict[str, _SessionLock], session_id: str, entry: _SessionLock) -> None:
+        entry.users -= 1
+        if entry.users == 0 and shard.get(session_id) is entry:
+            del shard[session_id]
+
+    def stats(self) -> Dict[str, Any]:
+        """Contention and lock-wait figures since startup."""
+        return {
+            "acquisitions": self.acquisitions,
+            "contended": self.contended,
+            "contention_rate": self.contended / self.acquisitions if self.acquisitions else 0.0,
+            "total_wait_ms": self.total_wait * 1000,
+            "mean_wait_ms": self.total_wait * 1000 / self.acquisitions if self.acquisitions else 0.0,
+            "max_wait_ms": self.max_wait * 1000,
+            "locks_in_use": sum(len(shard) for shard in self.shards),
+            "hottest_shards": sorted(
+                range(len(self.shards)), key=self.shard_contention.__getitem__, reverse=True
+            )[:5],
+        }
+
+
+class IdempotencyCache:
+    """Results of action requests, keyed by session and Idempotency-Key.
+
+    Each session keeps its most recent keys only. An entry remembers which
+    action produced it so a key reused for a different action is refused.
+    Entries live in this process, also when sessions are in shared memory:
+    a retry that reaches another worker acts again.
+    """
+
+    def __init__(self, keys_per_session: int = DEFAULT_KEYS_PER_SESSION):
+        self.keys_per_session = keys_per_session
+        self.sessions: Dict[str, "OrderedDict[str, Tuple[str, int, Any]]"] = {}
+        self.replays = 0
+
+    def get(self, session_id: str, key: str) -> Optional[Tuple[str, int, Any]]:
+        """Return (action, status_code, body) stored for this key, if any."""
+        entries = self.sessions.get(session_id)
+        if entries is None or key not in entries:
+            return None
+        self.replays += 1
+        return entries[key]
+
+    def store(self, session_id: str, key: str, action: str, status_code: int, body: Any) -> None:
+        entries = self.sessions.setdefault(session_id, OrderedDict())
+        entries[key] = (action, status_code, body)
+        while len(entries) > self.keys_per_session:
+            entries.popitem(last=False)
+
+    def forget(self, session_id: str) -> None:
+        """Drop all keys of an ended session."""
+        self.sessions.pop(session_id, None)
@@ -0,0 +1,389 @@
+"""
+Session Stores
+Where the API keeps its games: a plain in-process dict, or a shared-memory
+slab that several uvicorn workers on one host read and update in place.
+"""
+
+import fcntl
+import os
+import struct
+import tempfile
+import uuid
+from collections.abc import MutableMapping
+from contextlib import contextmanager, nullcontext
+from typing import TYPE_CHECKING, Dict, Iterator, Optional, Set
+
+from game_engine import BlackjackGame
+from game_codec import RECORD_SIZE, check_encodable, decode_from, encode_into, session_key
+
+if TYPE_CHECKING:
+    from snapshot import Snapshot
+
+
+DEFAULT_SLAB_NAME = "blackjack_sessions"
+DEFAULT_CAPACITY = 16384
+
+_MAGIC = b"BJSLAB01"
+# magic, capacity, record size
+_SLAB_HEADER = struct.Struct("<8sII")
+_SLAB_HEADER_SIZE = 64
+
+# version (odd while a write is in progress), slot state, session uuid
+_SLOT_HEADER = struct.Struct("<IB3x16s")
+_VERSION = struct.Struct("<I")
+SLOT_SIZE = (_SLOT_HEADER.size + RECORD_SIZE + 7) // 8 * 8
+
+EMPTY, USED, DELETED = 0, 1, 2
+
+# Seqlock readers retry this often before giving up on a slot being rewritten
+_READ_RETRIES = 10000
+
+
+class MemorySessionStore(dict):
+    """The default store: games live in this process only.
+
+    After a restart the previous process's sessions can be attached as a
+    snapshot; each one is decoded into the dict the first time it is looked
+    up, and only then.
+    """
+
+    def __init__(self):
+        super().__init__()
+        self.snapshot: Optional["Snapshot"] = None
+        # Snapshot keys already restored, so ended sessions never come back
+        self.restored: Set[bytes] = set()
+
+    def attach_snapshot(self, snapshot: Optional["Snapshot"]) -> None:
+        self.snapshot = snapshot
+
+    def _restore(self, session_id: str) -> Optional[BlackjackGame]:
+        if self.snapshot is None:
+            return None
+        key = session_key(session_id)
+        if key is None or key in self.restored:
+            return None
+        index = self.snapshot.find(key)
+        if index is None:
+            return None
+        self.restored.add(key)
+        try:
+            game = self.snapshot.game_at(index)
+        except (ValueError, IndexError):
+            # A record the codec cannot read is a session that is gone
+            return None
+        self[session_id] = game
+        return game
+
+    def __contains__(self, session_id) -> bool:
+        return dict.__contains__(self, session_id) or self._restore(session_id) is not None
+
+    def __missing__(self, session_id: str) -> BlackjackGame:
+        game = self._restore(session_id)
+        if game is None:
+            raise KeyError(session_id)
+        return game
+
+    def save_snapshot(self, path: str) -> int:
+        """Write live and never-restored sessions to ``path``."""
+        from snapshot import write_snapshot
+
+        count = write_snapshot(path, self, self.snapshot, self.restored)
+        if self.snapshot is not None:
+            self.snapshot.close()
+            self.snapshot = None
+            self.restored.clear()
+        return count
+
+    def locked(self, session_id: str):
+        # One process, one event loop: SessionLocks already serialize actions
+        return nullcontext()
+
+
+class SharedSessionStore(MutableMapping):
+    """Games stored as fixed-size records in a shared-memory slab.
+
+    The slab is an open-addressing hash table keyed by the session uuid with
+    linear probing and tombstones. Inserts and deletes take the slab lock
+    (byte 0), so a delete can turn tombstones at the end of a probe chain
+    back into empty slots and misses keep stopping early. Every slot starts
+    with a version word
+    used as a seqlock: writers make it odd while rewriting the record, and
+    readers decode straight from shared memory and retry if the version
+    moved. Writers across processes are serialized with one fcntl byte-range
+    lock per slot, so no network hop or copy is involved.
+
+    Games the codec cannot store (table seats, which hold a live reference
+    to their table) stay in a process-local dict.
+    """
+
+    def __init__(
+        self,
+        name: str = DEFAULT_SLAB_NAME,
+        capacity: int = DEFAULT_CAPACITY,
+        lock_path: Optional[str] = None,
+    ):
+        self.name = name
+        self.local: Dict[str, BlackjackGame] = {}
+        self.lock_path = lock_path or os.path.join(tempfile.gettempdir(), f"{name}.lock")
+        self._lock_fd = os.open(self.lock_path, os.O_RDWR | os.O_CREAT, 0o600)
+        # fcntl locks belong to the process, so track which slots we hold to
+        # keep nested acquisitions from releasing an outer lock early
+        self._held: Set[int] = set()
+
+        # Imported here so the default in-process store never loads multiprocessing
+        from multiprocessing import resource_tracker, shared_memory
+
+        # Byte 0 of the lock file guards creating and initializing the slab
+        with self._lock_range(0):
+            size = _SLAB_HEADER_SIZE + capacity * SLOT_SIZE
+            try:
+                self.shm = shared_memory.SharedMemory(name, create=True, size=size)
+                _SLAB_HEADER.pack_into(self.shm.buf, 0, _MAGIC, capacity, RECORD_SIZE)
+            except FileExistsError:
+                self.shm = shared_memory.SharedMemory(name)
+            # The slab outlives any single worker; only unlink() removes it
+            resource_tracker.unregister(self.shm._name, "shared_memory")
+
+        magic, self.capacity, record_size = _SLAB_HEADER.unpack_from(self.shm.buf, 0)
+        if magic != _MAGIC or record_size != RECORD_SIZE:
+            self.close()
+            raise ValueError(f"Shared memory {name!r} holds an incompatible session slab")
+        self.buf = self.shm.buf
+
+    @contextmanager
+    def _lock_range(self, start: int):
+        fcntl.lockf(self._lock_fd, fcntl.LOCK_EX, 1, start)
+        try:
+            yield
+        finally:
+            fcntl.lockf(self._lock_fd, fcntl.LOCK_UN, 1, start)
+
+    @contextmanager
+    def _slot_lock(self, index: int):
+        if index in self._held:
+            yield
+            return
+        with self._lock_range(1 + index):
+            self._held.add(index)
+            try:
+                yield
+            finally:
+                self._held.discard(index)
+
+    def _offset(self, index: int) -> int:
+        return _SLAB_HEADER_SIZE + index * SLOT_SIZE
+
+    def _probe(self, key: bytes) -> Iterator[int]:
+        home = int.from_bytes(key[:8], "little") % self.capacity
+        for step in range(self.capacity):
+            yield (home + step) % self.capacity
+
+    def _read_slot(self, index: int):
+        """Consistent (state, key) of a slot."""
+        offset = self._offset(index)
+        for _ in range(_READ_RETRIES):
+            version, state, key = _SLOT_HEADER.unpack_from(self.buf, offset)
+            if version & 1:
+                continue
+            if _VERSION.unpack_from(self.buf, offset)[0] == version:
+                return state, key
+        raise RuntimeError(f"Session slot {index} is stuck mid-write")
+
+    def _find(self, key: bytes) -> Optional[int]:
+        for index in self._probe(key):
+            state, slot_key = self._read_slot(index)
+            if state == EMPTY:
+                return None
+            if state == USED and slot_key == key:
+                return index
+        return None
+
+    def _write(self, index: int, state: int, key: bytes, game: Optional[BlackjackGame]) -> None:
+        """Rewrite a slot; the caller holds its lock."""
+        offset = self._offset(index)
+        version = _VERSION.unpack_from(self.buf, offset)[0]
+        _VERSION.pack_into(self.buf, offset, version + 1)
+        try:
+            _SLOT_HEADER.pack_into(self.buf, offset, version + 1, state, key)
+            if game is not None:
+                encode_into(game, self.buf, offset + _SLOT_HEADER.size)
+        finally:
+            _VERSION.pack_into(self.buf, offset, (version + 2) & 0xFFFFFFFF)
+
+    def __contains__(self, session_id) -> bool:
+        if session_id in self.local:
+            return True
+        key = session_key(session_id)
+        return key is not None and self._find(key) is not None
+
+    def __getitem__(self, session_id: str) -> BlackjackGame:
+        if session_id in self.local:
+            return self.local[session_id]
+        key = session_key(session_id)
+        index = self._find(key) if key is not None else None
+        if index is None:
+            raise KeyError(session_id)
+
+        offset = self._offset(index)
+        for _ in range(_READ_RETRIES):
+            version, state, slot_key = _SLOT_HEADER.unpack_from(self.buf, offset)
+            if version & 1:
+                continue
+            if state != USED or slot_key != key:
+                raise KeyError(session_id)
+            try:
+                game = decode_from(self.buf, offset + _SLOT_HEADER.size)
+            except (ValueError, IndexError):
+                # Torn read of a record being rewritten; the version check decides
+                game = None
+            if _VERSION.unpack_from(self.buf, offset)[0] == version:
+                if game is None:
+                    raise ValueError(f"Corrupt session record for {session_id}")
+                return game
+        raise RuntimeError(f"Session slot {index} is stuck mid-write")
+
+    def __setitem__(self, session_id: str, game: BlackjackGame) -> None:
+        if type(game) is not BlackjackGame:
+            self.local[session_id] = game
+            return
+        key = session_key(session_id)
+        if key is None:
+            raise ValueError("Shared session ids must be UUIDs")
+        check_encodable(game.rules)
+
+        index = self._find(key)
+        if index is not None:
+            with self._slot_lock(index):
+                if self._read_slot(index) == (USED, key):
+                    self._write(index, USED, key, game)
+                    return
+        # New session ids are fresh uuid4s, so only one process inserts each.
+        # Inserts and deletes are serialized so tombstone cleanup never
+        # races an insert that probed past the slot being cleared
+        with self._lock_range(0):
+            for index in self._probe(key):
+                with self._slot_lock(index):
+                    if self._read_slot(index)[0] != USED:
+                        self._write(index, USED, key, game)
+                        return
+        raise ValueError("Session store is full")
+
+    def __delitem__(self, session_id: str) -> None:
+        if self.local.pop(session_id, None) is not None:
+            return
+        key = session_key(session_id)
+        with self._lock_range(0):
+            index = self._find(key) if key is not None else None
+            if index is None:
+                raise KeyError(session_id)
+            with self._slot_lock(index):
+                if self._read_slot(index) != (USED, key):
+                    raise KeyError(session_id)
+                # A tombstone keeps probe chains through this slot intact
+                self._write(index, DELETED, key, None)
+            self._clear_tombstones(index)
+
+    def _clear_tombstones(self, index: int) -> None:
+        """Empty the tombstones in ``index``'s cluster that no chain needs.
+
+        A tombstone only has to stay while some stored key's probe chain,
+        from its home slot to where it sits, passes through it. The caller
+        holds the slab lock, so no insert is probing the cluster meanwhile,
+        and lock-free readers never reach a slot their chain skips.
+        """
+        capacity = self.capacity
+        # The cluster runs from the slot after an empty one to the next empty one
+        start = index
+        for _ in range(capacity):
+            previous = (start - 1) % capacity
+            if self._read_slot(previous)[0] == EMPTY:
+                break
+            start = previous
+        else:
+            # No empty slot at all: free this one if no chain passes through it
+            for slot in range(capacity):
+                state, key = self._read_slot(slot)
+                home = int.from_bytes(key[:8], "little") % capacity
+                if state == USED and (slot - home) % capacity >= (slot - index) % capacity:
+                    return
+            with self._slot_lock(index):
+                self._write(index, EMPTY, bytes(16), None)
+            return
+
+        slots = []
+        for step in range(capacity):
+            slot = (start + step) % capacity
+            state, key = self._read_slot(slot)
+            if state == EMPTY:
+                break
+            slots.append((slot, state, key))
+
+        # Walk back from the end, tracking the earliest position any chain reaches
+        earliest = len(slots)
+        for position in reversed(range(len(slots))):
+            slot, state, key = slots[position]
+            if state == USED:
+                home = int.from_bytes(key[:8], "little") % capacity
+                earliest = min(earliest, position - (slot - home) % capacity)
+            elif state == DELETED and earliest > position:
+                with self._slot_lock(slot):
+                    if self._read_slot(slot)[0] == DELETED:
+                        self._write(slot, EMPTY, bytes(16), None)
+
+    def __iter__(self) -> Iterator[str]:
+        yield from list(self.local)
+        for index in range(self.capacity):
+            state, key = self._read_slot(index)
+            if state == USED:
+                yield str(uuid.UUID(bytes=key))
+
+    def __len__(self) -> int:
+        return len(self.local) + sum(
+            self._read_slot(index)[0] == USED for index in range(self.capacity)
+        )
+
+    @contextmanager
+    def locked(self, session_id: str):
+        """Hold the session's slot lock across a read-modify-write.
+
+        Per-process asyncio locks cannot see other workers; this blocks
+        them for the few microseconds an action takes.
+        """
+        key = session_key(session_id)
+        index = self._find(key) if key is not None and session_id not in self.local else None
+        if index is None:
+            yield
+            return
+        with self._slot_lock(index):
+            yield
+
+    def close(self) -> None:
+        """Detach this process; the slab and its sessions remain."""
+        self.buf = None
+        self.shm.close()
+        os.close(self._lock_fd)
+
+    def unlink(self) -> None:
+        """Destroy the slab and every session in it."""
+        from multiprocessing import resource_tracker
+
+        # SharedMemory.unlink() also unregisters, so undo the unregister first
+        resource_tracker.register(self.shm._name, "shared_memory")
+        self.shm.unlink()
+        try:
+            os.unlink(self.lock_path)
+        except FileNotFoundError:
+            pass
+
+
+def session_store_from_env() -> MutableMapping:
+    """Build the store selected by BLACKJACK_SESSION_BACKEND (memory or shm)."""
+    backend = os.environ.get("BLACKJACK_SESSION_BACKEND", "memory")
+    if backend == "memory":
+        return MemorySessionStore()
+    if backend == "shm":
+        return SharedSessionStore(
+            name=os.environ.get("BLACKJACK_SHM_NAME", DEFAULT_SLAB_NAME),
+            capacity=int(os.environ.get("BLACKJACK_SHM_CAPACITY", DEFAULT_CAPACITY)),
+        )
+    raise ValueError(f"Unknown session backend {backend!r}")
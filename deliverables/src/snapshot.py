@@ -0,0 +1,136 @@
+"""
+Session Snapshots
+All live sessions written to one file of fixed-size records sorted by
+session uuid. The file is memory-mapped on startup and sessions are decoded
+by binary search only when first requested, so startup cost does not grow
+with the number of sessions.
+"""
+
+import mmap
+import os
+import struct
+from typing import Iterator, List, Mapping, Optional, Tuple, Union
+
+from game_engine import BlackjackGame
+from game_codec import RECORD_SIZE, check_encodable, decode_from, encode_into, session_key
+
+
+_MAGIC = b"BJSNAP01"
+# magic, session count, record size
+_HEADER = struct.Struct("<8sQI")
+_HEADER_SIZE = 32
+_KEY_SIZE = 16
+ENTRY_SIZE = _KEY_SIZE + RECORD_SIZE
+
+
+class Snapshot:
+    """A read-only, memory-mapped snapshot file."""
+
+    def __init__(self, path: str):
+        """Map ``path``; ValueError if it is not a snapshot this codec can read."""
+        self.path = path
+        with open(path, "rb") as f:
+            if os.fstat(f.fileno()).st_size < _HEADER_SIZE:
+                raise ValueError(f"{path} is too short to be a session snapshot")
+            self.mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, self.count, record_size = _HEADER.unpack_from(self.mm, 0)
+        if (magic != _MAGIC or record_size != RECORD_SIZE
+                or len(self.mm) < _HEADER_SIZE + self.count * ENTRY_SIZE):
+            self.mm.close()
+            raise ValueError(f"{path} is not a compatible session snapshot")
+
+    def _offset(self, index: int) -> int:
+        return _HEADER_SIZE + index * ENTRY_SIZE
+
+    def key_at(self, index: int) -> bytes:
+        offset = self._offset(index)
+        return self.mm[offset:offset + _KEY_SIZE]
+
+    def find(self, key: bytes) -> Optional[int]:
+        """Index of the entry for ``key``, by binary search."""
+        low, high = 0, self.count
+        while low < high:
+            middle = (low + high) // 2
+            if self.key_at(middle) < key:
+                low = middle + 1
+            else:
+                high = middle
+        if low < self.count and self.key_at(low) == key:
+            return low
+        return None
+
+    def game_at(self, index: int) -> BlackjackGame:
+        return decode_from(self.mm, self._offset(index) + _KEY_SIZE)
+
+    def record_at(self, index: int) -> memoryview:
+        offset = self._offset(index) + _KEY_SIZE
+        return memoryview(self.mm)[offset:offset + RECORD_SIZE]
+
+    def keys(self) -> Iterator[Tuple[bytes, int]]:
+        for index in range(self.count):
+            yield self.key_at(index), index
+
+    def close(self) -> None:
+        self.mm.close()
+
+
+def load_snapshot(path: str) -> Optional[Snapshot]:
+    """Map the snapshot at ``path``; None if there is none.
+
+    Raises ValueError for a file this codec cannot read, such as one
+    written before the record layout changed.
+    """
+    if not os.path.exists(path):
+        return None
+    return Snapshot(path)
+
+
+def write_snapshot(
+    path: str,
+    games: Mapping[str, BlackjackGame],
+    previous: Optional[Snapshot] = None,
+    skip: Optional[set] = None,
+) -> int:
+    """Write every storable session in ``games`` to ``path``; return the count.
+
+    Entries of ``previous`` whose key is not in ``skip`` (sessions never
+    restored from it) are carried over byte for byte. The file is written
+    beside ``path`` and renamed into place, so a crash mid-write keeps the
+    old snapshot.
+    """
+    entries: List[Tuple[bytes, Union[BlackjackGame, int]]] = []
+    for session_id, game in games.items():
+        key = session_key(session_id)
+        # Table seats belong to a live table and cannot be restored alone
+        if key is None or type(game) is not BlackjackGame:
+            continue
+        try:
+            check_encodable(game.rules)
+        except ValueError:
+            continue
+        entries.append((key, game))
+    if previous is not None:
+        taken = {key for key, _ in entries}
+        skip = skip or set()
+        entries.extend(
+            (key, index) for key, index in previous.keys() if key not in taken and key not in skip
+        )
+    entries.sort(key=lambda entry: entry[0])
+
+    temporary = f"{path}.tmp"
+    size = _HEADER_SIZE + len(entries) * ENTRY_SIZE
+    with open(temporary, "w+b") as f:
+        f.truncate(size)
+        with mmap.mmap(f.fileno(), size) as mm:
+            _HEADER.pack_into(mm, 0, _MAGIC, len(entries), RECORD_SIZE)
+            offset = _HEADER_SIZE
+            for key, source in entries:
+                mm[offset:offset + _KEY_SIZE] = key
+                if isinstance(source, BlackjackGame):
+                    encode_into(source, mm, offset + _KEY_SIZE)
+                else:
+                    mm[offset + _KEY_SIZE:offset + ENTRY_SIZE] = previous.record_at(source)
+                offset += ENTRY_SIZE
+            mm.flush()
+    os.replace(temporary, path)
+    return len(entries)
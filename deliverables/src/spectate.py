@@ -0,0 +1,145 @@
+"""
+Spectator Streams
+Publish/subscribe for watching games live. Each state change is encoded
+once as a Server-Sent Events frame and the same bytes are queued for every
+viewer of the session, so the cost per viewer is an append and a wake-up.
+"""
+
+import asyncio
+import json
+from collections import deque
+from typing import Any, Deque, Dict, Iterable, Optional, Set
+
+
+DEFAULT_BUFFER_SIZE = 16
+# Sent when the session ends, after which the stream closes
+END_FRAME = b"event: end\ndata: {}\n\n"
+
+
+def encode_frame(event_id: int, state: Dict[str, Any]) -> bytes:
+    """A game state as one SSE frame."""
+    return f"id: {event_id}\ndata: {json.dumps(state, separators=(',', ':'))}\n\n".encode()
+
+
+class Subscription:
+    """One viewer's bounded frame buffer.
+
+    Every frame is a full game state, so a viewer that falls behind loses
+    nothing it needs by skipping ahead: when the buffer is full the oldest
+    frame is dropped and the viewer catches up on the newest ones. Event
+    ids let clients see how many states they skipped.
+    """
+
+    def __init__(self, session_id: str, buffer_size: int = DEFAULT_BUFFER_SIZE):
+        self.session_id = session_id
+        self.frames: Deque[bytes] = deque(maxlen=buffer_size)
+        self.wakeup = asyncio.Event()
+        self.dropped = 0
+        self.closed = False
+
+    def push(self, frame: bytes) -> None:
+        if len(self.frames) == self.frames.maxlen:
+            self.dropped += 1
+        self.frames.append(frame)
+        self.wakeup.set()
+
+    def close(self) -> None:
+        self.closed = True
+        self.wakeup.set()
+
+    async def get(self) -> Optional[bytes]:
+        """Next frame, waiting for one; None once closed and drained."""
+        while not self.frames:
+            if self.closed:
+                return None
+            self.wakeup.clear()
+            await self.wakeup.wait()
+        return self.frames.popleft()
+
+
+class Channel:
+    def __init__(self):
+        self.subscribers: Set[Subscription] = set()
+        self.event_id = 0
+        # Newest frame, handed to viewers as they join
+        self.last: Optional[bytes] = None
+
+
+class SpectatorHub:
+    """Viewers per session and fan-out of state changes to them.
+
+    Channels exist only while a session has viewers, so publishing to an
+    unwatched session is a dict lookup; callers check ``watched()`` first
+    to skip building the state at all.
+    """
+
+    def __init__(self, buffer_size: int = DEFAULT_BUFFER_SIZE):
+        self.buffer_size = buffer_size
+        self.channels: Dict[str, Channel] = {}
+        self.published = 0
+        self.delivered = 0
+        # Frames dropped for viewers that have since left
+        self.dropped = 0
+
+    def watched(self, session_id: str) -> bool:
+        return session_id in self.channels
+
+    def watched_sessions(self) -> Iterable[str]:
+        return list(self.channels)
+
+    def subscribe(self, session_id: str, state: Dict[str, Any]) -> Subscription:
+        """Add a viewer; it starts with the newest frame, or ``state``."""
+        channel = self.channels.get(session_id)
+        if channel is None:
+            channel = self.channels[session_id] = Channel()
+        if channel.last is None:
+            channel.event_id += 1
+            channel.last = encode_frame(channel.event_id, state)
+        subscription = Subscription(session_id, self.buffer_size)
+        subscription.push(channel.last)
+        channel.subscribers.add(subscription)
+        return subscription
+
+    def unsubscribe(self, subscription: Subscription) -> None:
+        channel = self.channels.get(subscription.session_id)
+        if channel is None:
+            self.dropped += subscription.dropped
+            return
+        if subscription in channel.subscribers:
+            channel.subscribers.remove(subscription)
+            self.dropped += subscription.dropped
+        if not channel.subscribers:
+            del self.channels[subscription.session_id]
+
+    def publish(self, session_id: str, state: Dict[str, Any]) -> int:
+        """Send a state change to the session's viewers; returns how many."""
+        channel = self.channels.get(session_id)
+        if channel is None:
+            return 0
+        channel.event_id += 1
+        frame = channel.last = encode_frame(channel.event_id, state)
+        for subscription in channel.subscribers:
+            subscription.push(frame)
+        self.published += 1
+        self.delivered += len(channel.subscribers)
+        return len(channel.subscribers)
+
+    def close(self, session_id: str) -> None:
+        """End every stream of a session that is gone."""
+        channel = self.channels.pop(session_id, None)
+        if channel is None:
+            return
+        for subscription in channel.subscribers:
+            subscription.push(END_FRAME)
+            subscription.close()
+
+    def stats(self) -> dict:
+        subscriptions = [s for channel in self.channels.values() for s in channel.subscribers]
+        return {
+            "sessions_watched": len(self.channels),
+            "viewers": len(subscriptions),
+            "events_published": self.published,
+            "frames_delivered": self.delivered,
+            "frames_dropped": self.dropped + sum(s.dropped for s in subscriptions),
+            "frames_buffered": sum(len(s.frames) for s in subscriptions),
+        }
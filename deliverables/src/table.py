@@ -0,0 +1,239 @@
+"""
+Multi-Seat Blackjack Tables
+Several seats play one round together from a shared shoe; the dealer hand is
+played once per round and settled against every seat in a single pass.
+"""
+
+import random
+import time
+from typing import Callable, List, Optional
+
+from game_engine import BlackjackGame, Deck, GameState, Hand, RuleSet
+
+
+# Reshuffle point used when the rules do not set a penetration
+DEFAULT_TABLE_PENETRATION = 0.75
+DEFAULT_ROUND_TIMEOUT = 30.0
+MAX_SEATS = 7
+
+
+class SeatGame(BlackjackGame):
+    """A BlackjackGame seated at a Table.
+
+    The seat shares the table's shoe and dealer hand. Standing or doubling
+    hands the turn back to the table instead of playing the dealer; the
+    table resolves the dealer once every seat is done.
+    """
+
+    def __init__(self, table: "Table", seat_index: int):
+        super().__init__(rules=table.rules, deck=table.shoe)
+        self.table = table
+        self.seat_index = seat_index
+        self.dealer_hand = table.dealer_hand
+        # Session the API filed this seat under, so a closing table finds it
+        self.session_id: Optional[str] = None
+
+    def start_new_game(self) -> dict:
+        raise ValueError("Seats are dealt by their table")
+
+    # Every action first lets the table time out a stale round, so a seat
+    # acting after the deadline is rejected like any out-of-turn action
+    def hit(self) -> dict:
+        self.table.poll()
+        return super().hit()
+
+    def stand(self) -> dict:
+        self.table.poll()
+        return super().stand()
+
+    def double_down(self) -> dict:
+        self.table.poll()
+        return super().double_down()
+
+    def surrender(self) -> dict:
+        self.table.poll()
+        return super().surrender()
+
+    def split(self) -> dict:
+        self.table.poll()
+        return super().split()
+
+    def _dealer_play(self) -> dict:
+        # The table plays the dealer once for all seats
+        self.state = GameState.DEALER_TURN
+        return self.get_game_state()
+
+    def _time_out(self) -> None:
+        """Stand every hand still in play when the round deadline passes."""
+        hands = self.hands
+        # Split hands not reached yet get their second card, as in _finish_hand
+        while hands.active + 1 < hands.count:
+            hands.active += 1
+            self.player_hand.add_card(self.deck.deal_card())
+        self.can_double_down = False
+        self.can_split = False
+        self.can_surrender = False
+        self.state = GameState.DEALER_TURN
+
+    def _hole_card_hidden(self) -> bool:
+        # A seat that is done waits for the others with the hole card down
+        return self.table.round_active and len(self.dealer_hand.cards) > 1
+
+    def get_shoe_state(self) -> dict:
+        self.table.poll()
+        return super().get_shoe_state()
+
+    def get_game_state(self) -> dict:
+        self.table.poll()
+        state = super().get_game_state()
+        if self.table.round_active:
+            # Other seats are still deciding: keep the hole card hidden
+            state["dealer_hand"]["value"] = "hidden"
+            state["dealer_hand"]["hidden_card"] = True
+        state["table"] = {
+            "table_id": self.table.table_id,
+            "seat": self.seat_index,
+            "round": self.table.round,
+        }
+        return state
+
+
+class Table:
+    """Seats sharing one shoe and one dealer hand.
+
+    A round is dealt to every seat at once. Seats act independently; when
+    none is still deciding, or the round deadline passes, the dealer draws
+    once and all seats are settled together. Seats still deciding at the
+    deadline are stood automatically, so one slow seat cannot stall the
+    table. Timeouts are checked lazily whenever the table is touched.
+    """
+
+    def __init__(
+        self,
+        table_id: str,
+        rules: Optional[RuleSet] = None,
+        round_timeout: float = DEFAULT_ROUND_TIMEOUT,
+        rng: Optional[random.Random] = None,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self.table_id = table_id
+        self.rules = rules if rules is not None else RuleSet()
+        self.round_timeout = round_timeout
+        self.rng = rng
+        self.clock = clock
+        self.shoe = Deck(rng, self.rules.num_decks)
+        self.dealer_hand = Hand([])
+        self.seats: List[Optional[SeatGame]] = [None] * MAX_SEATS
+        self.round = 0
+        self.round_active = False
+        self.deadline: Optional[float] = None
+
+    def join(self) -> SeatGame:
+        """Take the first free seat; it plays from the next round dealt."""
+        for index, seat in enumerate(self.seats):
+            if seat is None:
+                seat = SeatGame(self, index)
+                self.seats[index] = seat
+                return seat
+        raise ValueError("Table is full")
+
+    def leave(self, seat: SeatGame) -> bool:
+        """Free a seat; a hand still in play is abandoned.
+
+        Returns True if the seats left behind settled the round.
+        """
+        if self.seats[seat.seat_index] is seat:
+            self.seats[seat.seat_index] = None
+        return self.poll()
+
+    def occupied(self) -> List[SeatGame]:
+        return [seat for seat in self.seats if seat is not None]
+
+    def deal_round(self) -> dict:
+        """Deal a new round to every occupied seat."""
+        self.poll()
+        if self.round_active:
+            raise ValueError("Round still in progress")
+        seats = self.occupied()
+        if not seats:
+            raise ValueError("No seated players")
+
+        penetration = self.rules.penetration or DEFAULT_TABLE_PENETRATION
+        if self.shoe.dealt_fraction() >= penetration:
+            self.shoe = Deck(self.rng, self.rules.num_decks)
+        self.dealer_hand = Hand([])
+        for seat in seats:
+            seat.deck = self.shoe
+            seat.dealer_hand = self.dealer_hand
+            seat.hands.clear()
+            seat.result = None
+            seat.state = GameState.DEALING
+
+        # One card to each seat, dealer upcard, second card each, hole card
+        for seat in seats:
+            seat.player_hand.add_card(self.shoe.deal_card())
+        self.dealer_hand.add_card(self.shoe.deal_card())
+        for seat in seats:
+            seat.player_hand.add_card(self.shoe.deal_card())
+        self.dealer_hand.add_card(self.shoe.deal_card())
+
+        for seat in seats:
+            seat._after_deal()
+
+        self.round += 1
+        self.round_active = True
+        self.deadline = self.clock() + self.round_timeout
+        self.poll()
+        return self.get_table_state()
+
+    def poll(self) -> bool:
+        """Advance the round if it can progress; return True if it was settled."""
+        if not self.round_active:
+            return False
+        seats = self.occupied()
+        deciding = [seat for seat in seats if seat.state == GameState.PLAYER_TURN]
+        if deciding and self.clock() < self.deadline:
+            return False
+
+        for seat in deciding:
+            seat._time_out()
+        self._resolve(seats)
+        return True
+
+    def _resolve(self, seats: List[SeatGame]) -> None:
+        """Play the dealer once and settle every waiting seat in one pass."""
+        waiting = [seat for seat in seats if seat.state == GameState.DEALER_TURN]
+        if waiting:
+            # Any seat can draw for the dealer: they all share shoe and hand
+            waiting[0]._dealer_draw()
+        for seat in waiting:
+            seat._settle()
+        self.round_active = False
+        self.deadline = None
+
+    def get_table_state(self) -> dict:
+        """Table overview for the API."""
+        self.poll()
+        dealer_visible = not self.round_active
+        return {
+            "table_id": self.table_id,
+            "round": self.round,
+            "round_active": self.round_active,
+            "seconds_left": max(0.0, self.deadline - self.clock()) if self.deadline else None,
+            "dealer_hand": {
+                "cards": [
+                    {"suit": card.suit.value, "rank": card.rank.display}
+                    for card in (self.dealer_hand.cards if dealer_visible else self.dealer_hand.cards[:1])
+                ],
+                "value": self.dealer_hand.get_value() if dealer_visible else "hidden",
+            },
+            "seats": [
+                {
+                    "seat": seat.seat_index,
+                    "state": seat.state.value,
+                    "player_value": seat.player_hand.get_value(),
+                    "result": seat.result.value if seat.result else None,
+                }
+                for seat in self.occupied()
+            ],
+        }
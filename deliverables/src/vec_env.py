@@ -0,0 +1,288 @@
+"""
+Vectorized Blackjack Environment
+Gym-style batched environment that steps many concurrent games per call.
+"""
+
+import random
+from array import array
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+from game_engine import (
+    CARD_VALUES, DECK_SIZE, HI_LO, RANKS, GameResult, RuleSet, compile_rules
+)
+
+
+# Actions accepted by VecBlackjackEnv.step()
+STAND = 0
+HIT = 1
+DOUBLE_DOWN = 2
+SURRENDER = 3
+
+NUM_RANKS = len(RANKS)
+# Hi-Lo tag per compact card id
+HI_LO_BY_ID = tuple(HI_LO[RANKS[card_id % NUM_RANKS]] for card_id in range(DECK_SIZE))
+
+
+class VecBlackjackEnv:
+    """N independent blackjack games held as flat arrays.
+
+    Every slot follows the rules of ``BlackjackGame`` exactly: a fresh shoe
+    per game, cards dealt player/dealer/player/dealer, naturals settled on the
+    deal and the dealer drawing by the compiled ``RuleSet`` tables. Slot ``i``
+    seeded with ``seed + i`` deals the same cards as
+    ``BlackjackGame(random.Random(seed + i), rules)``.
+
+    A game that ends on the deal (player blackjack) has no decision to make;
+    the next ``step()`` ignores the action for that slot and reports it done.
+    Finished games are dealt again automatically.
+
+    Each slot keeps per-rank remaining counts and a Hi-Lo running count,
+    updated as cards are drawn. The ``running_count``/``true_count``
+    observations are what the player can see, so the hidden hole card is
+    left out of them.
+    """
+
+    def __init__(
+        self, num_envs: int, seed: Optional[int] = None, rules: Optional[RuleSet] = None
+    ):
+        if num_envs < 1:
+            raise ValueError("num_envs must be at least 1")
+        self.num_envs = num_envs
+        self.rules = rules if rules is not None else RuleSet()
+        self._rules = compile_rules(self.rules)
+        # Reward per unit stake for each game result
+        self.payouts: Dict[GameResult, float] = self._rules.payouts
+        self._shoe = list(range(DECK_SIZE)) * self.rules.num_decks
+        self.rngs = [
+            random.Random(seed + i) if seed is not None else random.Random()
+            for i in range(num_envs)
+        ]
+
+        self.decks: List[List[int]] = [[] for _ in range(num_envs)]
+        # Remaining cards per rank, NUM_RANKS entries per slot
+        self.rank_counts = array("H", bytes(2 * NUM_RANKS * num_envs))
+        self.running_count = array("i", bytes(4 * num_envs))
+        self.hole_card = array("b", bytes(num_envs))
+        # Like BlackjackGame, each slot owns a shuffled shoe from construction
+        for i in range(num_envs):
+            self._new_shoe(i)
+
+        self.player_total = array("b", bytes(num_envs))
+        self.player_soft = array("b", bytes(num_envs))
+        self.dealer_total = array("b", bytes(num_envs))
+        self.dealer_soft = array("b", bytes(num_envs))
+        self.dealer_upcard = array("b", bytes(num_envs))
+        self.can_double = array("b", bytes(num_envs))
+        self.can_surrender = array("b", bytes(num_envs))
+        self.doubled = array("b", bytes(num_envs))
+        # Result already decided on the deal, waiting for the next step
+        self.pending: List[Optional[GameResult]] = [None] * num_envs
+
+    def reset(self) -> Dict[str, array]:
+        """Deal a new game in every slot and return the observations."""
+        for i in range(self.num_envs):
+            self._deal(i)
+        return self._observations()
+
+    def step(
+        self, actions: Sequence[int]
+    ) -> Tuple[Dict[str, array], array, array, List[Dict[str, Any]]]:
+        """Apply one action per slot.
+
+        An action a slot may not take raises ValueError before any slot is
+        played. Returns ``(observations, rewards, dones, infos)``. For finished slots
+        the info dict carries the ``GameResult``, the terminal observation and
+        the dealer's final total; the observation already belongs to the next
+        game.
+        """
+        if len(actions) != self.num_envs:
+            raise ValueError(f"Expected {self.num_envs} actions, got {len(actions)}")
+        # Reject a bad batch before any slot moves, so no finished game is lost
+        for i, action in enumerate(actions):
+            if self.pending[i] is None:
+                self._check_action(i, action)
+
+        rewards = array("d", bytes(8 * self.num_envs))
+        dones = array("b", bytes(self.num_envs))
+        infos: List[Dict[str, Any]] = [{} for _ in range(self.num_envs)]
+
+        for i, action in enumerate(actions):
+            result = self.pending[i]
+            if result is None:
+                result = self._act(i, action)
+            if result is None:
+                continue
+
+            stake = 2.0 if self.doubled[i] else 1.0
+            rewards[i] = self.payouts[result] * stake
+            dones[i] = 1
+            infos[i] = {
+                "result": result,
+                "terminal_observation": self._observation(i),
+                "dealer_total": self.dealer_total[i],
+                "running_count": self.running_count[i],
+            }
+            self._deal(i)
+
+        return self._observations(), rewards, dones, infos
+
+    def _check_action(self, i: int, action: int) -> None:
+        if action == DOUBLE_DOWN and not self.can_double[i]:
+            raise ValueError(f"Cannot double down at this time (env {i})")
+        if action == SURRENDER and not self.can_surrender[i]:
+            raise ValueError(f"Cannot surrender at this time (env {i})")
+        if action not in (STAND, HIT, DOUBLE_DOWN, SURRENDER):
+            raise ValueError(f"Unknown action {action} (env {i})")
+
+    def _act(self, i: int, action: int) -> Optional[GameResult]:
+        """Play one player action in slot ``i``; return the result if it ended the game."""
+        if action == HIT:
+            self._hit_player(i)
+            self.can_double[i] = 0
+            self.can_surrender[i] = 0
+            if self.player_total[i] > 21:
+                return GameResult.DEALER_WIN
+            return None
+
+        if action == DOUBLE_DOWN:
+            self._hit_player(i)
+            self.can_double[i] = 0
+            self.can_surrender[i] = 0
+            self.doubled[i] = 1
+            if self.player_total[i] > 21:
+                return GameResult.DEALER_WIN
+            return self._dealer_play(i)
+
+        if action == STAND:
+            return self._dealer_play(i)
+
+        # SURRENDER; step() has already checked it is allowed
+        return GameResult.SURRENDER
+
+    def _dealer_play(self, i: int) -> GameResult:
+        """Dealer draws by the rule table and the hand is settled."""
+        hits = self._rules.dealer_hits
+        while hits[self.dealer_soft[i] > 0][self.dealer_total[i]]:
+            self._hit_dealer(i)
+
+        player_value = self.player_total[i]
+        dealer_value = self.dealer_total[i]
+        if dealer_value > 21:
+            return GameResult.PLAYER_WIN
+        if player_value > dealer_value:
+            return GameResult.PLAYER_WIN
+        if dealer_value > player_value:
+            return GameResult.DEALER_WIN
+        return GameResult.PUSH
+
+    def _deal(self, i: int) -> None:
+        """Start a new game in slot ``i``, reshuffling per the rules."""
+        penetration = self.rules.penetration
+        if penetration is None or self._dealt_fraction(i) >= penetration:
+            self._new_shoe(i)
+        self.player_total[i] = 0
+        self.player_soft[i] = 0
+        self.dealer_total[i] = 0
+        self.dealer_soft[i] = 0
+        self.doubled[i] = 0
+        self.pending[i] = None
+
+        self._hit_player(i)
+        upcard = self.dealer_upcard[i] = CARD_VALUES[self._hit_dealer(i)]
+        self._hit_player(i)
+        self.hole_card[i] = self._hit_dealer(i)
+
+        self.can_double[i] = self._rules.double_allowed[self.player_total[i]]
+        self.can_surrender[i] = self.rules.surrender
+        if self.player_total[i] == 21:
+            if self.dealer_total[i] == 21:
+                self.pending[i] = GameResult.PUSH
+            else:
+                self.pending[i] = GameResult.PLAYER_BLACKJACK
+        elif upcard in self._rules.peek_upcards and self.dealer_total[i] == 21:
+            self.pending[i] = GameResult.DEALER_WIN
+        if self.pending[i] is not None:
+            self.can_double[i] = 0
+            self.can_surrender[i] = 0
+
+    def true_count(self, i: int) -> float:
+        """Hi-Lo running count of slot ``i``'s shoe per remaining deck."""
+        decks_remaining = len(self.decks[i]) / DECK_SIZE
+        return self.running_count[i] / decks_remaining if decks_remaining else 0.0
+
+    def remaining_by_rank(self, i: int) -> List[int]:
+        """Undealt cards per rank in slot ``i``'s shoe, indexed like RANKS."""
+        start = i * NUM_RANKS
+        return list(self.rank_counts[start:start + NUM_RANKS])
+
+    def _draw(self, i: int) -> int:
+        """Deal one card id from slot ``i``, reshuffling an empty shoe."""
+        deck = self.decks[i]
+        if not deck:
+            self._new_shoe(i)
+            deck = self.decks[i]
+        card_id = deck.pop()
+        self.rank_counts[i * NUM_RANKS + card_id % NUM_RANKS] -= 1
+        self.running_count[i] += HI_LO_BY_ID[card_id]
+        return card_id
+
+    def _hit_player(self, i: int) -> None:
+        value = CARD_VALUES[self._draw(i)]
+        total = self.player_total[i] + value
+        soft = self.player_soft[i] + (value == 11)
+        # Same ace adjustment as Hand.get_value(), applied incrementally
+        while total > 21 and soft:
+            total -= 10
+            soft -= 1
+        self.player_total[i] = total
+        self.player_soft[i] = soft
+
+    def _hit_dealer(self, i: int) -> int:
+        card_id = self._draw(i)
+        value = CARD_VALUES[card_id]
+        total = self.dealer_total[i] + value
+        soft = self.dealer_soft[i] + (value == 11)
+        while total > 21 and soft:
+            total -= 10
+            soft -= 1
+        self.dealer_total[i] = total
+        self.dealer_soft[i] = soft
+        return card_id
+
+    def _new_shoe(self, i: int) -> None:
+        deck = self._shoe[:]
+        self.rngs[i].shuffle(deck)
+        self.decks[i] = deck
+        start = i * NUM_RANKS
+        full = len(self._shoe) // NUM_RANKS
+        self.rank_counts[start:start + NUM_RANKS] = array("H", [full] * NUM_RANKS)
+        self.running_count[i] = 0
+
+    def _dealt_fraction(self, i: int) -> float:
+        return 1 - len(self.decks[i]) / len(self._shoe)
+
+    def _observation(self, i: int) -> Tuple[int, int, int, int]:
+        return (
+            self.player_total[i],
+            1 if self.player_soft[i] else 0,
+            self.dealer_upcard[i],
+            self.can_double[i],
+        )
+
+    def _observations(self) -> Dict[str, array]:
+        # Visible count: the hole card is still face down at every decision
+        running_count = array("i", (
+            count - HI_LO_BY_ID[hole]
+            for count, hole in zip(self.running_count, self.hole_card)
+        ))
+        decks_remaining = [(len(deck) + 1) / DECK_SIZE for deck in self.decks]
+        return {
+            "player_total": array("b", self.player_total),
+            "soft": array("b", (1 if soft else 0 for soft in self.player_soft)),
+            "dealer_upcard": array("b", self.dealer_upcard),
+            "can_double": array("b", self.can_double),
+            "running_count": running_count,
+            "true_count": array("d", (
+                count / decks for count, decks in zip(running_count, decks_remaining)
+            )),
+        }
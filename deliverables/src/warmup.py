@@ -0,0 +1,74 @@
+"""
+Startup Warmup
+Work a worker does once before reporting ready, so its first requests do
+not pay for cold caches: rule tables, the codec, the engine and wire
+code paths, and optionally the split EV table for fresh shoes.
+"""
+
+import random
+import time
+from typing import Dict, Iterable
+
+from game_engine import RANKS, SUITS, BlackjackGame, RuleSet, compile_rules
+
+
+def prime_split_table(rules: RuleSet) -> int:
+    """Solve split advice for every pair and upcard dealt from a fresh shoe.
+
+    Without penetration each game is dealt from a fresh shoe, so these are
+    exactly the positions /split-ev is asked about on such tables. Cold, a
+    position takes a few hundred milliseconds. Returns the positions solved.
+    """
+    import ev
+
+    double_allowed = compile_rules(rules).double_allowed
+    full = ev.composition_from_rank_counts([len(SUITS) * rules.num_decks] * len(RANKS))
+    solved = 0
+    for pair_value in ev.VALUES:
+        for upcard in ev.VALUES:
+            counts = list(full)
+            counts[pair_value - 2] -= 2
+            counts[upcard - 2] -= 1
+            if min(counts) < 0:
+                continue
+            composition = tuple(counts)
+            total, soft_aces = (12, 1) if pair_value == 11 else (2 * pair_value, 0)
+            ev.split_ev(pair_value, upcard, composition, rules)
+            ev.hand_ev(total, soft_aces, upcard, composition, rules, double_allowed[total])
+            solved += 1
+    return solved
+
+
+def warm_up(rule_sets: Iterable[RuleSet] = (RuleSet(),), split_table: bool = False) -> Dict[str, float]:
+    """Prime caches for ``rule_sets``; returns milliseconds per step."""
+    from game_codec import decode, encode
+    from wire import encode_state
+
+    rule_sets = tuple(rule_sets)
+    timings: Dict[str, float] = {}
+
+    def step(name: str, started: float) -> float:
+        now = time.perf_counter()
+        timings[name] = (now - started) * 1000
+        return now
+
+    started = time.perf_counter()
+    for rules in rule_sets:
+        compile_rules(rules)
+    started = step("rules", started)
+
+    rng = random.Random(0)
+    for rules in rule_sets:
+        game = BlackjackGame(rng=rng, rules=rules)
+        encode_state(game.start_new_game())
+        # Caches the decoded rule set shared-memory and snapshot reads use
+        game = decode(encode(game))
+        if game.get_game_state()["available_actions"]["can_stand"]:
+            encode_state(game.stand())
+    started = step("engine", started)
+
+    if split_table:
+        for rules in rule_sets:
+            prime_split_table(rules)
+        step("split_table", started)
+    return timings
@@ -0,0 +1,184 @@
+"""
+Binary Wire Format
+A compact encoding of the game state returned by the API, selected with
+``Accept: application/x-blackjack-state``. JSON stays the default.
+
+Layout (version 1, all fields one byte):
+
+    version, state, result, flags, active hand,
+    dealer value, dealer card count, dealer card ids...,
+    hand count, then per hand: value, hand flags, result, card count, card ids...
+
+A table seat's state (SEAT flag) ends with its ``table`` block: seat index,
+round as a little-endian uint32, then the table id's length and UTF-8 bytes.
+
+Cards are ids 0-51 (suit * 13 + rank, in the Suit/Rank enum order); the
+dealer's hidden hole card is sent as 0xFF and the dealer value as 0 while
+it is hidden. Results and states are indexes into the GameResult and
+GameState enums, 0xFF meaning no result.
+"""
+
+import struct
+from typing import Any, Dict, List, Optional
+
+from game_engine import DECK_CARDS, GameResult, GameState
+
+
+WIRE_MEDIA_TYPE = "application/x-blackjack-state"
+WIRE_VERSION = 1
+
+HIDDEN_CARD = 0xFF
+NO_RESULT = 0xFF
+
+# Game flags
+CAN_ACT = 0x01          # hit and stand
+CAN_DOUBLE_DOWN = 0x02
+CAN_SPLIT = 0x04
+CAN_SURRENDER = 0x08
+DEALER_HIDDEN = 0x10
+SEAT = 0x20
+# Hand flags
+DOUBLED = 0x01
+
+_STATES = tuple(GameState)
+_STATE_INDEX = {state.value: i for i, state in enumerate(_STATES)}
+_RESULTS = tuple(GameResult)
+_RESULT_INDEX = {result.value: i for i, result in enumerate(_RESULTS)}
+_RESULT_INDEX[None] = NO_RESULT
+_CARD_ID = {
+    (card.suit.value, card.rank.display): card_id for card_id, card in enumerate(DECK_CARDS)
+}
+_ROUND = struct.Struct("<I")
+_CARD_JSON = [{"suit": card.suit.value, "rank": card.rank.display} for card in DECK_CARDS]
+
+
+def encode_state(state: Dict[str, Any]) -> bytes:
+    """Encode a ``get_game_state()`` dict."""
+    actions = state["available_actions"]
+    dealer = state["dealer_hand"]
+    hidden = dealer.get("hidden_card", False)
+    table = state.get("table")
+    flags = (
+        (CAN_ACT if actions["can_hit"] else 0)
+        | (CAN_DOUBLE_DOWN if actions["can_double_down"] else 0)
+        | (CAN_SPLIT if actions["can_split"] else 0)
+        | (CAN_SURRENDER if actions.get("can_surrender") else 0)
+        | (DEALER_HIDDEN if hidden else 0)
+        | (SEAT if table is not None else 0)
+    )
+    dealer_ids = [_CARD_ID[card["suit"], card["rank"]] for card in dealer["cards"]]
+    if hidden:
+        # Only the upcard is visible
+        dealer_ids[1:] = [HIDDEN_CARD] * (len(dealer_ids) - 1)
+
+    out = bytearray((
+        WIRE_VERSION,
+        _STATE_INDEX[state["state"]],
+        _RESULT_INDEX[state["result"]],
+        flags,
+        state["active_hand"],
+        # "hidden" while the dealer has not played
+        dealer["value"] if isinstance(dealer["value"], int) and not hidden else 0,
+        len(dealer_ids),
+    ))
+    out += bytes(dealer_ids)
+
+    hands = state["hands"]
+    out.append(len(hands))
+    for hand in hands:
+        out += bytes((
+            hand["value"],
+            DOUBLED if hand["doubled"] else 0,
+            _RESULT_INDEX[hand["result"]],
+            len(hand["cards"]),
+        ))
+        out += bytes(_CARD_ID[card["suit"], card["rank"]] for card in hand["cards"])
+
+    if table is not None:
+        table_id = table["table_id"].encode()
+        out.append(table["seat"])
+        out += _ROUND.pack(table["round"])
+        out.append(len(table_id))
+        out += table_id
+    return bytes(out)
+
+
+def _card(card_id: int) -> Optional[Dict[str, str]]:
+    return None if card_id == HIDDEN_CARD else dict(_CARD_JSON[card_id])
+
+
+def decode_state(data: bytes) -> Dict[str, Any]:
+    """Decode a wire record into the JSON state shape.
+
+    The hidden hole card decodes as None, and the dealer's is_bust and
+    is_blackjack read False while it is hidden.
+    """
+    if data[0] != WIRE_VERSION:
+        raise ValueError(f"Unsupported wire format version {data[0]}")
+    state, result, flags, active, dealer_value, dealer_count = data[1:7]
+    position = 7
+    dealer_ids = data[position:position + dealer_count]
+    position += dealer_count
+    hidden = bool(flags & DEALER_HIDDEN)
+
+    hands: List[Dict[str, Any]] = []
+    hand_count = data[position]
+    position += 1
+    for _ in range(hand_count):
+        value, hand_flags, hand_result, card_count = data[position:position + 4]
+        position += 4
+        hands.append({
+            "cards": [_card(card_id) for card_id in data[position:position + card_count]],
+            "value": value,
+            "is_bust": value > 21,
+            "doubled": bool(hand_flags & DOUBLED),
+            "result": None if hand_result == NO_RESULT else _RESULTS[hand_result].value,
+        })
+        position += card_count
+
+    table = None
+    if flags & SEAT:
+        seat = data[position]
+        (round_number,) = _ROUND.unpack_from(data, position + 1)
+        position += 1 + _ROUND.size
+        length = data[position]
+        table = {
+            "table_id": bytes(data[position + 1:position + 1 + length]).decode(),
+            "seat": seat,
+            "round": round_number,
+        }
+        position += 1 + length
+    if position != len(data):
+        raise ValueError("Trailing bytes after wire record")
+
+    player = hands[active]
+    can_act = bool(flags & CAN_ACT)
+    decoded = {
+        "player_hand": {
+            "cards": player["cards"],
+            "value": player["value"],
+            "is_bust": player["is_bust"],
+            "is_blackjack": hand_count == 1 and len(player["cards"]) == 2 and player["value"] == 21,
+        },
+        "dealer_hand": {
+            "cards": [_card(card_id) for card_id in dealer_ids],
+            "value": "hidden" if hidden else dealer_value,
+            "is_bust": not hidden and dealer_value > 21,
+            "is_blackjack": not hidden and dealer_count == 2 and dealer_value == 21,
+            "hidden_card": hidden,
+        },
+        "hands": hands,
+        "active_hand": active,
+        "state": _STATES[state].value,
+        "result": None if result == NO_RESULT else _RESULTS[result].value,
+        "available_actions": {
+            "can_hit": can_act,
+            "can_stand": can_act,
+            "can_double_down": bool(flags & CAN_DOUBLE_DOWN),
+            "can_split": bool(flags & CAN_SPLIT),
+            "can_surrender": bool(flags & CAN_SURRENDER),
+        },
+    }
+    if table is not None:
+        decoded["table"] = table
+    return decoded
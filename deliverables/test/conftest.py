@@ -34,4 +34,12 @@ def started_game():
     from game_engine import BlackjackGame
     game = BlackjackGame()
     game.start_new_game()
-    return game
\ No newline at end of file
+    return game
+
+@pytest.fixture(autouse=True)
+def reset_new_game_rate_limit():
+    """Give every test its own /game/new allowance from the shared test client."""
+    api = sys.modules.get("api")
+    if api is not None:
+        api.new_game_limiter.buckets.clear()
+    yield
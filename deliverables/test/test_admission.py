@@ -0,0 +1,183 @@
+"""
+Test suite for admission control
+Tests token buckets, the prioritized in-flight limit and the middleware.
+"""
+
+import asyncio
+import pytest
+import sys
+import os
+
+# Add src directory to Python path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+import api
+from admission import (
+    ACTION, EXEMPT, NEW, AdmissionController, AdmissionMiddleware, ClientRateLimiter,
+    TokenBucket, classify,
+)
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+class TestClassify:
+    @pytest.mark.parametrize("method, path, kind", [
+        ("POST", "/game/abc/hit", ACTION),
+        ("GET", "/game/abc", ACTION),
+        ("GET", "/game/abc/split-ev", NEW),
+        ("DELETE", "/game/abc", EXEMPT),
+        ("POST", "/game/new", NEW),
+        ("POST", "/table/new", NEW),
+        ("POST", "/table/abc/join", NEW),
+        ("POST", "/table/abc/deal", ACTION),
+        ("GET", "/table/abc", ACTION),
+        ("DELETE", "/table/abc", EXEMPT),
+        ("POST", "/jobs", NEW),
+        ("GET", "/jobs/abc", ACTION),
+        ("POST", "/jobs/abc/cancel", EXEMPT),
+        ("GET", "/", EXEMPT),
+        ("GET", "/ready", EXEMPT),
+        ("GET", "/admin/admission", EXEMPT),
+        ("GET", "/jobs/abc/events", EXEMPT),
+        ("OPTIONS", "/game/new", EXEMPT),
+    ])
+    def test_classes(self, method, path, kind):
+        assert classify(method, path) == kind
+
+
+class TestTokenBucket:
+    def test_burst_then_rate(self):
+        clock = FakeClock()
+        bucket = TokenBucket(rate=2, burst=3, clock=clock)
+        assert [bucket.take() for _ in range(3)] == [0, 0, 0]
+        assert bucket.take() == pytest.approx(0.5)
+
+        clock.now += 0.5
+        assert bucket.take() == 0
+
+    def test_clients_are_independent(self):
+        limiter = ClientRateLimiter(rate=1, burst=1, clock=FakeClock())
+        assert limiter.take("a") == 0
+        assert limiter.take("a") > 0
+        assert limiter.take("b") == 0
+        assert limiter.limited == 1
+
+    def test_client_table_is_bounded(self):
+        limiter = ClientRateLimiter(max_clients=2, clock=FakeClock())
+        for client in ("a", "b", "c"):
+            limiter.take(client)
+        assert list(limiter.buckets) == ["b", "c"]
+
+
+class TestAdmissionController:
+    def test_new_work_keeps_headroom_for_actions(self):
+        async def main():
+            controller = AdmissionController(max_in_flight=4, new_share=0.5)
+            assert await controller.acquire(NEW)
+            assert await controller.acquire(NEW)
+            assert not await controller.acquire(NEW)
+            assert await controller.acquire(ACTION)
+            assert await controller.acquire(ACTION)
+            return controller
+
+        controller = asyncio.run(main())
+        assert controller.in_flight == 4
+        assert controller.rejected == {ACTION: 0, NEW: 1}
+
+    def test_actions_queue_for_freed_slot(self):
+        async def main():
+            controller = AdmissionController(max_in_flight=1, queue_timeout=5)
+            assert await controller.acquire(ACTION)
+            waiting = asyncio.ensure_future(controller.acquire(ACTION))
+            await asyncio.sleep(0)
+            assert controller.queue_depth == 1
+            # New work never jumps an action queue
+            assert not await controller.acquire(NEW)
+
+            controller.release()
+            assert await waiting
+            assert controller.in_flight == 1
+            controller.release()
+            return controller
+
+        controller = asyncio.run(main())
+        assert controller.in_flight == 0
+        assert controller.max_queue_depth == 1
+
+    def test_queue_timeout(self):
+        async def main():
+            controller = AdmissionController(max_in_flight=1, queue_timeout=0.01)
+            await controller.acquire(ACTION)
+            assert not await controller.acquire(ACTION)
+            return controller
+
+        controller = asyncio.run(main())
+        assert controller.queue_depth == 0
+        assert controller.rejected[ACTION] == 1
+
+    def test_queue_limit(self):
+        async def main():
+            controller = AdmissionController(max_in_flight=1, max_queue=0)
+            await controller.acquire(ACTION)
+            return await controller.acquire(ACTION)
+
+        assert not asyncio.run(main())
+
+
+def make_app(controller, limiter):
+    app = FastAPI()
+    app.add_middleware(AdmissionMiddleware, controller=controller, rate_limiter=limiter)
+
+    @app.post("/game/new")
+    async def new_game():
+        return {"ok": True}
+
+    @app.post("/game/{session_id}/hit")
+    async def hit(session_id: str):
+        return {"ok": True}
+
+    return app
+
+
+class TestAdmissionMiddleware:
+    def test_overload_returns_503_with_retry_after(self):
+        controller = AdmissionController(max_in_flight=0)
+        client = TestClient(make_app(controller, ClientRateLimiter()))
+
+        response = client.post("/game/new")
+        assert response.status_code == 503
+        assert int(response.headers["retry-after"]) >= 1
+        assert controller.rejected[NEW] == 1
+
+    def test_new_game_rate_limit(self):
+        limiter = ClientRateLimiter(rate=0.001, burst=2)
+        client = TestClient(make_app(AdmissionController(), limiter))
+
+        assert [client.post("/game/new").status_code for _ in range(3)] == [200, 200, 429]
+        assert "retry-after" in client.post("/game/new").headers
+        # Actions are not rate limited
+        assert client.post("/game/abc/hit").status_code == 200
+
+    def test_slots_released(self):
+        controller = AdmissionController(max_in_flight=1)
+        client = TestClient(make_app(controller, ClientRateLimiter()))
+        for _ in range(3):
+            assert client.post("/game/abc/hit").status_code == 200
+        assert controller.in_flight == 0
+
+    def test_admission_stats_endpoint(self):
+        stats = TestClient(api.app).get("/admin/admission").json()
+        assert {"in_flight", "queue_depth", "max_queue_depth", "rejected"} <= set(stats)
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
@@ -6,16 +6,35 @@ Tests FastAPI routes and game integration.
 import pytest
 import sys
 import os
+import threading
+import time
+import uuid
 from fastapi.testclient import TestClient
 
 # Add src directory to Python path
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
 
+import api
 from api import app
+from game_engine import BlackjackGame, Card, Rank, RuleSet, Suit
 
 client = TestClient(app)
 
 
+def stacked_session(ranks, **rules):
+    """Session whose shoe deals the given ranks first (player, dealer, player, dealer, ...)."""
+    game = BlackjackGame(rules=RuleSet(penetration=1.0, **rules))
+    suits = list(Suit)
+    stacked = [Card(suits[i % len(suits)], rank) for i, rank in enumerate(ranks)]
+    for card in stacked:
+        game.deck.cards.remove(card)
+    game.deck.cards += reversed(stacked)
+    game.start_new_game()
+    session_id = str(uuid.uuid4())
+    api.games[session_id] = game
+    return session_id
+
+
 class TestAPIEndpoints:
     def test_root_endpoint(self):
         response = client.get("/")
@@ -214,6 +233,184 @@ class TestAPIEndpoints:
             assert actions["can_stand"] is False
             assert actions["can_double_down"] is False
 
+    def test_new_game_with_rules(self):
+        response = client.post("/game/new", json={"num_decks": 6, "surrender": True})
+        assert response.status_code == 200
+
+        game_state = response.json()["game_state"]
+        if game_state["state"] == "player_turn":
+            assert game_state["available_actions"]["can_surrender"] is True
+
+            session_id = response.json()["session_id"]
+            response = client.post(f"/game/{session_id}/surrender")
+            assert response.status_code == 200
+            assert response.json()["result"] == "surrender"
+
+    @pytest.mark.parametrize("rules", [
+        {"num_decks": 0},
+        {"num_decks": 20000},
+        {"max_split_hands": 5000000},
+        {"double_totals": [40]},
+        {"blackjack_payout": -2},
+    ])
+    def test_new_game_with_invalid_rules(self, rules):
+        response = client.post("/game/new", json=rules)
+        assert response.status_code == 400
+        response = client.post("/table/new", json={"rules": rules})
+        assert response.status_code == 400
+
+    def test_surrender_not_allowed_by_default(self):
+        response = client.post("/game/new")
+        session_id = response.json()["session_id"]
+
+        response = client.post(f"/game/{session_id}/surrender")
+        assert response.status_code == 400
+
+    def test_shoe_state(self):
+        response = client.post("/game/new")
+        session_id = response.json()["session_id"]
+        game_state = response.json()["game_state"]
+
+        response = client.get(f"/game/{session_id}/shoe")
+        assert response.status_code == 200
+
+        shoe = response.json()
+        assert shoe["num_decks"] == 1
+        assert sum(shoe["rank_counts"].values()) == shoe["cards_remaining"]
+        # Only the player's cards and the dealer upcard are visible
+        if game_state["state"] == "player_turn":
+            assert shoe["cards_remaining"] == 49
+
+    def test_shoe_state_nonexistent_game(self):
+        response = client.get("/game/nonexistent-id/shoe")
+        assert response.status_code == 404
+
+    def test_table_flow(self):
+        response = client.post("/table/new", json={"round_timeout": 60})
+        assert response.status_code == 200
+        table_id = response.json()["table_id"]
+
+        seat_ids = [client.post(f"/table/{table_id}/join").json()["session_id"] for _ in range(2)]
+
+        response = client.post(f"/table/{table_id}/deal")
+        assert response.status_code == 200
+        assert len(response.json()["seats"]) == 2
+
+        for session_id in seat_ids:
+            state = client.get(f"/game/{session_id}").json()
+            assert state["table"]["table_id"] == table_id
+            if state["state"] == "player_turn":
+                client.post(f"/game/{session_id}/stand")
+
+        table_state = client.get(f"/table/{table_id}").json()
+        assert table_state["round_active"] is False
+        assert all(seat["result"] is not None for seat in table_state["seats"])
+
+        response = client.delete(f"/table/{table_id}")
+        assert response.status_code == 200
+        assert client.get(f"/game/{seat_ids[0]}").status_code == 404
+
+    def test_deal_empty_table(self):
+        table_id = client.post("/table/new").json()["table_id"]
+
+        response = client.post(f"/table/{table_id}/deal")
+        assert response.status_code == 400
+
+    def test_nonexistent_table(self):
+        assert client.get("/table/nonexistent-id").status_code == 404
+        assert client.post("/table/nonexistent-id/join").status_code == 404
+
+    def test_split_endpoints(self):
+        # The first split hand draws a 3, so no second pair is offered
+        session_id = stacked_session([Rank.EIGHT, Rank.SIX, Rank.EIGHT, Rank.SEVEN, Rank.THREE])
+
+        response = client.get(f"/game/{session_id}/split-ev")
+        assert response.status_code == 200
+        advice = response.json()
+        assert advice["recommendation"] == "split"
+        assert "no resplits" in advice["approximation"]
+
+        response = client.post(f"/game/{session_id}/split")
+        assert response.status_code == 200
+        assert len(response.json()["hands"]) == 2
+        assert client.get(f"/game/{session_id}/split-ev").status_code == 400
+
+    def test_split_ev_solves_one_at_a_time(self, monkeypatch):
+        import ev
+
+        running, overlaps = [], []
+
+        def slow_solve(*position):
+            running.append(1)
+            overlaps.append(len(running))
+            time.sleep(0.05)
+            running.pop()
+            return {"recommendation": "split"}
+
+        monkeypatch.setattr(ev, "solve_split", slow_solve)
+        session_id = stacked_session([Rank.EIGHT, Rank.SIX, Rank.EIGHT, Rank.SEVEN, Rank.THREE])
+        statuses = []
+        threads = [
+            threading.Thread(target=lambda: statuses.append(client.get(f"/game/{session_id}/split-ev").status_code))
+            for _ in range(3)
+        ]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join(5)
+
+        assert statuses == [200, 200, 200]
+        assert overlaps == [1, 1, 1]
+
+    def test_split_refused_without_pair(self):
+        session_id = stacked_session([Rank.EIGHT, Rank.SIX, Rank.NINE, Rank.SEVEN])
+        assert client.get(f"/game/{session_id}/split-ev").status_code == 400
+        assert client.post(f"/game/{session_id}/split").status_code == 400
+
+    def test_split_ev_rejects_large_shoe(self):
+        session_id = stacked_session([Rank.EIGHT, Rank.SIX, Rank.EIGHT, Rank.SEVEN], num_decks=2)
+        response = client.get(f"/game/{session_id}/split-ev")
+        assert response.status_code == 400
+        assert "Shoe too large" in response.json()["detail"]
+
+    def test_split_nonexistent_game(self):
+        assert client.post("/game/fake-session-id/split").status_code == 404
+        assert client.get("/game/fake-session-id/split-ev").status_code == 404
+
+    def test_idempotent_retry_replays_result(self):
+        response = client.post("/game/new")
+        session_id = response.json()["session_id"]
+        if response.json()["game_state"]["state"] == "game_over":
+            return
+        
+        headers = {"Idempotency-Key": "hit-1"}
+        first = client.post(f"/game/{session_id}/hit", headers=headers)
+        retry = client.post(f"/game/{session_id}/hit", headers=headers)
+        assert retry.status_code == first.status_code
+        assert retry.json() == first.json()
+        # The retry did not deal another card
+        state = client.get(f"/game/{session_id}").json()
+        assert len(state["player_hand"]["cards"]) == 3
+
+    def test_idempotency_key_reused_for_other_action(self):
+        response = client.post("/game/new")
+        session_id = response.json()["session_id"]
+        
+        headers = {"Idempotency-Key": "k"}
+        client.post(f"/game/{session_id}/stand", headers=headers)
+        response = client.post(f"/game/{session_id}/hit", headers=headers)
+        assert response.status_code == 409
+
+    def test_lock_stats(self):
+        response = client.post("/game/new")
+        session_id = response.json()["session_id"]
+        client.post(f"/game/{session_id}/stand")
+        
+        stats = client.get("/admin/locks").json()
+        assert stats["acquisitions"] >= 1
+        assert "max_wait_ms" in stats
+        assert stats["locks_in_use"] == 0
+
 
 if __name__ == "__main__":
     pytest.main([__file__, "-v"])
\ No newline at end of file
@@ -0,0 +1,75 @@
+"""
+Test suite for the differential equivalence harness
+Tests case replay, engine comparison, sharding and mismatch shrinking.
+"""
+
+import pytest
+import sys
+import os
+
+# Add src directory to Python path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+import differential
+from differential import (
+    Case, ScalarEngine, VecEngine, compare, generate_case, run_differential, shrink, trace
+)
+
+
+class DoubleAsHitEngine(ScalarEngine):
+    """Deliberately wrong engine: doubling keeps the player's turn open."""
+
+    def act(self, action: str) -> None:
+        if action == "double_down":
+            action = "hit"
+        super().act(action)
+
+
+class TestDifferentialHarness:
+    def test_generate_case_is_reproducible(self):
+        assert generate_case(42) == generate_case(42)
+        assert len(generate_case(42, hands_per_case=7).hands) == 7
+
+    def test_trace_starts_with_deal(self):
+        case = Case(seed=3, hands=[["hit"], []])
+        snapshots = trace(ScalarEngine, case)
+
+        assert snapshots[0][0] in ("player_turn", "game_over")
+        # Every hand ends with the game over
+        assert snapshots[-1][0] == "game_over"
+
+    def test_scalar_and_vec_agree(self):
+        for case_seed in range(200):
+            assert compare(ScalarEngine, VecEngine, generate_case(case_seed)) is None
+
+    def test_sharded_run(self):
+        checked, mismatch = run_differential(
+            "scalar", "vec", num_cases=300, processes=2, shard_size=50
+        )
+        assert mismatch is None
+        assert checked == 300
+
+    def test_mismatch_is_detected_and_shrunk(self, monkeypatch):
+        monkeypatch.setitem(differential.ENGINES, "double_as_hit", DoubleAsHitEngine)
+
+        checked, mismatch = run_differential("scalar", "double_as_hit", num_cases=100)
+
+        assert mismatch is not None
+        assert checked <= 100
+        assert len(mismatch.case.hands) == 1
+        assert mismatch.case.hands[0] == ["double_down"]
+
+    def test_shrink_keeps_failure(self):
+        case = generate_case(7, hands_per_case=6, max_actions=6)
+        case.hands[-1].insert(0, "double_down")
+        if compare(ScalarEngine, DoubleAsHitEngine, case) is None:
+            pytest.skip("seed deals no doublable hand")
+
+        minimal = shrink(ScalarEngine, DoubleAsHitEngine, case)
+
+        assert compare(ScalarEngine, DoubleAsHitEngine, minimal) is not None
+        assert sum(map(len, minimal.hands)) <= sum(map(len, case.hands))
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
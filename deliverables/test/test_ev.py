@@ -0,0 +1,103 @@
+"""
+Test suite for the expected value solver
+Tests dealer outcome probabilities, hand EVs and memoized split EV.
+"""
+
+import pytest
+import sys
+import os
+
+# Add src directory to Python path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from game_engine import Card, Suit, Rank, BlackjackGame, GameState, RuleSet
+from ev import (
+    composition_from_rank_counts, dealer_outcomes, hand_ev, split_advice, split_ev, stand_ev
+)
+
+
+FULL_DECK = (4, 4, 4, 4, 4, 4, 4, 4, 16, 4)
+ONLY_TENS = (0, 0, 0, 0, 0, 0, 0, 0, 20, 0)
+
+
+def without(composition, *values):
+    counts = list(composition)
+    for value in values:
+        counts[value - 2] -= 1
+    return tuple(counts)
+
+
+class TestEV:
+    def test_composition_from_rank_counts(self):
+        assert composition_from_rank_counts([4] * 13) == FULL_DECK
+
+    def test_dealer_outcomes_sum_to_one(self):
+        outcomes = dealer_outcomes(6, 0, without(FULL_DECK, 6), RuleSet())
+        assert sum(outcomes) == pytest.approx(1.0)
+
+    def test_stand_ev_with_known_shoe(self):
+        # Dealer shows a ten and can only draw tens: always 20
+        assert stand_ev(20, 10, ONLY_TENS, RuleSet()) == pytest.approx(0.0)
+        assert stand_ev(21, 10, ONLY_TENS, RuleSet()) == pytest.approx(1.0)
+        assert stand_ev(19, 10, ONLY_TENS, RuleSet()) == pytest.approx(-1.0)
+        assert stand_ev(22, 10, ONLY_TENS, RuleSet()) == -1.0
+
+    def test_split_tens_into_tens(self):
+        # Each split hand makes 20 against a dealer 20
+        assert split_ev(10, 10, ONLY_TENS, RuleSet()) == pytest.approx(0.0)
+
+    def test_hand_ev_never_worse_than_standing(self):
+        composition = without(FULL_DECK, 10, 6, 9)
+        rules = RuleSet()
+        assert hand_ev(16, 0, 9, composition, rules, True) >= stand_ev(16, 9, composition, rules)
+
+    def test_split_ev_is_memoized(self):
+        rules = RuleSet()
+        composition = without(FULL_DECK, 8, 8, 6)
+        first = split_ev(8, 6, composition, rules)
+        hits = split_ev.cache_info().hits
+
+        assert split_ev(8, 6, composition, rules) == first
+        assert split_ev.cache_info().hits == hits + 1
+
+    def test_split_eights_against_six(self):
+        composition = without(FULL_DECK, 8, 8, 6)
+        rules = RuleSet()
+        assert split_ev(8, 6, composition, rules) > hand_ev(16, 0, 6, composition, rules, True)
+
+    def test_split_advice(self):
+        # Player 8-8, dealer 6 up (7 in the hole), rest of the deck behind
+        dealt = [Card(Suit.SPADES, Rank.EIGHT), Card(Suit.HEARTS, Rank.SIX),
+                 Card(Suit.HEARTS, Rank.EIGHT), Card(Suit.CLUBS, Rank.SEVEN)]
+        rest = [Card(suit, rank) for suit in Suit for rank in Rank]
+        rest = [card for card in rest if card not in dealt]
+        game = BlackjackGame(rules=RuleSet(penetration=1.0))
+        game.deck.cards = rest + list(reversed(dealt))
+        game.start_new_game()
+        assert game.state == GameState.PLAYER_TURN
+
+        advice = split_advice(game)
+        assert advice["recommendation"] == "split"
+        assert advice["split_ev"] > advice["no_split_ev"]
+
+    def test_split_advice_limits_shoe_size(self):
+        game = BlackjackGame(rules=RuleSet(num_decks=2))
+        game.start_new_game()
+        game.state = GameState.PLAYER_TURN
+        game.can_split = True
+        with pytest.raises(ValueError, match="Shoe too large"):
+            split_advice(game)
+
+    def test_memo_tables_bounded(self):
+        assert all(table.cache_info().maxsize for table in (dealer_outcomes, hand_ev, split_ev))
+
+    def test_split_advice_requires_pair(self):
+        game = BlackjackGame()
+        game.start_new_game()
+        game.can_split = False
+        with pytest.raises(ValueError):
+            split_advice(game)
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
@@ -0,0 +1,73 @@
+"""
+Test suite for the binary game codec
+Tests that records round-trip every part of a game exactly.
+"""
+
+import pytest
+import random
+import sys
+import os
+
+# Add src directory to Python path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from game_engine import BlackjackGame, GameState, RuleSet
+from game_codec import RECORD_SIZE, MAX_RECORD_DECKS, MAX_RECORD_HANDS, decode, encode, encode_into, decode_from
+
+
+def play(game, seed):
+    """Drive a game into a mid-round state with some variety."""
+    game.start_new_game()
+    if game.can_split:
+        game.split()
+    if game.state == GameState.PLAYER_TURN and seed % 2:
+        game.hit()
+    return game
+
+
+class TestGameCodec:
+    @pytest.mark.parametrize("rules", [
+        RuleSet(),
+        RuleSet(num_decks=6, dealer_hits_soft_17=True, surrender=True, penetration=0.8),
+        RuleSet(num_decks=2, double_totals=frozenset({9, 10, 11}), double_after_split=False,
+                dealer_peeks=True, blackjack_payout=1.2, max_split_hands=2),
+    ])
+    def test_round_trip(self, rules):
+        for seed in range(100):
+            game = play(BlackjackGame(random.Random(seed), rules), seed)
+            decoded = decode(encode(game))
+
+            assert decoded.rules == game.rules
+            assert decoded.get_game_state() == game.get_game_state()
+            assert decoded.get_shoe_state() == game.get_shoe_state()
+            assert [card.id for card in decoded.deck.cards] == [card.id for card in game.deck.cards]
+            assert decoded.hands.results == game.hands.results
+
+    def test_decoded_game_keeps_playing(self):
+        game = play(BlackjackGame(random.Random(3)), 3)
+        decoded = decode(encode(game))
+        if game.state == GameState.PLAYER_TURN:
+            assert decoded.stand() == game.stand()
+
+    def test_encode_at_offset(self):
+        game = play(BlackjackGame(random.Random(5)), 5)
+        buffer = bytearray(RECORD_SIZE + 100)
+        encode_into(game, buffer, 100)
+        assert decode_from(buffer, 100).get_game_state() == game.get_game_state()
+
+    def test_largest_rules_fit(self):
+        # Every rule set RuleSet accepts can be stored
+        rules = RuleSet(num_decks=MAX_RECORD_DECKS, max_split_hands=MAX_RECORD_HANDS)
+        game = BlackjackGame(random.Random(2), rules)
+        game.start_new_game()
+        assert decode(encode(game)).get_game_state() == game.get_game_state()
+
+    def test_unknown_version_rejected(self):
+        record = bytearray(encode(BlackjackGame()))
+        record[0] = 99
+        with pytest.raises(ValueError):
+            decode(bytes(record))
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
@@ -4,6 +4,7 @@ Tests core game logic, card handling, and game states.
 """
 
 import pytest
+import random
 import sys
 import os
 
@@ -12,10 +13,18 @@ sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
 
 from game_engine import (
     Card, Suit, Rank, Hand, Deck, BlackjackGame, 
-    GameState, GameResult
+    GameState, GameResult, RuleSet, compile_rules, HandSet
 )
 
 
+def stacked_game(ranks, **rules):
+    """Game whose shoe deals the given ranks in order (player, dealer, player, dealer, ...)."""
+    game = BlackjackGame(rules=RuleSet(penetration=1.0, **rules))
+    game.deck.cards = [Card(Suit.SPADES, rank) for rank in reversed(ranks)]
+    game.start_new_game()
+    return game
+
+
 class TestCard:
     def test_card_creation(self):
         card = Card(Suit.HEARTS, Rank.ACE)
@@ -175,6 +184,27 @@ class TestDeck:
         assert isinstance(card, Card)
         assert len(deck.cards) == 51
 
+    def test_deck_tracks_counts(self):
+        deck = Deck(random.Random(1), num_decks=2)
+        assert deck.rank_counts == [8] * 13
+        assert deck.running_count == 0
+
+        dealt = [deck.deal_card() for _ in range(30)]
+
+        for i, rank in enumerate(Rank):
+            remaining = sum(1 for card in deck.cards if card.rank == rank)
+            assert deck.rank_counts[i] == remaining
+        tags = {2: 1, 3: 1, 4: 1, 5: 1, 6: 1, 7: 0, 8: 0, 9: 0, 10: -1, 11: -1}
+        assert deck.running_count == sum(tags[card.value] for card in dealt)
+        assert deck.true_count == pytest.approx(deck.running_count / (74 / 52))
+
+    def test_deck_counts_restart_on_reset(self):
+        deck = Deck()
+        for _ in range(53):
+            deck.deal_card()
+
+        assert sum(deck.rank_counts) == 51
+
 
 class TestBlackjackGame:
     def test_game_initialization(self):
@@ -326,5 +356,235 @@ class TestBlackjackGame:
             game.double_down()
 
 
+class TestRuleSet:
+    def test_default_rules_stand_on_soft_17(self):
+        rules = compile_rules(RuleSet())
+        hard, soft = rules.dealer_hits
+        assert hard[16] and not hard[17]
+        assert soft[16] and not soft[17]
+
+    def test_h17_hits_soft_17_only(self):
+        rules = compile_rules(RuleSet(dealer_hits_soft_17=True))
+        hard, soft = rules.dealer_hits
+        assert not hard[17]
+        assert soft[17] and not soft[18]
+
+    def test_compile_is_cached(self):
+        assert compile_rules(RuleSet(num_decks=2)) is compile_rules(RuleSet(num_decks=2))
+
+    def test_invalid_deck_count(self):
+        with pytest.raises(ValueError):
+            RuleSet(num_decks=0)
+
+    @pytest.mark.parametrize("options", [
+        {"num_decks": 9},
+        {"max_split_hands": 0},
+        {"max_split_hands": 5000000},
+        {"double_totals": frozenset({40})},
+        {"double_totals": frozenset({-3, 10})},
+        {"blackjack_payout": -1.0},
+        {"blackjack_payout": float("nan")},
+    ])
+    def test_rule_limits(self, options):
+        with pytest.raises(ValueError):
+            RuleSet(**options)
+
+    def test_multi_deck_shoe(self):
+        deck = Deck(num_decks=6)
+        assert len(deck.cards) == 312
+
+    def test_dealer_hits_soft_17(self):
+        game = BlackjackGame(rules=RuleSet(dealer_hits_soft_17=True))
+        game.dealer_hand = Hand([
+            Card(Suit.HEARTS, Rank.ACE),
+            Card(Suit.SPADES, Rank.SIX)  # Soft 17
+        ])
+        game.player_hand = Hand([
+            Card(Suit.HEARTS, Rank.TEN),
+            Card(Suit.SPADES, Rank.NINE)
+        ])
+        game._dealer_play()
+
+        assert len(game.dealer_hand.cards) > 2
+
+    def test_dealer_stands_on_soft_17_by_default(self):
+        game = BlackjackGame()
+        game.dealer_hand = Hand([
+            Card(Suit.HEARTS, Rank.ACE),
+            Card(Suit.SPADES, Rank.SIX)
+        ])
+        game.player_hand = Hand([
+            Card(Suit.HEARTS, Rank.TEN),
+            Card(Suit.SPADES, Rank.NINE)
+        ])
+        game._dealer_play()
+
+        assert len(game.dealer_hand.cards) == 2
+        assert game.result == GameResult.PLAYER_WIN
+
+    def test_surrender(self):
+        game = BlackjackGame(rules=RuleSet(surrender=True))
+        game.start_new_game()
+
+        if game.state == GameState.PLAYER_TURN:
+            game.surrender()
+            assert game.result == GameResult.SURRENDER
+            assert game.state == GameState.GAME_OVER
+
+    def test_surrender_disabled_by_default(self):
+        game = BlackjackGame()
+        game.start_new_game()
+        game.state = GameState.PLAYER_TURN
+
+        with pytest.raises(ValueError):
+            game.surrender()
+
+    def test_double_restrictions(self):
+        rules = RuleSet(double_totals=frozenset({9, 10, 11}))
+        for seed in range(50):
+            game = BlackjackGame(random.Random(seed), rules)
+            game.start_new_game()
+            if game.state == GameState.PLAYER_TURN:
+                assert game.can_double_down == (game.player_hand.get_value() in (9, 10, 11))
+
+    def test_dealer_peek_ends_hand(self):
+        rules = RuleSet(dealer_peeks=True)
+        for seed in range(500):
+            game = BlackjackGame(random.Random(seed), rules)
+            game.start_new_game()
+            if game.dealer_hand.is_blackjack() and not game.player_hand.is_blackjack():
+                assert game.state == GameState.GAME_OVER
+                assert game.result == GameResult.DEALER_WIN
+                return
+        pytest.fail("no dealer blackjack dealt")
+
+    def test_penetration_keeps_shoe_between_games(self):
+        game = BlackjackGame(random.Random(3), RuleSet(num_decks=2, penetration=0.5))
+        game.start_new_game()
+        shoe = game.deck
+        game.start_new_game()
+        assert game.deck is shoe
+
+        while game.deck.dealt_fraction() < 0.5:
+            game.deck.deal_card()
+        game.start_new_game()
+        assert game.deck is not shoe
+
+    def test_shoe_state_hides_hole_card(self):
+        game = BlackjackGame(random.Random(8))
+        game.start_new_game()
+        game.state = GameState.PLAYER_TURN
+
+        shoe = game.get_shoe_state()
+        assert shoe["cards_remaining"] == len(game.deck.cards) + 1
+        hole_card = game.dealer_hand.cards[1]
+        assert shoe["rank_counts"][hole_card.rank.display] == game.deck.rank_counts[
+            list(Rank).index(hole_card.rank)] + 1
+
+
+class TestSplit:
+    def test_hand_set_tracks_values(self):
+        hands = HandSet(max_hands=2)
+        hands.add_card(0, Card(Suit.HEARTS, Rank.ACE).id)
+        hands.add_card(0, Card(Suit.SPADES, Rank.ACE).id)
+        assert hands.totals[0] == 12
+        assert hands.soft_aces[0] == 1
+        assert hands.is_pair(0)
+
+        new = hands.split(0)
+        assert new == 1
+        assert hands.count == 2
+        assert hands.totals[0] == 11 and hands.totals[1] == 11
+        assert hands.split_aces
+
+    def test_split_and_double_after_split(self):
+        game = stacked_game([Rank.EIGHT, Rank.TEN, Rank.EIGHT, Rank.SEVEN,
+                             Rank.THREE, Rank.KING, Rank.QUEEN])
+        assert game.can_split
+
+        game.split()
+        assert game.hands.count == 2
+        assert game.player_hand.get_value() == 11
+        assert game.can_double_down
+
+        game.double_down()  # 8 + 3 + K = 21
+        assert game.hands.active == 1
+        assert game.player_hand.get_value() == 18  # 8 + Q
+
+        state = game.stand()
+        assert game.state == GameState.GAME_OVER
+        assert game.dealer_hand.get_value() == 17
+        assert [hand["result"] for hand in state["hands"]] == ["player_win", "player_win"]
+        assert state["hands"][0]["doubled"] is True
+        assert game.result == GameResult.PLAYER_WIN
+
+    def test_no_double_after_split_when_disabled(self):
+        game = stacked_game([Rank.EIGHT, Rank.TEN, Rank.EIGHT, Rank.SEVEN, Rank.THREE],
+                            double_after_split=False)
+        game.split()
+        assert not game.can_double_down
+
+    def test_split_aces_take_one_card(self):
+        game = stacked_game([Rank.ACE, Rank.TEN, Rank.ACE, Rank.SEVEN,
+                             Rank.KING, Rank.NINE])
+        game.split()
+
+        assert game.state == GameState.GAME_OVER
+        assert [hand["value"] for hand in game.get_game_state()["hands"]] == [21, 20]
+        # 21 after a split is not blackjack
+        assert game.hands.results[0] == GameResult.PLAYER_WIN
+        assert not game.hands.is_blackjack(0)
+
+    def test_resplit_limited_by_rules(self):
+        ranks = [Rank.EIGHT, Rank.TEN, Rank.EIGHT, Rank.SEVEN, Rank.EIGHT, Rank.EIGHT]
+        game = stacked_game(ranks, max_split_hands=3)
+        game.split()
+        assert game.can_split
+        game.split()
+        assert game.hands.count == 3
+        assert not game.can_split
+
+        game = stacked_game(ranks, max_split_hands=2)
+        game.split()
+        assert not game.can_split
+
+    def test_all_split_hands_bust_skips_dealer(self):
+        game = stacked_game([Rank.EIGHT, Rank.TEN, Rank.EIGHT, Rank.SIX,
+                             Rank.SIX, Rank.KING, Rank.SEVEN, Rank.QUEEN])
+        game.split()
+        game.hit()  # 8 + 6 + K = 24
+        assert game.hands.active == 1
+        game.hit()  # 8 + 7 + Q = 25
+
+        assert game.state == GameState.GAME_OVER
+        assert len(game.dealer_hand.cards) == 2
+        assert game.result == GameResult.DEALER_WIN
+
+    def test_round_result_nets_split_hands(self):
+        game = stacked_game([Rank.EIGHT, Rank.TEN, Rank.EIGHT, Rank.SEVEN,
+                             Rank.TEN, Rank.SIX])
+        game.split()
+        game.stand()  # 8 + 10 = 18 beats 17
+        state = game.stand()  # 8 + 6 = 14 loses
+
+        assert [hand["result"] for hand in state["hands"]] == ["player_win", "dealer_win"]
+        assert state["result"] == "push"
+
+    def test_round_result_counts_doubled_stake(self):
+        game = stacked_game([Rank.EIGHT, Rank.TEN, Rank.EIGHT, Rank.SEVEN,
+                             Rank.THREE, Rank.FIVE, Rank.TEN])
+        game.split()
+        game.double_down()  # 8 + 3 + 5 = 16 loses two stakes
+        state = game.stand()  # 8 + 10 = 18 wins one
+
+        assert [hand["result"] for hand in state["hands"]] == ["dealer_win", "player_win"]
+        assert state["result"] == "dealer_win"
+
+    def test_cannot_split_non_pair(self):
+        game = stacked_game([Rank.EIGHT, Rank.TEN, Rank.NINE, Rank.SEVEN])
+        with pytest.raises(ValueError):
+            game.split()
+
+
 if __name__ == "__main__":
     pytest.main([__file__, "-v"])
\ No newline at end of file
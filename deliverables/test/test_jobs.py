@@ -0,0 +1,197 @@
+"""
+Test suite for strategy evaluation jobs
+Tests strategy tables, EV accumulation and the job queue.
+"""
+
+import json
+import pytest
+import statistics
+import time
+import sys
+import os
+from concurrent.futures import Future, ThreadPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+
+# Add src directory to Python path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from fastapi.testclient import TestClient
+
+import api
+from game_engine import RuleSet
+from jobs import (
+    CANCELLED, DONE, FAILED, FINISHED_STATES, JobManager, JobQueueFull, compile_strategy,
+    simulate_chunk, welford_merge,
+)
+from vec_env import DOUBLE_DOWN, HIT, STAND
+
+
+# Hit to 17, double 11
+SIMPLE_STRATEGY = {
+    "hard": {"11": "DDDDDDDDDH", "16": "SSSSSHHHHH"},
+}
+
+
+def thread_manager(**kwargs):
+    return JobManager(executor_factory=lambda: ThreadPoolExecutor(2), max_workers=2, **kwargs)
+
+
+class BrokenPool:
+    """A process pool whose worker has died: every chunk fails at once."""
+
+    def __init__(self):
+        self.shut_down = False
+
+    def submit(self, *args):
+        future = Future()
+        future.set_exception(BrokenProcessPool("A worker process terminated abruptly"))
+        return future
+
+    def shutdown(self, wait=True, cancel_futures=False):
+        self.shut_down = True
+
+
+def wait(manager, job_id, timeout=30):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        status = manager.status(job_id)
+        if status["status"] in FINISHED_STATES:
+            return status
+        time.sleep(0.01)
+    raise AssertionError("job did not finish")
+
+
+class TestStrategy:
+    def test_compile(self):
+        hard, soft = compile_strategy(SIMPLE_STRATEGY)
+        assert hard[11][2] == DOUBLE_DOWN
+        assert hard[11][11] == HIT
+        assert hard[16][6] == STAND
+        assert hard[16][7] == HIT
+        # Defaults: stand on 17 or more, hit below
+        assert hard[12][5] == HIT
+        assert soft[18][9] == STAND
+
+    @pytest.mark.parametrize("table", [
+        {"pairs": {}},
+        {"hard": {"3": "HHHHHHHHHH"}},
+        {"hard": {"x": "HHHHHHHHHH"}},
+        {"hard": {"12": "HHHH"}},
+        {"soft": {"18": "SSSSSSSSSX"}},
+    ])
+    def test_invalid_tables(self, table):
+        with pytest.raises(ValueError):
+            compile_strategy(table)
+
+
+class TestStatistics:
+    def test_welford_merge_matches_direct(self):
+        values = [1.0, -1.0, 0.0, 1.5, -1.0, 2.0, -2.0, 1.0]
+
+        def accumulate(xs):
+            n, mean, m2 = 0, 0.0, 0.0
+            for x in xs:
+                n += 1
+                delta = x - mean
+                mean += delta / n
+                m2 += delta * (x - mean)
+            return n, mean, m2
+
+        n, mean, m2 = welford_merge(accumulate(values[:3]), accumulate(values[3:]))
+        assert n == len(values)
+        assert mean == pytest.approx(statistics.mean(values))
+        assert m2 / (n - 1) == pytest.approx(statistics.variance(values))
+
+    def test_simulate_chunk_is_seeded(self):
+        strategy = compile_strategy(SIMPLE_STRATEGY)
+        first = simulate_chunk(strategy, RuleSet(), 2000, seed=3)
+        assert first == simulate_chunk(strategy, RuleSet(), 2000, seed=3)
+        assert first[0] >= 2000
+        assert -1.0 < first[1] < 0.5
+
+
+class TestJobManager:
+    def test_job_runs_to_completion(self):
+        manager = thread_manager()
+        job = manager.submit(SIMPLE_STRATEGY, 3000, seed=1, chunk_hands=1000)
+        status = wait(manager, job["job_id"])
+
+        assert status["status"] == DONE
+        assert status["hands_done"] >= 3000
+        low, high = status["ci95"]
+        assert low < status["ev"] < high
+        manager.shutdown()
+
+    def test_process_pool(self):
+        manager = JobManager(max_workers=1)
+        job = manager.submit(SIMPLE_STRATEGY, 1000, seed=1)
+        assert wait(manager, job["job_id"])["status"] == DONE
+        manager.shutdown()
+
+    def test_broken_pool_replaced(self):
+        pools = [BrokenPool(), ThreadPoolExecutor(2)]
+        manager = JobManager(executor_factory=lambda: pools.pop(0), max_workers=2)
+        broken = pools[0]
+        failed = manager.submit(SIMPLE_STRATEGY, 2000, seed=1, chunk_hands=1000)
+        assert wait(manager, failed["job_id"])["status"] == FAILED
+        assert broken.shut_down
+        assert manager.executor is None
+
+        job = manager.submit(SIMPLE_STRATEGY, 2000, seed=1, chunk_hands=1000)
+        assert wait(manager, job["job_id"])["status"] == DONE
+        manager.shutdown()
+
+    def test_cancel(self):
+        manager = thread_manager()
+        job = manager.submit(SIMPLE_STRATEGY, 10_000_000, seed=1, chunk_hands=1000)
+        status = manager.cancel(job["job_id"])
+        assert status["status"] == CANCELLED
+        assert manager.status(job["job_id"])["status"] == CANCELLED
+        manager.shutdown()
+
+    def test_queue_limit(self):
+        manager = thread_manager(max_jobs=1)
+        manager.submit(SIMPLE_STRATEGY, 10_000_000, chunk_hands=1000)
+        with pytest.raises(JobQueueFull):
+            manager.submit(SIMPLE_STRATEGY, 1000)
+        manager.shutdown()
+
+    def test_invalid_hands(self):
+        manager = thread_manager()
+        with pytest.raises(ValueError):
+            manager.submit(SIMPLE_STRATEGY, 0)
+
+
+class TestJobEndpoints:
+    def test_job_flow(self, monkeypatch):
+        manager = thread_manager()
+        monkeypatch.setattr(api, "job_manager", manager)
+        monkeypatch.setattr(api, "JOB_EVENT_INTERVAL", 0.01)
+        client = TestClient(api.app)
+
+        response = client.post("/jobs", json={"strategy": SIMPLE_STRATEGY, "hands": 2000, "seed": 4})
+        assert response.status_code == 200
+        job_id = response.json()["job_id"]
+
+        with client.stream("GET", f"/jobs/{job_id}/events") as stream:
+            events = [
+                json.loads(line[len("data: "):])
+                for line in stream.iter_lines() if line.startswith("data: ")
+            ]
+        assert events[-1]["status"] == DONE
+        assert client.get(f"/jobs/{job_id}").json()["hands_done"] >= 2000
+        manager.shutdown()
+
+    def test_bad_strategy(self):
+        response = TestClient(api.app).post("/jobs", json={"strategy": {"pairs": {}}})
+        assert response.status_code == 400
+
+    def test_unknown_job(self):
+        client = TestClient(api.app)
+        assert client.get("/jobs/nonexistent").status_code == 404
+        assert client.post("/jobs/nonexistent/cancel").status_code == 404
+        assert client.get("/jobs/nonexistent/events").status_code == 404
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
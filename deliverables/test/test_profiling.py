@@ -0,0 +1,218 @@
+"""
+Test suite for the profiling tools
+Tests stack sampling, per-request cProfile and the hot-path timing hooks.
+"""
+
+import asyncio
+import pytest
+import threading
+import time
+import sys
+import os
+
+# Add src directory to Python path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from fastapi.testclient import TestClient
+
+import api
+from game_engine import BlackjackGame, Deck
+from profiling import CPROFILE, SAMPLING, HotPathTimer, Profiler, RequestProfilerMiddleware
+
+
+def busy_loop(stop):
+    while not stop.is_set():
+        sum(range(1000))
+
+
+class TestSampling:
+    def test_samples_other_threads(self):
+        stop = threading.Event()
+        worker = threading.Thread(target=busy_loop, args=(stop,))
+        worker.start()
+        profiler = Profiler()
+        profiler.start(SAMPLING, seconds=5, interval=0.001)
+        time.sleep(0.1)
+        profiler.stop()
+        stop.set()
+        worker.join()
+
+        assert profiler.samples > 0
+        collapsed = profiler.collapsed()
+        assert "busy_loop (test_profiling.py" in collapsed
+        for line in collapsed.splitlines():
+            stack, count = line.rsplit(" ", 1)
+            assert int(count) > 0
+            assert "profiler-sampler" not in stack
+
+    def test_stops_at_deadline(self):
+        profiler = Profiler()
+        profiler.start(SAMPLING, seconds=0.05, interval=0.001)
+        time.sleep(0.2)
+        assert not profiler.status()["active"]
+
+    @pytest.mark.parametrize("kwargs", [
+        {"mode": "perf", "seconds": 1},
+        {"mode": SAMPLING, "seconds": 0},
+        {"mode": CPROFILE, "seconds": 1, "fraction": 1.5},
+    ])
+    def test_invalid_settings(self, kwargs):
+        with pytest.raises(ValueError):
+            Profiler().start(**kwargs)
+
+
+class TestRequestProfiling:
+    def test_fraction_of_requests(self):
+        draws = iter([0.05, 0.5, 0.05])
+        profiler = Profiler(rng=lambda: next(draws))
+        profiler.start(CPROFILE, seconds=60, fraction=0.1)
+
+        assert profiler.should_profile_request()
+        assert not profiler.should_profile_request()
+        assert profiler.should_profile_request()
+
+    def test_profiles_merge(self):
+        profiler = Profiler()
+        profiler.start(CPROFILE, seconds=60)
+        for _ in range(2):
+            with profiler.profile_request():
+                BlackjackGame().start_new_game()
+
+        assert profiler.requests_profiled == 2
+        collapsed = profiler.collapsed()
+        assert "start_new_game (game_engine.py" in collapsed
+
+    def test_one_request_at_a_time(self):
+        profiler = Profiler()
+        profiler.start(CPROFILE, seconds=60)
+        with profiler.profile_request():
+            assert not profiler.should_profile_request()
+
+    def test_idle_by_default(self):
+        assert not Profiler().should_profile_request()
+
+    def test_stop_ends_running_request(self):
+        profiler = Profiler()
+        profiler.start(CPROFILE, seconds=60)
+        with profiler.profile_request():
+            profiler.stop()
+            BlackjackGame().start_new_game()
+
+        assert profiler.requests_profiled == 1
+        assert "start_new_game (game_engine.py" not in profiler.collapsed()
+        assert not profiler._profiling_request
+
+    def test_deadline_ends_running_request(self):
+        now = [0.0]
+        profiler = Profiler(clock=lambda: now[0])
+        profiler.start(CPROFILE, seconds=10)
+        with profiler.profile_request():
+            profiler.expire()
+            assert profiler._running is not None
+            now[0] = 11.0
+            profiler.expire()
+            BlackjackGame().start_new_game()
+
+        assert profiler.requests_profiled == 1
+        assert "start_new_game (game_engine.py" not in profiler.collapsed()
+        assert not profiler._profiling_request
+
+    @pytest.mark.parametrize("path, profiled", [
+        ("/game/abc", 1),
+        ("/game/abc/events", 0),
+        ("/jobs/abc/events", 0),
+    ])
+    def test_middleware_skips_event_streams(self, path, profiled):
+        async def app(scope, receive, send):
+            await send({"type": "http.response.start", "status": 200, "headers": []})
+
+        async def send(message):
+            pass
+
+        profiler = Profiler()
+        profiler.start(CPROFILE, seconds=60)
+        middleware = RequestProfilerMiddleware(app, profiler)
+        asyncio.run(middleware({"type": "http", "path": path}, None, send))
+        assert profiler.requests_profiled == profiled
+
+
+class TestHotPathTimer:
+    def test_hooks_installed_and_removed(self):
+        original = BlackjackGame.__dict__["get_game_state"]
+        original_reset = Deck.__dict__["reset"]
+        timer = HotPathTimer()
+        timer.enable()
+        assert BlackjackGame.__dict__["get_game_state"] is not original
+
+        game = BlackjackGame()
+        game.start_new_game()
+        game.get_game_state()
+        timer.disable()
+
+        assert BlackjackGame.__dict__["get_game_state"] is original
+        assert Deck.__dict__["reset"] is original_reset
+        timings = timer.stats()["timings"]
+        assert timings["BlackjackGame.start_new_game"]["calls"] == 1
+        assert timings["BlackjackGame.get_game_state"]["calls"] >= 2
+        assert timings["Deck.reset"]["calls"] >= 1
+
+    def test_disabled_timer_records_nothing(self):
+        timer = HotPathTimer()
+        BlackjackGame().start_new_game()
+        assert timer.stats() == {"enabled": False, "timings": {}}
+
+
+class TestProfilingEndpoints:
+    @pytest.fixture(autouse=True)
+    def enable_profiling(self, monkeypatch):
+        monkeypatch.setenv("BLACKJACK_ENABLE_PROFILING", "1")
+
+    @pytest.mark.parametrize("method, path", [
+        ("post", "/admin/profile"),
+        ("get", "/admin/profile"),
+        ("get", "/admin/profile/collapsed"),
+        ("post", "/admin/timing/enable"),
+        ("get", "/admin/timing"),
+    ])
+    def test_disabled_by_default(self, monkeypatch, method, path):
+        monkeypatch.delenv("BLACKJACK_ENABLE_PROFILING")
+        assert getattr(TestClient(api.app), method)(path).status_code == 404
+        assert not api.profiler.status()["active"]
+        assert not api.hot_path_timer.stats()["enabled"]
+
+    def test_sampling_flow(self):
+        client = TestClient(api.app)
+        response = client.post("/admin/profile", json={"mode": "sampling", "seconds": 5, "interval_ms": 1})
+        assert response.status_code == 200
+        assert response.json()["active"]
+
+        client.post("/game/new")
+        time.sleep(0.05)
+        assert client.post("/admin/profile/stop").json()["samples"] > 0
+        response = client.get("/admin/profile/collapsed")
+        assert response.status_code == 200
+        assert response.headers["content-type"].startswith("text/plain")
+        assert response.text
+
+    def test_cprofile_flow(self):
+        client = TestClient(api.app)
+        client.post("/admin/profile", json={"mode": "cprofile", "seconds": 60})
+        client.post("/game/new")
+        status = client.post("/admin/profile/stop").json()
+        assert status["requests_profiled"] >= 1
+        assert "new_game (api.py" in client.get("/admin/profile/collapsed").text
+
+    def test_invalid_mode(self):
+        assert TestClient(api.app).post("/admin/profile", json={"mode": "perf"}).status_code == 400
+
+    def test_timing_flow(self):
+        client = TestClient(api.app)
+        client.post("/admin/timing/enable")
+        client.post("/game/new")
+        stats = client.post("/admin/timing/disable").json()
+        assert not stats["enabled"]
+        assert stats["timings"]["BlackjackGame.start_new_game"]["calls"] == 1
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
@@ -0,0 +1,102 @@
+"""
+Test suite for per-session locks and the idempotency cache
+Tests serialization, contention accounting and cached replays.
+"""
+
+import asyncio
+import pytest
+import sys
+import os
+
+# Add src directory to Python path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from session_locks import SessionLocks, IdempotencyCache
+
+
+class TestSessionLocks:
+    def test_same_session_is_serialized(self):
+        locks = SessionLocks()
+        events = []
+
+        async def worker(name):
+            async with locks.hold("s1"):
+                events.append(f"{name}-in")
+                await asyncio.sleep(0.01)
+                events.append(f"{name}-out")
+
+        async def main():
+            await asyncio.gather(worker("a"), worker("b"))
+
+        asyncio.run(main())
+        assert events == ["a-in", "a-out", "b-in", "b-out"]
+        stats = locks.stats()
+        assert stats["acquisitions"] == 2
+        assert stats["contended"] == 1
+        assert stats["max_wait_ms"] > 0
+
+    def test_unrelated_sessions_do_not_contend(self):
+        # A single shard: sessions share a registry but never a lock
+        locks = SessionLocks(shards=1)
+
+        async def worker(session_id):
+            async with locks.hold(session_id):
+                await asyncio.sleep(0.01)
+
+        async def main():
+            await asyncio.gather(*(worker(f"s{i}") for i in range(5)))
+
+        asyncio.run(main())
+        assert locks.stats()["contended"] == 0
+
+    def test_locks_are_discarded_when_idle(self):
+        locks = SessionLocks()
+
+        async def main():
+            async with locks.hold("s1"):
+                assert locks.stats()["locks_in_use"] == 1
+
+        asyncio.run(main())
+        assert locks.stats()["locks_in_use"] == 0
+
+    def test_lock_released_on_error(self):
+        locks = SessionLocks()
+
+        async def main():
+            with pytest.raises(ValueError):
+                async with locks.hold("s1"):
+                    raise ValueError("boom")
+            async with locks.hold("s1"):
+                pass
+
+        asyncio.run(main())
+        assert locks.stats()["locks_in_use"] == 0
+
+
+class TestIdempotencyCache:
+    def test_store_and_replay(self):
+        cache = IdempotencyCache()
+        cache.store("s1", "k1", "hit", 200, {"state": "player_turn"})
+
+        assert cache.get("s1", "k1") == ("hit", 200, {"state": "player_turn"})
+        assert cache.get("s1", "k2") is None
+        assert cache.get("s2", "k1") is None
+        assert cache.replays == 1
+
+    def test_oldest_keys_evicted(self):
+        cache = IdempotencyCache(keys_per_session=2)
+        for key in ("a", "b", "c"):
+            cache.store("s1", key, "hit", 200, {})
+
+        assert cache.get("s1", "a") is None
+        assert cache.get("s1", "c") is not None
+
+    def test_forget(self):
+        cache = IdempotencyCache()
+        cache.store("s1", "k1", "hit", 200, {})
+        cache.forget("s1")
+        assert cache.get("s1", "k1") is None
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
@@ -0,0 +1,205 @@
+"""
+Test suite for session stores
+Tests the shared-memory slab: lookups, updates, deletes and sharing between
+processes.
+"""
+
+import multiprocessing
+import pytest
+import random
+import uuid
+import sys
+import os
+
+# Add src directory to Python path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from fastapi.testclient import TestClient
+
+import api
+from game_engine import BlackjackGame, GameState
+from session_store import EMPTY, USED, SharedSessionStore, MemorySessionStore, session_store_from_env
+from table import Table
+
+
+@pytest.fixture
+def slab_name():
+    name = f"bj_test_{uuid.uuid4().hex[:12]}"
+    yield name
+    store = SharedSessionStore(name, capacity=8)
+    store.close()
+    store.unlink()
+
+
+def new_session(seed=1):
+    game = BlackjackGame(random.Random(seed))
+    game.start_new_game()
+    return str(uuid.uuid4()), game
+
+
+def _child_stands(name, session_id):
+    store = SharedSessionStore(name)
+    game = store[session_id]
+    if game.state == GameState.PLAYER_TURN:
+        game.stand()
+    store[session_id] = game
+    store.close()
+
+
+class TestSharedSessionStore:
+    def test_set_get_delete(self, slab_name):
+        store = SharedSessionStore(slab_name, capacity=8)
+        session_id, game = new_session()
+        store[session_id] = game
+
+        assert session_id in store
+        assert store[session_id].get_game_state() == game.get_game_state()
+        assert list(store) == [session_id]
+        assert len(store) == 1
+
+        del store[session_id]
+        assert session_id not in store
+        with pytest.raises(KeyError):
+            store[session_id]
+        store.close()
+
+    def test_update_in_place(self, slab_name):
+        store = SharedSessionStore(slab_name, capacity=8)
+        session_id, game = new_session(seed=4)
+        store[session_id] = game
+        if game.state == GameState.PLAYER_TURN:
+            game.hit()
+        store[session_id] = game
+
+        assert len(store) == 1
+        assert store[session_id].get_game_state() == game.get_game_state()
+        store.close()
+
+    def test_attached_stores_share_sessions(self, slab_name):
+        worker_a = SharedSessionStore(slab_name, capacity=8)
+        worker_b = SharedSessionStore(slab_name)
+        session_id, game = new_session()
+        worker_a[session_id] = game
+
+        assert worker_b.capacity == 8
+        assert worker_b[session_id].get_game_state() == game.get_game_state()
+        worker_a.close()
+        worker_b.close()
+
+    def test_update_from_other_process(self, slab_name):
+        store = SharedSessionStore(slab_name, capacity=8)
+        for seed in range(50):
+            session_id, game = new_session(seed)
+            if game.state == GameState.PLAYER_TURN:
+                break
+        store[session_id] = game
+
+        process = multiprocessing.get_context("fork").Process(
+            target=_child_stands, args=(slab_name, session_id)
+        )
+        process.start()
+        process.join(10)
+        assert process.exitcode == 0
+        assert store[session_id].state == GameState.GAME_OVER
+        store.close()
+
+    def test_tombstones_keep_probe_chains(self, slab_name):
+        store = SharedSessionStore(slab_name, capacity=4)
+        sessions = [new_session(seed) for seed in range(4)]
+        for session_id, game in sessions:
+            store[session_id] = game
+        with pytest.raises(ValueError):
+            store[str(uuid.uuid4())] = BlackjackGame()
+
+        del store[sessions[0][0]]
+        for session_id, _ in sessions[1:]:
+            assert session_id in store
+        # The freed slot is reused
+        session_id, game = new_session(9)
+        store[session_id] = game
+        assert session_id in store
+        store.close()
+
+    def test_churn_leaves_empty_slots(self, slab_name):
+        store = SharedSessionStore(slab_name, capacity=64)
+        live = [str(uuid.uuid4()) for _ in range(8)]
+        game = BlackjackGame()
+        for session_id in live:
+            store[session_id] = game
+        for _ in range(2000):
+            session_id = str(uuid.uuid4())
+            store[session_id] = game
+            del store[session_id]
+
+        states = [store._read_slot(index)[0] for index in range(store.capacity)]
+        assert states.count(USED) == 8
+        # Misses still stop at an empty slot instead of scanning the slab
+        assert states.count(EMPTY) >= 48
+        assert all(session_id in store for session_id in live)
+        store.close()
+
+    def test_non_uuid_ids(self, slab_name):
+        store = SharedSessionStore(slab_name, capacity=8)
+        assert "nonexistent-id" not in store
+        with pytest.raises(ValueError):
+            store["nonexistent-id"] = BlackjackGame()
+        store.close()
+
+    def test_table_seats_stay_local(self, slab_name):
+        store = SharedSessionStore(slab_name, capacity=8)
+        seat = Table("t1").join()
+        store["seat-1"] = seat
+
+        assert store["seat-1"] is seat
+        assert len(store) == 1
+        del store["seat-1"]
+        assert "seat-1" not in store
+        store.close()
+
+    def test_api_on_shared_store(self, slab_name, monkeypatch):
+        store = SharedSessionStore(slab_name, capacity=8)
+        monkeypatch.setattr(api, "games", store)
+        client = TestClient(api.app)
+
+        response = client.post("/game/new")
+        session_id = response.json()["session_id"]
+        assert session_id in store
+        if response.json()["game_state"]["state"] == "player_turn":
+            client.post(f"/game/{session_id}/stand")
+            assert store[session_id].state == GameState.GAME_OVER
+
+        assert client.post("/game/new", json={"num_decks": 12}).status_code == 400
+        assert client.post("/game/new", json={"double_totals": [40]}).status_code == 400
+        assert client.delete(f"/game/{session_id}").status_code == 200
+        assert session_id not in store
+        store.close()
+
+    def test_close_table_without_store_scan(self, slab_name, monkeypatch):
+        store = SharedSessionStore(slab_name, capacity=8)
+        monkeypatch.setattr(api, "games", store)
+        client = TestClient(api.app)
+        shared_id = client.post("/game/new").json()["session_id"]
+        table_id = client.post("/table/new").json()["table_id"]
+        seat_id = client.post(f"/table/{table_id}/join").json()["session_id"]
+
+        # Scanning would decode every shared session just to find the seats
+        monkeypatch.setattr(SharedSessionStore, "__iter__", lambda self: pytest.fail("store scanned"))
+        assert client.delete(f"/table/{table_id}").status_code == 200
+        assert seat_id not in store
+        assert shared_id in store
+        store.close()
+
+
+class TestSessionStoreFromEnv:
+    def test_memory_default(self, monkeypatch):
+        monkeypatch.delenv("BLACKJACK_SESSION_BACKEND", raising=False)
+        assert isinstance(session_store_from_env(), MemorySessionStore)
+
+    def test_unknown_backend(self, monkeypatch):
+        monkeypatch.setenv("BLACKJACK_SESSION_BACKEND", "redis")
+        with pytest.raises(ValueError):
+            session_store_from_env()
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
@@ -0,0 +1,156 @@
+"""
+Test suite for session snapshots and warm restart
+Tests writing, lazy restoring and carrying over unrestored sessions.
+"""
+
+import pytest
+import random
+import struct
+import uuid
+import sys
+import os
+
+# Add src directory to Python path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from fastapi.testclient import TestClient
+
+import api
+from game_engine import BlackjackGame, GameState
+from session_store import MemorySessionStore
+from game_codec import RECORD_SIZE
+from snapshot import Snapshot, load_snapshot, write_snapshot
+from table import Table
+
+
+def make_sessions(count):
+    sessions = {}
+    for seed in range(count):
+        game = BlackjackGame(random.Random(seed))
+        game.start_new_game()
+        sessions[str(uuid.uuid4())] = game
+    return sessions
+
+
+class TestSnapshot:
+    def test_write_and_find(self, tmp_path):
+        path = str(tmp_path / "sessions.snap")
+        sessions = make_sessions(50)
+        assert write_snapshot(path, sessions) == 50
+
+        snapshot = Snapshot(path)
+        for session_id, game in sessions.items():
+            index = snapshot.find(uuid.UUID(session_id).bytes)
+            assert snapshot.game_at(index).get_game_state() == game.get_game_state()
+        assert snapshot.find(uuid.uuid4().bytes) is None
+        snapshot.close()
+
+    def test_unstorable_sessions_skipped(self, tmp_path):
+        path = str(tmp_path / "sessions.snap")
+        sessions = make_sessions(2)
+        sessions[str(uuid.uuid4())] = Table("t1").join()
+        sessions["not-a-uuid"] = BlackjackGame()
+
+        assert write_snapshot(path, sessions) == 2
+
+    def test_missing_snapshot(self, tmp_path):
+        assert load_snapshot(str(tmp_path / "none.snap")) is None
+
+    @pytest.mark.parametrize("contents", [
+        b"",
+        b"BJSNAP01",
+        struct.pack("<8sQI", b"BJSNAP01", 1, 700).ljust(32 + 716, b"\0"),
+        struct.pack("<8sQI", b"NOTSNAP!", 0, RECORD_SIZE).ljust(32, b"\0"),
+        # Header promises more records than the file holds
+        struct.pack("<8sQI", b"BJSNAP01", 5, RECORD_SIZE).ljust(32, b"\0"),
+    ])
+    def test_unreadable_snapshot(self, tmp_path, contents):
+        path = tmp_path / "sessions.snap"
+        path.write_bytes(contents)
+        with pytest.raises(ValueError):
+            load_snapshot(str(path))
+
+    def test_unreadable_record_is_missing(self, tmp_path):
+        path = str(tmp_path / "sessions.snap")
+        sessions = make_sessions(1)
+        write_snapshot(path, sessions)
+        with open(path, "r+b") as f:
+            # The record version follows the 32-byte header and 16-byte key
+            f.seek(32 + 16)
+            f.write(b"\xff")
+
+        store = MemorySessionStore()
+        store.attach_snapshot(load_snapshot(path))
+        assert next(iter(sessions)) not in store
+
+    def test_lazy_restore(self, tmp_path):
+        path = str(tmp_path / "sessions.snap")
+        sessions = make_sessions(10)
+        write_snapshot(path, sessions)
+
+        store = MemorySessionStore()
+        store.attach_snapshot(load_snapshot(path))
+        assert len(store) == 0
+
+        session_id = next(iter(sessions))
+        assert session_id in store
+        assert store[session_id].get_game_state() == sessions[session_id].get_game_state()
+        assert len(store) == 1
+
+        # Ending a restored session does not bring it back from the snapshot
+        del store[session_id]
+        assert session_id not in store
+
+    def test_unrestored_sessions_carried_over(self, tmp_path):
+        path = str(tmp_path / "sessions.snap")
+        sessions = make_sessions(10)
+        write_snapshot(path, sessions)
+
+        store = MemorySessionStore()
+        store.attach_snapshot(load_snapshot(path))
+        ended, touched = list(sessions)[:2]
+        assert ended in store
+        del store[ended]
+        game = store[touched]
+        if game.state == GameState.PLAYER_TURN:
+            game.stand()
+        assert store.save_snapshot(path) == 9
+
+        restarted = MemorySessionStore()
+        restarted.attach_snapshot(load_snapshot(path))
+        assert ended not in restarted
+        assert restarted[touched].get_game_state() == store[touched].get_game_state()
+        for session_id in list(sessions)[2:]:
+            assert session_id in restarted
+
+
+class TestWarmRestart:
+    def test_sessions_survive_restart(self, tmp_path, monkeypatch):
+        monkeypatch.setenv("BLACKJACK_SNAPSHOT_PATH", str(tmp_path / "sessions.snap"))
+
+        monkeypatch.setattr(api, "games", MemorySessionStore())
+        with TestClient(api.app) as client:
+            response = client.post("/game/new")
+            session_id = response.json()["session_id"]
+            state = response.json()["game_state"]
+
+        # A fresh process starts with an empty store
+        monkeypatch.setattr(api, "games", MemorySessionStore())
+        with TestClient(api.app) as client:
+            response = client.get(f"/game/{session_id}")
+            assert response.status_code == 200
+            assert response.json() == state
+
+    def test_incompatible_snapshot_moved_aside(self, tmp_path, monkeypatch):
+        path = tmp_path / "sessions.snap"
+        # Written by a release whose records were 700 bytes
+        path.write_bytes(struct.pack("<8sQI", b"BJSNAP01", 0, 700).ljust(32, b"\0"))
+        monkeypatch.setenv("BLACKJACK_SNAPSHOT_PATH", str(path))
+
+        monkeypatch.setattr(api, "games", MemorySessionStore())
+        with TestClient(api.app) as client:
+            assert client.get("/ready").status_code == 200
+            assert client.get(f"/game/{uuid.uuid4()}").status_code == 404
+        assert (tmp_path / "sessions.snap.rejected").exists()
+        # Shutdown wrote a fresh snapshot in its place
+        assert load_snapshot(str(path)).count == 0
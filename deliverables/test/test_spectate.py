@@ -0,0 +1,197 @@
+"""
+Test suite for spectator streams
+Tests single-encoding fan-out, bounded buffers and the SSE endpoint.
+"""
+
+import asyncio
+import json
+import threading
+import time
+import pytest
+import sys
+import os
+
+# Add src directory to Python path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from fastapi.testclient import TestClient
+
+import api
+import spectate
+from spectate import END_FRAME, SpectatorHub, encode_frame
+
+
+def frame_state(frame: bytes) -> dict:
+    lines = frame.decode().splitlines()
+    return json.loads(lines[1][len("data: "):])
+
+
+class TestSpectatorHub:
+    def test_unwatched_publish_is_free(self):
+        hub = SpectatorHub()
+        assert not hub.watched("a")
+        assert hub.publish("a", {"state": "player_turn"}) == 0
+        assert hub.published == 0
+
+    def test_encoded_once_for_all_viewers(self, monkeypatch):
+        calls = []
+        monkeypatch.setattr(spectate, "encode_frame", lambda *args: calls.append(args) or b"frame")
+
+        async def main():
+            hub = SpectatorHub()
+            viewers = [hub.subscribe("a", {"n": 0}) for _ in range(100)]
+            assert hub.publish("a", {"n": 1}) == 100
+            return viewers
+
+        viewers = asyncio.run(main())
+        # One frame for the first join, one for the change
+        assert len(calls) == 2
+        assert all(list(viewer.frames) == [b"frame", b"frame"] for viewer in viewers)
+
+    def test_join_gets_newest_state(self):
+        async def main():
+            hub = SpectatorHub()
+            first = hub.subscribe("a", {"n": 0})
+            hub.publish("a", {"n": 1})
+            late = hub.subscribe("a", {"ignored": True})
+            return await first.get(), await first.get(), await late.get()
+
+        initial, change, late = asyncio.run(main())
+        assert frame_state(initial) == {"n": 0}
+        assert frame_state(change) == {"n": 1}
+        assert late == change
+
+    def test_slow_viewer_skips_to_newest(self):
+        async def main():
+            hub = SpectatorHub(buffer_size=4)
+            viewer = hub.subscribe("a", {"n": 0})
+            for n in range(1, 11):
+                hub.publish("a", {"n": n})
+            return hub, viewer, [frame_state(await viewer.get()) for _ in range(4)]
+
+        hub, viewer, states = asyncio.run(main())
+        assert states == [{"n": n} for n in range(7, 11)]
+        assert viewer.dropped == 7
+        assert hub.stats()["frames_dropped"] == 7
+
+    def test_close_ends_streams(self):
+        async def main():
+            hub = SpectatorHub()
+            viewer = hub.subscribe("a", {"n": 0})
+            waiting = asyncio.ensure_future(viewer.get())
+            hub.close("a")
+            return hub, await waiting, await viewer.get(), await viewer.get()
+
+        hub, first, end, done = asyncio.run(main())
+        assert frame_state(first) == {"n": 0}
+        assert end == END_FRAME
+        assert done is None
+        assert not hub.watched("a")
+
+    def test_last_viewer_leaving_drops_channel(self):
+        async def main():
+            hub = SpectatorHub()
+            viewers = [hub.subscribe("a", {}) for _ in range(2)]
+            hub.unsubscribe(viewers[0])
+            assert hub.watched("a")
+            hub.unsubscribe(viewers[1])
+            return hub
+
+        hub = asyncio.run(main())
+        assert not hub.watched("a")
+        assert hub.stats()["viewers"] == 0
+
+    def test_frame_format(self):
+        frame = encode_frame(3, {"state": "game_over"})
+        assert frame == b'id: 3\ndata: {"state":"game_over"}\n\n'
+
+
+def wait_for_viewers(count: int) -> None:
+    deadline = time.monotonic() + 5
+    while api.spectators.stats()["viewers"] < count:
+        assert time.monotonic() < deadline, "viewer never subscribed"
+        time.sleep(0.01)
+
+
+class TestWatchEndpoint:
+    def watch(self, client, session_id, bodies):
+        # The test client returns a streamed body once the stream ends
+        thread = threading.Thread(
+            target=lambda: bodies.append(client.get(f"/game/{session_id}/events").text)
+        )
+        thread.start()
+        return thread
+
+    def test_viewers_see_every_change(self):
+        # One client context keeps every request on one event loop, as in a worker
+        with TestClient(api.app) as client:
+            # A dealt blackjack ends the game before anyone can act
+            state = None
+            while state != "player_turn":
+                response = client.post("/game/new").json()
+                session_id, state = response["session_id"], response["game_state"]["state"]
+            bodies = []
+            threads = [self.watch(client, session_id, bodies) for _ in range(3)]
+            wait_for_viewers(3)
+
+            final = client.post(f"/game/{session_id}/stand")
+            # Ending the session ends the streams
+            client.delete(f"/game/{session_id}")
+            for thread in threads:
+                thread.join(5)
+
+        assert final.status_code == 200
+        assert len(bodies) == 3
+        for body in bodies:
+            data = [json.loads(line[len("data: "):]) for line in body.splitlines() if line.startswith("data: ")]
+            assert data[-2] == final.json()
+            assert "event: end" in body
+        assert api.spectators.stats()["viewers"] == 0
+
+    def test_table_seats_published_on_deal(self):
+        with TestClient(api.app) as client:
+            table_id = client.post("/table/new").json()["table_id"]
+            seat = client.post(f"/table/{table_id}/join").json()["session_id"]
+            bodies = []
+            thread = self.watch(client, seat, bodies)
+            wait_for_viewers(1)
+
+            assert client.post(f"/table/{table_id}/deal").status_code == 200
+            client.delete(f"/table/{table_id}")
+            thread.join(5)
+        events = [line for line in bodies[0].splitlines() if line.startswith("id: ")]
+        assert events == ["id: 1", "id: 2"]
+
+    @pytest.mark.parametrize("path", ["/table/{table_id}", "/game/{seat}", "/game/{seat}/shoe"])
+    def test_timed_out_round_published(self, path):
+        with TestClient(api.app) as client:
+            table_id = client.post("/table/new", json={"round_timeout": 10}).json()["table_id"]
+            seat = client.post(f"/table/{table_id}/join").json()["session_id"]
+            table = api.tables[table_id]
+            now = [0.0]
+            table.clock = lambda: now[0]
+            # A dealt blackjack settles the round at once
+            while not table.round_active:
+                client.post(f"/table/{table_id}/deal")
+            bodies = []
+            thread = self.watch(client, seat, bodies)
+            wait_for_viewers(1)
+
+            now[0] += 11
+            assert client.get(path.format(table_id=table_id, seat=seat)).status_code == 200
+            client.delete(f"/table/{table_id}")
+            thread.join(5)
+        data = [json.loads(line[len("data: "):]) for line in bodies[0].splitlines() if line.startswith("data: ")]
+        assert data[0]["state"] == "player_turn"
+        assert data[-2]["state"] == "game_over"
+
+    def test_unknown_session(self):
+        assert TestClient(api.app).get("/game/nonexistent/events").status_code == 404
+
+    def test_spectator_stats(self):
+        stats = TestClient(api.app).get("/admin/spectators").json()
+        assert {"viewers", "events_published", "frames_dropped"} <= set(stats)
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
@@ -0,0 +1,179 @@
+"""
+Test suite for multi-seat tables
+Tests shared shoe dealing, single dealer resolution and round timeouts.
+"""
+
+import pytest
+import random
+import sys
+import os
+
+# Add src directory to Python path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from game_engine import Card, GameState, GameResult, Rank, RuleSet, Suit
+from table import Table, MAX_SEATS
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def make_table(seats=3, seed=1, **kwargs):
+    table = Table("t1", rng=random.Random(seed), **kwargs)
+    players = [table.join() for _ in range(seats)]
+    return table, players
+
+
+class TestTable:
+    def test_seats_share_shoe_and_dealer(self):
+        table, players = make_table()
+        table.deal_round()
+
+        for seat in players:
+            assert seat.deck is table.shoe
+            assert seat.dealer_hand is table.dealer_hand
+            assert len(seat.player_hand.cards) == 2
+        assert len(table.dealer_hand.cards) == 2
+        # 3 seats x 2 cards + 2 dealer cards from one shoe
+        assert len(table.shoe.cards) == 52 - 8
+
+    def test_dealer_played_once_for_all_seats(self):
+        table, players = make_table(seats=4, seed=7)
+        table.deal_round()
+
+        for seat in players:
+            if seat.state == GameState.PLAYER_TURN:
+                seat.stand()
+
+        assert not table.round_active
+        dealer_value = table.dealer_hand.get_value()
+        for seat in players:
+            assert seat.state == GameState.GAME_OVER
+            assert seat.result is not None
+            if seat.result == GameResult.PLAYER_WIN and dealer_value <= 21:
+                assert seat.player_hand.get_value() > dealer_value
+
+    def test_round_waits_for_every_seat(self):
+        for seed in range(50):
+            table, players = make_table(seats=2, seed=seed)
+            table.deal_round()
+            if all(seat.state == GameState.PLAYER_TURN for seat in players):
+                break
+        else:
+            pytest.skip("no round with two live hands")
+
+        players[0].stand()
+        assert players[0].state == GameState.DEALER_TURN
+        assert table.round_active
+        assert players[0].get_game_state()["dealer_hand"]["value"] == "hidden"
+
+        players[1].stand()
+        assert not table.round_active
+        assert players[0].state == GameState.GAME_OVER
+
+    def test_waiting_seat_does_not_see_hole_card(self):
+        for seed in range(50):
+            table, players = make_table(seats=2, seed=seed)
+            table.deal_round()
+            if all(seat.state == GameState.PLAYER_TURN for seat in players):
+                break
+        else:
+            pytest.skip("no round with two live hands")
+
+        before = players[0].get_shoe_state()
+        players[0].stand()
+        # Done, but the round is still open: the hole card is still undealt
+        assert players[0].get_shoe_state() == before
+        assert players[0].get_game_state()["dealer_hand"]["hidden_card"]
+
+        players[1].stand()
+        assert players[0].get_shoe_state()["cards_remaining"] < before["cards_remaining"]
+
+    def test_round_timeout_stands_slow_seats(self):
+        clock = FakeClock()
+        for seed in range(50):
+            table, players = make_table(seats=2, seed=seed, round_timeout=10, clock=clock)
+            table.deal_round()
+            if all(seat.state == GameState.PLAYER_TURN for seat in players):
+                break
+        else:
+            pytest.skip("no round with two live hands")
+
+        players[0].stand()
+        clock.now += 11
+
+        state = table.get_table_state()
+        assert not state["round_active"]
+        assert players[1].state == GameState.GAME_OVER
+        with pytest.raises(ValueError):
+            players[1].hit()
+
+    def test_round_timeout_finishes_split_hands(self):
+        clock = FakeClock()
+        table, (seat,) = make_table(seats=1, round_timeout=10, clock=clock,
+                                    rules=RuleSet(penetration=1.0))
+        ranks = [Rank.EIGHT, Rank.TEN, Rank.EIGHT, Rank.SEVEN, Rank.THREE, Rank.NINE]
+        table.shoe.cards = [Card(Suit.SPADES, rank) for rank in reversed(ranks)]
+        table.deal_round()
+        seat.split()  # first hand 8 + 3, second hand still waits for its card
+        clock.now += 11
+
+        state = seat.get_game_state()
+        assert state["state"] == "game_over"
+        assert [hand["value"] for hand in state["hands"]] == [11, 17]
+        assert [hand["result"] for hand in state["hands"]] == ["dealer_win", "push"]
+        assert state["result"] == "dealer_win"
+
+    def test_cannot_deal_during_round(self):
+        table, players = make_table(seats=1, seed=2)
+        table.deal_round()
+
+        if table.round_active:
+            with pytest.raises(ValueError):
+                table.deal_round()
+
+    def test_seat_cannot_start_own_game(self):
+        table, players = make_table(seats=1)
+        with pytest.raises(ValueError):
+            players[0].start_new_game()
+
+    def test_table_full(self):
+        table, _ = make_table(seats=MAX_SEATS)
+        with pytest.raises(ValueError):
+            table.join()
+
+    def test_leaving_seat_does_not_stall_round(self):
+        for seed in range(50):
+            table, players = make_table(seats=2, seed=seed)
+            table.deal_round()
+            if all(seat.state == GameState.PLAYER_TURN for seat in players):
+                break
+        else:
+            pytest.skip("no round with two live hands")
+
+        players[0].stand()
+        assert table.leave(players[1])
+
+        assert not table.round_active
+        assert players[0].state == GameState.GAME_OVER
+
+    def test_shoe_persists_between_rounds(self):
+        table, players = make_table(seats=2, rules=RuleSet(num_decks=2))
+        table.deal_round()
+        shoe = table.shoe
+        for seat in players:
+            if seat.state == GameState.PLAYER_TURN:
+                seat.stand()
+
+        table.deal_round()
+        assert table.shoe is shoe
+        assert table.round == 2
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
@@ -0,0 +1,143 @@
+"""
+Test suite for the vectorized Blackjack environment
+Checks batched stepping and differential equivalence with BlackjackGame.
+"""
+
+import pytest
+import random
+import sys
+import os
+
+# Add src directory to Python path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from game_engine import BlackjackGame, GameState, RuleSet
+from vec_env import VecBlackjackEnv, STAND, HIT, DOUBLE_DOWN, SURRENDER
+
+
+def scalar_step(game, action):
+    """Apply a vec-env action to a scalar game."""
+    if action == HIT:
+        game.hit()
+    elif action == DOUBLE_DOWN:
+        game.double_down()
+    elif action == SURRENDER:
+        game.surrender()
+    else:
+        game.stand()
+
+
+class TestVecBlackjackEnv:
+    def test_reset_observations(self):
+        env = VecBlackjackEnv(8, seed=1)
+        obs = env.reset()
+
+        assert set(obs) == {
+            "player_total", "soft", "dealer_upcard", "can_double", "running_count", "true_count"
+        }
+        for key in obs:
+            assert len(obs[key]) == 8
+        for total, upcard in zip(obs["player_total"], obs["dealer_upcard"]):
+            assert 4 <= total <= 21
+            assert 2 <= upcard <= 11
+
+    def test_step_requires_one_action_per_env(self):
+        env = VecBlackjackEnv(4, seed=1)
+        env.reset()
+
+        with pytest.raises(ValueError):
+            env.step([STAND, STAND])
+
+    def test_stand_finishes_every_game(self):
+        env = VecBlackjackEnv(16, seed=3)
+        env.reset()
+
+        _, rewards, dones, infos = env.step([STAND] * 16)
+
+        assert all(dones)
+        for reward, info in zip(rewards, infos):
+            assert reward == env.payouts[info["result"]]
+
+    def test_double_down_only_on_first_decision(self):
+        env = VecBlackjackEnv(1, seed=5)
+        obs = env.reset()
+        while env.pending[0] is not None or obs["player_total"][0] >= 21:
+            obs, _, _, _ = env.step([STAND])
+
+        obs, _, dones, _ = env.step([HIT])
+        if not dones[0]:
+            with pytest.raises(ValueError):
+                env.step([DOUBLE_DOWN])
+
+    def test_invalid_action_leaves_batch_untouched(self):
+        seed = 7
+        env = VecBlackjackEnv(3, seed=seed)
+        obs = env.reset()
+        # Pending slots ignore their action, so find a batch with none
+        while any(result is not None for result in env.pending):
+            seed += 3
+            env = VecBlackjackEnv(3, seed=seed)
+            obs = env.reset()
+        # Surrender is not allowed under the default rules
+        before = (list(obs["player_total"]), [list(deck) for deck in env.decks])
+
+        with pytest.raises(ValueError):
+            env.step([STAND, SURRENDER, STAND])
+        assert (list(env.player_total), [list(deck) for deck in env.decks]) == before
+
+        _, _, dones, _ = env.step([STAND] * 3)
+        assert all(dones)
+
+    @pytest.mark.parametrize("rules", [
+        RuleSet(),
+        RuleSet(dealer_hits_soft_17=True, num_decks=6, surrender=True, dealer_peeks=True,
+                double_totals=frozenset({9, 10, 11})),
+        RuleSet(num_decks=2, penetration=0.75),
+    ])
+    def test_matches_scalar_engine(self, rules):
+        """Differential check: same seeds and actions give the same games."""
+        num_envs = 32
+        seed = 1234
+        env = VecBlackjackEnv(num_envs, seed=seed, rules=rules)
+        games = [BlackjackGame(random.Random(seed + i), rules) for i in range(num_envs)]
+        policy = random.Random(99)
+
+        obs = env.reset()
+        for game in games:
+            game.start_new_game()
+
+        for _ in range(150):
+            actions = []
+            for i, game in enumerate(games):
+                assert obs["player_total"][i] == game.player_hand.get_value()
+                assert obs["soft"][i] == int(game.player_hand.is_soft())
+                assert obs["dealer_upcard"][i] == game.dealer_hand.cards[0].value
+                if game.state == GameState.PLAYER_TURN:
+                    shoe = game.get_shoe_state()
+                    assert obs["running_count"][i] == shoe["running_count"]
+                    assert obs["true_count"][i] == pytest.approx(shoe["true_count"])
+                    assert env.remaining_by_rank(i) == game.deck.rank_counts
+                    assert obs["can_double"][i] == int(game.can_double_down)
+                    choices = [STAND, HIT] + ([DOUBLE_DOWN] if game.can_double_down else [])
+                    choices += [SURRENDER] if game.can_surrender else []
+                    actions.append(policy.choice(choices))
+                else:
+                    actions.append(STAND)
+
+            obs, rewards, dones, infos = env.step(actions)
+
+            for i, (game, action) in enumerate(zip(games, actions)):
+                if game.state == GameState.PLAYER_TURN:
+                    doubled = action == DOUBLE_DOWN
+                    scalar_step(game, action)
+                else:
+                    doubled = False
+                assert bool(dones[i]) == (game.state == GameState.GAME_OVER)
+                if dones[i]:
+                    assert infos[i]["result"] == game.result
+                    assert rewards[i] == env.payouts[game.result] * (2 if doubled else 1)
+                    game.start_new_game()
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
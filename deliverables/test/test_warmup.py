@@ -0,0 +1,85 @@
+"""
+Test suite for startup warmup and lazy imports
+Tests the warmup steps, the split EV table positions and /ready.
+"""
+
+import random
+import subprocess
+import pytest
+import sys
+import os
+
+# Add src directory to Python path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from fastapi.testclient import TestClient
+
+import api
+import ev
+from game_engine import BlackjackGame, GameState, RuleSet, compile_rules
+from warmup import prime_split_table, warm_up
+
+SRC = os.path.join(os.path.dirname(__file__), '..', 'src')
+
+
+class TestWarmUp:
+    def test_steps_timed(self):
+        timings = warm_up([RuleSet(), RuleSet(num_decks=6, dealer_hits_soft_17=True)])
+        assert set(timings) == {"rules", "engine"}
+        assert all(ms >= 0 for ms in timings.values())
+
+    def test_primes_rule_tables(self):
+        rules = RuleSet(num_decks=3, surrender=True)
+        warm_up([rules])
+        hits = compile_rules.cache_info().hits
+        BlackjackGame(rules=rules)
+        assert compile_rules.cache_info().hits == hits + 1
+
+
+class TestSplitTable:
+    def test_covers_fresh_shoe_split_positions(self, monkeypatch):
+        solved = {}
+        monkeypatch.setattr(ev, "split_ev", lambda pair, up, comp, rules: solved.setdefault((pair, up, comp), 0.0))
+        monkeypatch.setattr(ev, "hand_ev", lambda *args: 0.0)
+        assert prime_split_table(RuleSet()) == 100
+
+        # Every pair split_advice is asked about on a fresh shoe is in the table
+        rng = random.Random(3)
+        checked = 0
+        while checked < 20:
+            game = BlackjackGame(rng=rng)
+            game.start_new_game()
+            if game.state != GameState.PLAYER_TURN or not game.can_split:
+                continue
+            ev.split_advice(game)
+            checked += 1
+        assert len(solved) == 100
+
+
+class TestReadiness:
+    def test_not_ready_before_startup(self):
+        response = TestClient(api.app).get("/ready")
+        assert response.status_code == 503
+
+    def test_ready_after_warmup(self):
+        with TestClient(api.app) as client:
+            response = client.get("/ready")
+            assert response.status_code == 200
+            assert set(response.json()["warmup_ms"]) == {"rules", "engine"}
+        assert api.warmup_timings is None
+
+    def test_heavy_subsystems_not_imported(self):
+        script = (
+            "import sys, api; "
+            "print(sorted(m for m in ('ev', 'jobs', 'vec_env', 'cProfile', 'pstats', "
+            "'concurrent.futures.process', 'multiprocessing.shared_memory', 'snapshot') "
+            "if m in sys.modules))"
+        )
+        result = subprocess.run(
+            [sys.executable, "-c", script], cwd=SRC, capture_output=True, text=True, check=True
+        )
+        assert result.stdout.strip() == "[]"
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
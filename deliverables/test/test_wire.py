@@ -0,0 +1,134 @@
+"""
+Test suite for the binary wire format
+Tests encoding/decoding of game states and Accept-header negotiation.
+"""
+
+import pytest
+import random
+import uuid
+import json
+import sys
+import os
+
+# Add src directory to Python path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from fastapi.testclient import TestClient
+
+import api
+from game_engine import BlackjackGame, GameState, RuleSet
+from table import Table
+from wire import HIDDEN_CARD, WIRE_MEDIA_TYPE, decode_state, encode_state
+
+
+WIRE_HEADERS = {"Accept": WIRE_MEDIA_TYPE}
+
+
+def visible(state):
+    """The JSON state with what the wire format deliberately leaves out masked."""
+    state = json.loads(json.dumps(state))
+    dealer = state["dealer_hand"]
+    if dealer["hidden_card"]:
+        dealer["cards"][1:] = [None] * (len(dealer["cards"]) - 1)
+        dealer["is_bust"] = False
+        dealer["is_blackjack"] = False
+    return state
+
+
+def game_states(seed):
+    """States along one game, with a split when one is offered."""
+    game = BlackjackGame(random.Random(seed), RuleSet(surrender=True, num_decks=2))
+    states = [game.start_new_game()]
+    if game.can_split:
+        states.append(game.split())
+    while game.state == GameState.PLAYER_TURN:
+        states.append(game.hit() if game.player_hand.get_value() < 15 else game.stand())
+    return states
+
+
+class TestWireFormat:
+    def test_round_trip(self):
+        for seed in range(200):
+            for state in game_states(seed):
+                assert decode_state(encode_state(state)) == visible(state)
+
+    def test_hole_card_not_sent(self):
+        for seed in range(50):
+            game = BlackjackGame(random.Random(seed))
+            state = game.start_new_game()
+            if game.state == GameState.PLAYER_TURN:
+                break
+        data = encode_state(state)
+        # Dealer cards follow the 7-byte header: upcard, then the hidden marker
+        assert data[7:9] == bytes((game.dealer_hand.cards[0].id, HIDDEN_CARD))
+        assert decode_state(data)["dealer_hand"]["cards"][1] is None
+
+    def test_much_smaller_than_json(self):
+        state = game_states(1)[0]
+        assert len(encode_state(state)) * 10 < len(json.dumps(state))
+
+    def test_table_seat_state(self):
+        table = Table("t1", rng=random.Random(2))
+        seats = [table.join(), table.join()]
+        table.deal_round()
+        state = seats[1].get_game_state()
+        decoded = decode_state(encode_state(state))
+        assert decoded == visible(state)
+        assert decoded["table"] == {"table_id": "t1", "seat": 1, "round": 1}
+
+    def test_invalid_data(self):
+        data = encode_state(game_states(1)[0])
+        with pytest.raises(ValueError):
+            decode_state(bytes([99]) + data[1:])
+        with pytest.raises(ValueError):
+            decode_state(data + b"\x00")
+
+
+class TestWireNegotiation:
+    def test_json_by_default(self):
+        client = TestClient(api.app)
+        response = client.post("/game/new")
+        assert response.headers["content-type"] == "application/json"
+        assert "Accept" in response.headers["vary"]
+        session_id = response.json()["session_id"]
+        assert "Accept" in client.get(f"/game/{session_id}").headers["vary"]
+
+    @pytest.mark.parametrize("accept, binary", [
+        (WIRE_MEDIA_TYPE, True),
+        (f"{WIRE_MEDIA_TYPE};q=0", False),
+        (f"application/json;q=0.5, {WIRE_MEDIA_TYPE}", True),
+        (f"{WIRE_MEDIA_TYPE};q=0.5, application/json", False),
+        (f"{WIRE_MEDIA_TYPE};q=0.5, */*;q=0.1", True),
+        ("application/*;q=0", False),
+        ("*/*", False),
+    ])
+    def test_accept_quality(self, accept, binary):
+        response = TestClient(api.app).post("/game/new", headers={"Accept": accept})
+        assert (response.headers["content-type"] == WIRE_MEDIA_TYPE) == binary
+
+    def test_binary_flow(self):
+        client = TestClient(api.app)
+        response = client.post("/game/new", headers=WIRE_HEADERS)
+        assert response.headers["content-type"] == WIRE_MEDIA_TYPE
+        session_id = str(uuid.UUID(bytes=response.content[:16]))
+        state = decode_state(response.content[16:])
+
+        response = client.get(f"/game/{session_id}", headers=WIRE_HEADERS)
+        assert decode_state(response.content) == state
+        json_state = client.get(f"/game/{session_id}").json()
+        assert decode_state(response.content) == visible(json_state)
+
+        if state["state"] == "player_turn":
+            response = client.post(f"/game/{session_id}/stand", headers=WIRE_HEADERS)
+            assert response.status_code == 200
+            assert decode_state(response.content)["state"] == "game_over"
+
+    def test_errors_stay_json(self):
+        client = TestClient(api.app)
+        response = client.post("/game/nonexistent-id/hit", headers=WIRE_HEADERS)
+        assert response.status_code == 404
+        assert response.json()["detail"] == "Game session not found"
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])